@@ -1,20 +1,51 @@
 import MetaTrader5 as mt5
 import time
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import threading
-from datetime import datetime
+import queue
+import multiprocessing
+from datetime import datetime, timedelta, timezone
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, simpledialog
-import pandas as pd
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 from matplotlib.dates import DateFormatter
+from matplotlib.ticker import FuncFormatter
 import numpy as np
 import asyncio
 import json
 import os
+import io
+from collections import deque
+from history_cache import DealHistoryCache, compute_performance
+from tick_feed import TickProfitFeed
+from alert_router import AlertRouter
+from snapshot import ORDER_TYPE_NAMES, build_snapshot, diff_snapshots
+from web_dashboard import WebDashboard
+from event_stream import EventStreamServer
+from connection_supervisor import ConnectionSupervisor
+from symbol_filter import SymbolFilter
+from latency_stats import LatencyTracker
+from ea_bridge import EABridge
+from activity_log import ActivityLog
+from portfolio import PortfolioAggregator
+from risk_rules import RiskEngine
+from discord_webhook import WebhookSender, redact_url
+from trade_curve import TradeCurveCache
+from scheduler import Scheduler
+from order_proximity import OrderProximityMonitor
+from exposure import ExposureEngine
+from bot_commands import CommandResponder
+from chart_renderer import ChartRenderer
+from positions_store import PositionStore
+from shared_state import SharedStateWriter, GuiBridge
+from gui_process import run_gui_process
+from outbox import NotificationOutbox, alert_key
+from strategy_stats import StrategyStats
+from bar_cache import BarCache, TIMEFRAME_SECONDS
+from correlation import CorrelationMonitor
 
 # Configuration file path
 CONFIG_FILE = "mt5_tracker_config.json"
@@ -26,29 +57,165 @@ class MT5OrderTracker:
         self.positions = {}  # Track open positions
         self.history = {}  # Track position history for profit tracking
         self.discord_bot = None
+        self.webhook = None  # Webhook sender when delivering without the gateway bot
         self.bot_thread = None
         self.gui = None
         self.tracking_active = False
         self.symbols = []  # Will store all available symbols
+        self.account_login = None
+        self.history_cache = None  # Local deal history cache for reports
+        self.trade_curves = None  # Tick-built P&L curves cached per ticket
+        self.live_profits = {}  # Unrealized P&L per ticket from the tick feed
+        self.tick_feed = None
+        self.router = AlertRouter()
+        self.risk_engine = RiskEngine()
+        self.order_monitor = OrderProximityMonitor()
+        self.symbol_filter = SymbolFilter()
+        self.config_mtime = None
+        self.account_snapshot = None  # Account values from the latest poll
+        self.equity_history = deque(maxlen=20000)  # (time, equity) per poll, about a day
+        self.last_snapshot = None
+        self.snapshot_generation = 0
+        self.pending_events = []  # Events raised since the last snapshot was published
+        self.subscribers = []  # Consumers of snapshot diffs (dashboard, ...)
+        self.exposure = ExposureEngine()
+        self.subscribers.append(self.exposure)
+        self.position_store = PositionStore()
+        self.subscribers.append(self.position_store)
+        self.strategy_stats = StrategyStats()
+        self.subscribers.append(self.strategy_stats)
+        self.responder = CommandResponder(self.exposure, self.position_store, self.strategy_stats)
+        self.subscribers.append(self.responder)
+        self.dashboard = None
+        self.event_stream = None
+        self.resync_pending = None  # Why to adopt the next poll quietly: 'reconnect' or 'filter_changed'
+        self.poll_detected_at = None  # When the current poll's MT5 data arrived
+        self.tracking_started = 0.0  # Trades before this predate tracking and get no latency
+        self.poll_loop = None  # Event loop the poll runs on
+        self.poll_lock = asyncio.Lock()  # Keeps timer and push-triggered polls from overlapping
+        self.last_full_poll = 0
+        self.ea_bridge = None
+        self.push_poll_pending = False
+        self.push_detected_at = None  # When the EA's latest unpolled events arrived
+        self.bridge_times = {}  # Ticket -> time_msc of its latest EA event
+        self.delivery_tasks = set()  # Alerts waiting for their chart
         
         # Configuration
         self.config = {
             "discord_token": "",
             "channel_id": "",
+            "delivery_mode": "bot",
+            "webhook_url": "",
+            "webhooks": {},
             "mt5_account": "",
             "mt5_password": "",
-            "mt5_server": ""
+            "mt5_server": "",
+            "cache_dir": "mt5_cache",
+            "history_start": "2015-01-01",
+            "history_chunk_days": 30,
+            "tick_interval": 0.5,
+            "tick_history_interval": 2.0,
+            "routing_rules": [],
+            "risk_rules": [],
+            "alert_charts": False,
+            "chart_workers": 1,
+            "chart_timeout": 5,
+            "slash_commands_enabled": True,
+            "command_guild_id": "",
+            "dashboard_enabled": False,
+            "dashboard_host": "127.0.0.1",
+            "dashboard_port": 8765,
+            "event_stream_enabled": False,
+            "event_stream_host": "127.0.0.1",
+            "event_stream_port": 8766,
+            "event_stream_format": "json",
+            "reconnect_max_delay": 60,
+            "poll_stall_seconds": 30,
+            "filters": {
+                "include_symbols": [],
+                "exclude_symbols": [],
+                "include_magics": [],
+                "exclude_magics": [],
+                "include_comments": [],
+                "exclude_comments": []
+            },
+            "poll_interval": 5,
+            "account_refresh_interval": 5,
+            "summary_schedule": "",
+            "eviction_schedule": "*/15 * * * *",
+            "checkpoint_schedule": "*/10 * * * *",
+            "history_retention_hours": 24,
+            "curve_cache_days": 30,
+            "scheduler_workers": 4,
+            "proximity_pips": 0,
+            "proximity_atr": 0,
+            "proximity_interval": 2,
+            "atr_period": 14,
+            "atr_timeframe": "H1",
+            "latency_slo_ms": 0,
+            "metrics_file": "",
+            "metrics_interval": 60,
+            "ea_bridge_file": "",
+            "reconcile_interval": 30,
+            "log_file": "mt5_tracker.log",
+            "log_capacity": 5000,
+            "log_max_bytes": 5000000,
+            "log_backup_count": 5,
+            "gui_process": False,
+            "outbox_enabled": True,
+            "outbox_retry_interval": 5,
+            "outbox_batch": 20,
+            "outbox_max_age_hours": 24,
+            "outbox_retention_days": 7,
+            "gui_max_positions": 4096,
+            "strategy_names": {},
+            "bar_cache_bars": 5000,
+            "correlation_timeframe": "H1",
+            "correlation_window": 100,
+            "correlation_interval": 60,
+            "bar_cache_days": 30,
+            "price_chart_timeframe": "M15",
+            "price_chart_bars": 150,
+            "portfolio_bucket_seconds": 5
         }
         
         # Load configuration if exists
         self.load_config()
         
+        self.tick_feed = TickProfitFeed(self, interval=self.config["tick_interval"])
+        self.reload_routing()
+        self.reload_filters()
+        self.reload_risk_rules()
+        self.reload_strategy_names()
+        self.latency = LatencyTracker(self.config["latency_slo_ms"])
+        self.supervisor = ConnectionSupervisor(
+            self,
+            max_delay=self.config["reconnect_max_delay"],
+            stall_after=self.config["poll_stall_seconds"]
+        )
+        self.portfolio = PortfolioAggregator(self.config["portfolio_bucket_seconds"])
+        self.scheduler = Scheduler(workers=self.config["scheduler_workers"])
+        self.charts = ChartRenderer(self.config["chart_workers"])
+        self.bar_cache = BarCache(os.path.join(self.config["cache_dir"], "bars"), self.config["bar_cache_bars"])
+        self.correlation = None
+        self.outbox = None
+        self.outbox_backlog = set()  # Channels with queued alerts; new alerts to them queue behind
+        if self.config["outbox_enabled"]:
+            try:
+                self.outbox = NotificationOutbox(os.path.join(self.config["cache_dir"], "outbox.db"))
+                self.outbox_backlog = self.outbox.pending_channels()
+            except Exception as e:
+                print(f"Error opening notification outbox: {e}")
+        self.supervisor.restart_poll_loop = lambda: self.scheduler.restart("poll")
+        self.setup_jobs()
+        
     def load_config(self):
         """Load configuration from file"""
         if os.path.exists(CONFIG_FILE):
             try:
                 with open(CONFIG_FILE, 'r') as f:
-                    self.config = json.load(f)
+                    self.config.update(json.load(f))
+                self.config_mtime = os.path.getmtime(CONFIG_FILE)
                 return True
             except Exception as e:
                 print(f"Error loading config: {e}")
@@ -59,11 +226,153 @@ class MT5OrderTracker:
         try:
             with open(CONFIG_FILE, 'w') as f:
                 json.dump(self.config, f, indent=4)
+            self.config_mtime = os.path.getmtime(CONFIG_FILE)
+            self.reload_routing()
+            self.reload_filters()
+            self.reload_risk_rules()
+            self.reload_strategy_names()
+            self.setup_jobs()
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
             return False
         
+    def reload_routing(self):
+        """Compile routing rules from the current configuration"""
+        try:
+            self.router.compile(self.config["routing_rules"], self.default_channel())
+        except Exception as e:
+            print(f"Error compiling routing rules: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error compiling routing rules: {e}", is_error=True)
+    
+    def reload_filters(self):
+        """Compile symbol, magic and comment filters from the current configuration"""
+        try:
+            symbol_filter = SymbolFilter.from_config(self.config["filters"])
+        except Exception as e:
+            print(f"Error compiling filters: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error compiling filters: {e}", is_error=True)
+            return
+        
+        # Items leaving or entering the filter are not real opens or closes
+        if symbol_filter.signature() != self.symbol_filter.signature():
+            self.symbol_filter = symbol_filter
+            if self.positions or self.orders:
+                # A pending reconnect resync still reports as one
+                self.resync_pending = self.resync_pending or 'filter_changed'
+    
+    def reload_risk_rules(self):
+        """Compile risk alert rules from the current configuration"""
+        try:
+            self.risk_engine.compile(self.config["risk_rules"])
+        except Exception as e:
+            print(f"Error compiling risk rules: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error compiling risk rules: {e}", is_error=True)
+    
+    def reload_strategy_names(self):
+        """Apply display names for magic numbers"""
+        try:
+            self.strategy_stats.set_names(self.config["strategy_names"])
+        except Exception as e:
+            print(f"Error loading strategy names: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error loading strategy names: {e}", is_error=True)
+    
+    def setup_jobs(self):
+        """(Re)schedule every recurring job from the current configuration"""
+        self.reload_order_monitor()
+        self.reload_correlation()
+        jobs = [
+            ("poll", self.poll_tick, self.config["poll_interval"]),
+            ("account_refresh", self.refresh_account_info, self.config["account_refresh_interval"]),
+            ("daily_summary", self.send_daily_summary, self.config["summary_schedule"]),
+            ("cache_eviction", self.evict_caches, self.config["eviction_schedule"]),
+            ("checkpoint", self.checkpoint_journals, self.config["checkpoint_schedule"]),
+            ("metrics_flush", self.flush_metrics,
+             self.config["metrics_interval"] if self.config["metrics_file"] else None),
+            ("order_proximity", self.check_order_proximity,
+             self.config["proximity_interval"] if self.order_monitor.enabled else None),
+            ("correlation", self.update_correlation, self.config["correlation_interval"]),
+            ("outbox_drain", self.drain_outbox, self.config["outbox_retry_interval"] if self.outbox else None),
+        ]
+        
+        for name, func, schedule in jobs:
+            if not schedule:
+                self.scheduler.remove_job(name)
+                continue
+            try:
+                # Coroutine jobs run on the poll loop so they never race a poll
+                self.scheduler.add_job(name, func, schedule, loop=lambda: self.poll_loop,
+                                       run_now=name == "account_refresh")
+            except Exception as e:
+                print(f"Error scheduling {name}: {e}")
+                if self.gui:
+                    self.gui.log_message(f"Error scheduling {name}: {e}", is_error=True)
+    
+    def reload_order_monitor(self):
+        """Apply pending order proximity settings, keeping alert state"""
+        try:
+            monitor = OrderProximityMonitor(
+                band_pips=self.config["proximity_pips"],
+                band_atr=self.config["proximity_atr"],
+                atr_period=self.config["atr_period"],
+                atr_timeframe=self.config["atr_timeframe"]
+            )
+        except Exception as e:
+            print(f"Error configuring order proximity monitor: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error configuring order proximity monitor: {e}", is_error=True)
+            return
+        monitor.alerted = self.order_monitor.alerted
+        self.order_monitor = monitor
+    
+    def reload_correlation(self):
+        """Rebuild the correlation monitor when its timeframe or window changed"""
+        timeframe, window = self.config["correlation_timeframe"], self.config["correlation_window"]
+        if self.correlation and (self.correlation.timeframe, self.correlation.window) == (timeframe, window):
+            return
+        if timeframe not in TIMEFRAME_SECONDS:
+            print(f"Unknown correlation timeframe: {timeframe}")
+            if self.gui:
+                self.gui.log_message(f"Unknown correlation timeframe: {timeframe}", is_error=True)
+            return
+        self.correlation = CorrelationMonitor(self.bar_cache, timeframe, window)
+    
+    def update_correlation(self):
+        """Refresh correlation and concentration of the symbols held"""
+        if not self.tracking_active or not self.connected or self.correlation is None:
+            return
+        self.correlation.update(self.position_store.query(sort=None))
+    
+    def fetch_orders(self):
+        """Fetch filtered pending orders, or None if the call failed"""
+        orders = self.supervisor.fetch(mt5.orders_get, **self.symbol_filter.query_kwargs())
+        return None if orders is None else self.symbol_filter.apply(orders)
+    
+    def fetch_positions(self):
+        """Fetch filtered open positions, or None if the call failed"""
+        positions = self.supervisor.fetch(mt5.positions_get, **self.symbol_filter.query_kwargs())
+        return None if positions is None else self.symbol_filter.apply(positions)
+    
+    def check_config_reload(self):
+        """Reload configuration and routing rules if the config file changed"""
+        try:
+            mtime = os.path.getmtime(CONFIG_FILE)
+        except OSError:
+            return
+        
+        if mtime != self.config_mtime and self.load_config():
+            self.reload_routing()
+            self.reload_filters()
+            self.reload_risk_rules()
+            self.reload_strategy_names()
+            self.setup_jobs()
+            if self.gui:
+                self.gui.log_message(f"Configuration reloaded ({self.router.rule_count} routing rules)")
+    
     def connect(self):
         """Connect to MT5 terminal"""
         # Initialize MT5
@@ -87,14 +396,34 @@ class MT5OrderTracker:
         self.connected = True
         print(f"Connected to MT5: {mt5.terminal_info()}")
         
+        account_info = mt5.account_info()
+        if account_info:
+            self.account_login = account_info.login
+        
         # Get all available symbols
         symbols_info = mt5.symbols_get()
         self.symbols = [symbol.name for symbol in symbols_info]
         
         return True
     
+    def default_channel(self):
+        """Channel alerts go to when no routing rule selects one"""
+        if self.config["delivery_mode"] == "webhook":
+            return self.config["webhook_url"]
+        return self.config["channel_id"]
+    
+    def webhook_url_for(self, channel):
+        """Resolve a routed channel (a URL or a key of the webhooks config) to a webhook URL"""
+        channel = str(channel)
+        if channel.startswith(("http://", "https://")):
+            return channel
+        return self.config["webhooks"].get(channel)
+    
     def start_discord_bot(self):
         """Start Discord bot in a separate thread"""
+        if self.config["delivery_mode"] == "webhook":
+            return self.start_webhook_delivery()
+        
         if not self.config["discord_token"] or not self.config["channel_id"]:
             if self.gui:
                 self.gui.log_message("Discord token or channel ID not configured", is_error=True)
@@ -104,6 +433,53 @@ class MT5OrderTracker:
         self.bot_thread.daemon = True
         self.bot_thread.start()
         return True
+    
+    def start_webhook_delivery(self):
+        """Deliver alerts through webhooks, running the poll loop without a bot"""
+        if not self.config["webhook_url"]:
+            if self.gui:
+                self.gui.log_message("Discord webhook URL not configured", is_error=True)
+            return False
+        
+        self.webhook = WebhookSender()
+        self.bot_thread = threading.Thread(target=self._run_webhook_loop)
+        self.bot_thread.daemon = True
+        self.bot_thread.start()
+        if self.gui:
+            self.gui.update_status("Delivering alerts through Discord webhook")
+        return True
+    
+    def _run_webhook_loop(self):
+        """Run the poll loop on a plain event loop for webhook delivery"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.poll_loop = loop
+        
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self.webhook.close())
+            loop.close()
+    
+    async def poll_tick(self):
+        """One timed poll; while EA events keep the book current, only account values are refreshed"""
+        self.supervisor.poll_started()
+        
+        # With the EA pushing events, timed polls only reconcile the book, but
+        # account values, risk rules and subscribers still update every tick
+        if self.ea_bridge and self.ea_bridge.attached:
+            if time.monotonic() - self.last_full_poll < self.config["reconcile_interval"]:
+                if self.tracking_active and self.connected:
+                    async with self.poll_lock:
+                        try:
+                            await self.refresh_account_state()
+                        except Exception as e:
+                            print(f"Error refreshing account state: {e}")
+                            if self.gui:
+                                self.gui.log_message(f"Error refreshing account state: {e}", is_error=True)
+                return
+        
+        await self.run_poll()
         
     def _run_discord_bot(self):
         """Run the Discord bot"""
@@ -117,17 +493,23 @@ class MT5OrderTracker:
         bot = commands.Bot(command_prefix='!', intents=intents)
         self.discord_bot = bot
         
+        if self.config["slash_commands_enabled"]:
+            self.register_commands(bot)
+        commands_synced = False
+        
         @bot.event
         async def on_ready():
+            nonlocal commands_synced
             print(f'Discord bot logged in as {bot.user}')
-            track_orders.start()
+            # The scheduler starts polling once the loop is known
+            self.poll_loop = bot.loop
             if self.gui:
                 self.gui.update_status(f"Discord bot connected as {bot.user}")
-        
-        @tasks.loop(seconds=5)
-        async def track_orders():
-            if self.tracking_active:
-                await self.check_orders_and_positions()
+            
+            # on_ready fires again after gateway reconnects; register commands once
+            if self.config["slash_commands_enabled"] and not commands_synced:
+                commands_synced = True
+                await self.sync_commands(bot)
         
         try:
             bot.run(self.config["discord_token"])
@@ -141,37 +523,435 @@ class MT5OrderTracker:
             if self.gui:
                 self.gui.log_message(f"ERROR: Discord bot failed to start - {e}", is_error=True)
     
-    async def send_discord_message(self, message):
-        """Send message to Discord channel"""
-        if self.discord_bot:
+    def register_commands(self, bot):
+        """Add slash commands answered from the latest snapshot, never from MT5"""
+        @bot.tree.command(name="positions", description="List open positions")
+        @discord.app_commands.describe(symbol="Only positions in this symbol")
+        async def positions_command(interaction: discord.Interaction, symbol: str = None):
+            await interaction.response.send_message(self.responder.reply('positions', symbol.upper() if symbol else None))
+        
+        @bot.tree.command(name="pnl", description="Realized and floating profit")
+        @discord.app_commands.describe(period="today, or everything since the tracker started")
+        @discord.app_commands.choices(period=[
+            discord.app_commands.Choice(name="today", value="today"),
+            discord.app_commands.Choice(name="session", value="session")
+        ])
+        async def pnl_command(interaction: discord.Interaction, period: str = "today"):
+            await interaction.response.send_message(self.responder.reply('pnl', period))
+        
+        @bot.tree.command(name="exposure", description="Net exposure per currency and asset")
+        async def exposure_command(interaction: discord.Interaction):
+            await interaction.response.send_message(self.responder.reply('exposure'))
+        
+        @bot.tree.command(name="strategies", description="Open positions and P/L per strategy")
+        async def strategies_command(interaction: discord.Interaction):
+            await interaction.response.send_message(self.responder.reply('strategies'))
+        
+        @bot.tree.command(name="account", description="Account balance, equity and margin")
+        async def account_command(interaction: discord.Interaction):
+            await interaction.response.send_message(self.responder.reply('account'))
+    
+    async def sync_commands(self, bot):
+        """Publish the slash commands to one guild (instant) or globally"""
+        try:
+            if self.config["command_guild_id"]:
+                guild = discord.Object(id=int(self.config["command_guild_id"]))
+                bot.tree.copy_global_to(guild=guild)
+                synced = await bot.tree.sync(guild=guild)
+            else:
+                synced = await bot.tree.sync()
+            print(f"Registered {len(synced)} slash commands")
+        except Exception as e:
+            print(f"Error registering slash commands: {e}")
+            if self.gui:
+                self.gui.log_message(f"Error registering slash commands: {e}", is_error=True)
+    
+    async def send_discord_message(self, message, channel_id=None, event_type=None, stamps=None, image=None):
+        """Send message to Discord channel, with an optional PNG chart.
+        
+        Returns None once Discord has acknowledged the message, else an
+        (error, permanent) pair; permanent errors will fail again on retry.
+        """
+        channel_id = channel_id or self.default_channel()
+        permanent = False
+        if self.discord_bot or self.webhook:
             try:
-                channel = self.discord_bot.get_channel(int(self.config["channel_id"]))
+                if self.webhook:
+                    channel = self.webhook_url_for(channel_id)
+                else:
+                    channel = self.discord_bot.get_channel(int(channel_id))
                 if channel:
-                    await channel.send(message)
+                    if stamps is not None:
+                        stamps['send'] = time.time()
+                    if self.webhook:
+                        await self.webhook.send(channel, message, file=("chart.png", image) if image else None)
+                    elif image:
+                        await channel.send(message, file=discord.File(io.BytesIO(image), filename="chart.png"))
+                    else:
+                        await channel.send(message)
+                    if stamps is not None:
+                        stamps['ack'] = time.time()
+                        self.record_latency(event_type, stamps)
                     if self.gui:
                         self.gui.log_message(f"Discord message sent: {message[:50]}...")
-                else:
-                    error_msg = f"Could not find channel with ID {self.config['channel_id']}"
-                    print(error_msg)
-                    if self.gui:
-                        self.gui.log_message(error_msg, is_error=True)
+                    return None
+                error_msg = f"Could not find channel with ID {redact_url(channel_id)}"
+                permanent = True
             except Exception as e:
-                print(f"Error sending Discord message: {e}")
-                if self.gui:
-                    self.gui.log_message(f"Error sending Discord message: {e}", is_error=True)
+                if event_type:
+                    self.latency.record_failure(event_type)
+                error_msg = f"Error sending Discord message: {redact_url(e)}"
+                # Client errors (unknown channel, missing access, bad request) won't succeed later
+                status = getattr(e, 'status', None)
+                permanent = isinstance(status, int) and 400 <= status < 500 and status not in (408, 429)
         else:
             error_msg = "Discord bot not initialized"
+        
+        print(error_msg)
+        if self.gui:
+            self.gui.log_message(error_msg, is_error=True)
+        return error_msg, permanent
+    
+    def record_latency(self, event_type, stamps):
+        """Record an alert's stage latencies and warn when it breaches the SLO"""
+        breach_ms = self.latency.record(event_type, stamps)
+        if breach_ms is not None and self.gui:
+            self.gui.log_message(
+                f"Alert latency SLO breached: {event_type} took {breach_ms:.0f} ms "
+                f"(SLO {self.latency.slo_ms} ms)", is_error=True
+            )
+    
+    def flush_metrics(self):
+        """Write latency and scheduled job metrics to the metrics file"""
+        try:
+            self.latency.write_metrics(self.config["metrics_file"], jobs=self.scheduler.report())
+        except Exception as e:
+            print(f"Error writing metrics: {e}")
+    
+    def refresh_account_info(self):
+        """Fetch account values off the GUI thread and hand them to the GUI"""
+        if not self.gui:
+            return
+        account_info = self.get_account_info()
+        self.gui.post_account_info(account_info)
+    
+    async def send_daily_summary(self):
+        """Send the scheduled account summary"""
+        if not self.tracking_active:
+            return
+        
+        account = self.get_account_info()
+        if account is None:
+            return
+        
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        deals = self.supervisor.fetch(mt5.history_deals_get, today, datetime.now() + timedelta(days=1)) or ()
+        closed = [
+            deal for deal in deals
+            if deal.entry != mt5.DEAL_ENTRY_IN and deal.type in (mt5.DEAL_TYPE_BUY, mt5.DEAL_TYPE_SELL)
+        ]
+        realized = sum(deal.profit + deal.swap + deal.commission + deal.fee for deal in deals
+                       if deal.type in (mt5.DEAL_TYPE_BUY, mt5.DEAL_TYPE_SELL))
+        
+        message = (
+            f"📊 **Daily Summary**\n"
+            f"Balance: ${account['balance']:.2f}\n"
+            f"Equity: ${account['equity']:.2f}\n"
+            f"Floating P/L: ${account['profit']:.2f}\n"
+            f"Open Positions: {len(self.positions)}\n"
+            f"Closed Today: {len(closed)} (net ${realized:.2f})\n"
+            f"Net Exposure: {self.exposure.summary_line()}\n"
+            f"By Symbol: {self.symbol_summary_line()}"
+        )
+        if self.correlation:
+            message += f"\nConcentration: {self.correlation.summary_line()}"
+        strategy_lines = self.strategy_stats.summary_lines()
+        if strategy_lines:
+            message += "\n**By Strategy**\n" + "\n".join(strategy_lines)
+        
+        equity = [sample for sample in self.equity_history if sample[0] >= today]
+        chart = (('equity', today.date().isoformat(), len(equity)), "Equity today", equity)
+        await self.notify('daily_summary', message, chart=chart)
+    
+    def symbol_summary_line(self, limit=5):
+        """Open positions and floating P/L per symbol, largest first"""
+        groups = self.position_store.group('symbol')
+        parts = [f"{group['symbol']} {group['count']} ({group['profit']:+.2f})" for group in groups[:limit]]
+        return " | ".join(parts) if parts else "Flat"
+    
+    async def check_order_proximity(self):
+        """Alert on pending orders that came within the configured band of triggering"""
+        if not self.tracking_active or not self.connected:
+            return
+        
+        orders = self.orders
+        for ticket, pips, atr_units in self.order_monitor.check(orders):
+            order = orders[ticket]
+            type_name = ORDER_TYPE_NAMES[order.type] if order.type < len(ORDER_TYPE_NAMES) else str(order.type)
+            distance = f"{pips:.1f} pips"
+            if not np.isnan(atr_units):
+                distance += f" ({atr_units:.2f} ATR)"
+            
+            message = (
+                f"📍 **Pending Order Near Trigger**\n"
+                f"Symbol: {order.symbol}\n"
+                f"Order ID: {ticket}\n"
+                f"Type: {type_name}\n"
+                f"Volume: {order.volume_current}\n"
+                f"Trigger Price: {order.price_open}\n"
+                f"Distance: {distance}"
+            )
+            await self.notify('order_near_trigger', message, order.symbol, order.magic)
+            
+            if self.gui:
+                self.gui.log_message(f"Order {ticket} {order.symbol} is {distance} from its trigger")
+    
+    async def evict_caches(self):
+        """Drop closed positions' profit history and stale trade curves"""
+        cutoff = datetime.now() - timedelta(hours=self.config["history_retention_hours"])
+        expired = [
+            ticket for ticket, entry in self.history.items()
+            if entry.get('close_time') is not None and entry['close_time'] < cutoff
+            and self.portfolio.is_settled(ticket)
+        ]
+        for ticket in expired:
+            del self.history[ticket]
+        self.portfolio.forget(expired)
+        
+        if self.trade_curves:
+            await asyncio.to_thread(self.trade_curves.evict, self.config["curve_cache_days"])
+        if self.outbox:
+            self.outbox.purge(self.config["outbox_retention_days"])
+        await asyncio.to_thread(self.bar_cache.evict, self.config["bar_cache_days"])
+    
+    def checkpoint_journals(self):
+        """Fold SQLite write-ahead logs back into their databases"""
+        if self.history_cache:
+            self.history_cache.checkpoint()
+        if self.outbox:
+            self.outbox.checkpoint()
+    
+    def add_event(self, event_type, message, symbol=None, magic=None, profit=None):
+        """Queue an event for the next snapshot's subscribers"""
+        self.pending_events.append({
+            'type': event_type,
+            'symbol': symbol,
+            'magic': magic,
+            'profit': profit,
+            'message': message,
+            'time': datetime.now().isoformat(timespec='seconds')
+        })
+    
+    async def notify(self, event_type, message, symbol=None, magic=None, profit=None, trade_time_msc=None,
+                     chart=None):
+        """Send an alert to every channel the routing rules select.
+        
+        chart is an optional (cache key, title, [(time, value), ...]) to attach as an image.
+        """
+        queued = time.time()
+        self.add_event(event_type, message, symbol, magic, profit)
+        
+        channels = self.router.route(event_type, symbol, magic, self.account_login, profit)
+        if not channels and self.gui:
+            self.gui.log_message(f"Alert muted by routing rules: {event_type} {symbol or ''}")
+        
+        detected = self.poll_detected_at or queued
+        trade = self.latency.server_to_local(trade_time_msc) if trade_time_msc else None
+        if trade is not None and trade < self.tracking_started:
+            # Already there when tracking started (e.g. the first poll's book); not a detection delay
+            trade = None
+        def make_stamps():
+            return {
+                'trade': trade,
+                'detected': detected,
+                'queued': queued
+            }
+        
+        # Detecting the same trade event again (e.g. after a restart) gives the same key
+        key = (event_type, message, trade_time_msc or queued)
+        
+        if chart and channels and self.config["alert_charts"]:
+            # Deliver in the background so rendering never holds up the poll
+            task = asyncio.ensure_future(
+                self.deliver_with_chart(message, channels, event_type, make_stamps, key, chart)
+            )
+            self.delivery_tasks.add(task)
+            task.add_done_callback(self.delivery_tasks.discard)
+            return
+        
+        for channel_id in channels:
+            await self.deliver(message, channel_id, event_type, make_stamps(), key)
+    
+    async def deliver(self, message, channel_id, event_type, stamps, key, image=None):
+        """Send one alert through the outbox, which keeps it until Discord acknowledges it"""
+        if self.outbox is None:
+            await self.send_discord_message(message, channel_id, event_type, stamps, image)
+            return
+        
+        channel_id = str(channel_id or self.default_channel())
+        alert_id = self.outbox.add(alert_key(*key, channel_id), channel_id, event_type, message, image)
+        if alert_id is None:
+            return  # Already queued or delivered
+        if channel_id in self.outbox_backlog:
+            return  # Keep alerts in order behind the ones still waiting for this channel
+        
+        result = await self.send_discord_message(message, channel_id, event_type, stamps, image)
+        if result is None:
+            self.outbox.mark_delivered(alert_id)
+        else:
+            self.outbox_failed(alert_id, channel_id, *result)
+    
+    def outbox_failed(self, alert_id, channel_id, error, permanent):
+        """Dead-letter an alert that can never be sent, else back it off and hold its channel"""
+        if permanent:
+            self.outbox.mark_dead(alert_id, error)
+            if self.gui:
+                self.gui.log_message(f"Alert to {redact_url(channel_id)} dropped: {error}", is_error=True)
+            return False
+        self.outbox.mark_failed(alert_id, error)
+        self.outbox_backlog.add(channel_id)
+        return True
+    
+    async def drain_outbox(self):
+        """Retry queued alerts oldest first per channel, a batch per run, backing off while sends fail"""
+        if self.outbox is None or not (self.discord_bot or self.webhook):
+            return
+        
+        expired = self.outbox.expire(self.config["outbox_max_age_hours"] * 3600)
+        if expired:
+            error_msg = (f"{expired} queued alerts were not delivered within "
+                         f"{self.config['outbox_max_age_hours']} hours and were dropped")
             print(error_msg)
             if self.gui:
                 self.gui.log_message(error_msg, is_error=True)
+        
+        delivered = 0
+        held = set()  # Channels whose oldest alert failed again this run
+        for alert_id, channel_id, event_type, message, image, attempts in self.outbox.due(self.config["outbox_batch"]):
+            if channel_id in held:
+                continue
+            result = await self.send_discord_message(message, channel_id, event_type, image=image)
+            if result is None:
+                self.outbox.mark_delivered(alert_id)
+                delivered += 1
+            elif self.outbox_failed(alert_id, channel_id, *result):
+                held.add(channel_id)  # Wait out the backoff before trying the rest of this channel
+        
+        if delivered and self.gui:
+            self.gui.log_message(f"Delivered {delivered} queued alerts")
+        self.outbox_backlog = self.outbox.pending_channels()
+    
+    async def deliver_with_chart(self, message, channels, event_type, make_stamps, key, chart):
+        """Render an alert's chart in the process pool, then send it to every channel"""
+        image = None
+        try:
+            image = await asyncio.wait_for(self.charts.render(*chart), self.config["chart_timeout"])
+        except Exception as e:
+            print(f"Error rendering alert chart: {e!r}")
+            if self.gui:
+                self.gui.log_message(f"Alert sent without its chart: {e!r}", is_error=True)
+        
+        for channel_id in channels:
+            await self.deliver(message, channel_id, event_type, make_stamps(), key, image)
+    
+    def close_event(self, reason):
+        """Event type and alert title for a position closed with a deal reason"""
+        if reason == mt5.DEAL_REASON_SL:
+            return 'sl_hit', "🛡️ **Stop Loss Hit**"
+        if reason == mt5.DEAL_REASON_TP:
+            return 'tp_hit', "🏆 **Take Profit Hit**"
+        if reason == mt5.DEAL_REASON_SO:
+            return 'stop_out', "⚠️ **Position Stopped Out**"
+        return 'position_closed', "🔔 **Position Closed**"
+    
+    def get_close_details(self, position_id):
+        """Look up the realized profit and close reason of a closed position"""
+        deals = mt5.history_deals_get(position=position_id)
+        if not deals:
+            return None, None, None
+        
+        exits = [deal for deal in deals if deal.entry != mt5.DEAL_ENTRY_IN]
+        if not exits:
+            return None, None, None
+        
+        profit = sum(deal.profit + deal.swap + deal.commission + deal.fee for deal in deals)
+        return profit, exits[-1].reason, exits[-1].time_msc
+    
+    async def run_poll(self):
+        """Run one poll, never letting an exception escape into the loop"""
+        if not self.tracking_active:
+            self.push_poll_pending = False  # Or later EA events would never trigger a poll
+            return
+        
+        async with self.poll_lock:
+            self.push_poll_pending = False
+            try:
+                await self.check_orders_and_positions()
+            except Exception as e:
+                print(f"Error checking orders and positions: {e}")
+                if self.gui:
+                    self.gui.log_message(f"Error checking orders and positions: {e}", is_error=True)
+    
+    def on_bridge_events(self, records, overrun):
+        """Poll immediately when the EA pushes trade events"""
+        if self.push_detected_at is None:
+            self.push_detected_at = time.time()  # The trade was detected now, not when the poll runs
+        for record in records:
+            self.bridge_times[record['ticket']] = record['time_msc']
+        
+        if overrun and self.gui:
+            self.gui.log_message("EA bridge overrun, reconciling with a full poll", is_error=True)
+        
+        # Events arriving together are handled by one poll
+        if self.poll_loop is None or self.push_poll_pending:
+            return
+        self.push_poll_pending = True
+        asyncio.run_coroutine_threadsafe(self.run_poll(), self.poll_loop)
+    
+    def start_ea_bridge(self):
+        """Follow the EA's event ring buffer if configured"""
+        if self.ea_bridge or not self.config["ea_bridge_file"]:
+            return
+        
+        path = self.config["ea_bridge_file"]
+        if not os.path.isabs(path):
+            # The EA writes into the terminal's shared Common\Files folder
+            terminal_info = mt5.terminal_info()
+            if terminal_info is None:
+                return
+            path = os.path.join(terminal_info.commondata_path, "Files", path)
+        
+        self.ea_bridge = EABridge(path, self.on_bridge_events)
+        self.ea_bridge.start()
+        if self.gui:
+            self.gui.log_message(f"Waiting for EA events on {path}")
     
     async def check_orders_and_positions(self):
-        """Check for new orders and position updates across all symbols"""
+        """Check for new orders and position updates across tracked symbols"""
         if not self.connected:
             return
         
-        # Check for new orders (all symbols)
-        orders = mt5.orders_get()
+        self.check_config_reload()
+        
+        if not self.supervisor.terminal_ready():
+            return
+        
+        # Fetch orders and positions matching the filters. None means the call failed,
+        # which must not be mistaken for every order and position having closed
+        orders = self.fetch_orders()
+        positions = self.fetch_positions()
+        if orders is None or positions is None:
+            return
+        
+        self.poll_detected_at, self.push_detected_at = self.push_detected_at or time.time(), None
+        self.last_full_poll = time.monotonic()
+        self.latency.update_server_offset(self.offset_symbols(orders, positions))
+        
+        if self.resync_pending:
+            await self.resync_state(orders, positions, self.resync_pending)
+            return
+        
+        # Check for new orders
         current_orders = {}
         
         if orders:
@@ -189,7 +969,7 @@ class MT5OrderTracker:
                         f"Price: {order.price_open}\n"
                         f"Time: {datetime.fromtimestamp(order.time_setup)}"
                     )
-                    await self.send_discord_message(message)
+                    await self.notify('order_placed', message, order.symbol, order.magic, trade_time_msc=order.time_setup_msc)
                     if self.gui:
                         self.gui.log_message(f"New order detected: {order.symbol} {order.ticket}")
         
@@ -202,14 +982,13 @@ class MT5OrderTracker:
                     f"Symbol: {order.symbol}\n"
                     f"Order ID: {order_id}"
                 )
-                await self.send_discord_message(message)
+                await self.notify('order_closed', message, order.symbol, order.magic)
                 if self.gui:
                     self.gui.log_message(f"Order closed: {order.symbol} {order_id}")
         
         self.orders = current_orders
         
-        # Check positions (all symbols)
-        positions = mt5.positions_get()
+        # Check positions
         current_positions = {}
         
         if positions:
@@ -229,21 +1008,16 @@ class MT5OrderTracker:
                         f"TP: {position.tp}\n"
                         f"Time: {datetime.fromtimestamp(position.time)}"
                     )
-                    await self.send_discord_message(message)
+                    await self.notify(
+                        'position_opened', message, position.symbol, position.magic, position.profit,
+                        trade_time_msc=position.time_msc
+                    )
                     
                     # Add to history for tracking
-                    self.history[position_id] = {
-                        'symbol': position.symbol,
-                        'type': 'Buy' if position.type == mt5.POSITION_TYPE_BUY else 'Sell',
-                        'open_time': datetime.fromtimestamp(position.time),
-                        'open_price': position.price_open,
-                        'volume': position.volume,
-                        'profit_history': [(datetime.now(), position.profit)]
-                    }
+                    self.track_position_history(position)
                     
                     if self.gui:
                         self.gui.log_message(f"New position: {position.symbol} {position_id}")
-                        self.gui.update_positions_table()
                 else:
                     # Check if SL or TP changed
                     old_position = self.positions[position_id]
@@ -256,7 +1030,14 @@ class MT5OrderTracker:
                             f"New TP: {position.tp}\n"
                             f"Current Profit: {position.profit}"
                         )
-                        await self.send_discord_message(message)
+                        await self.notify(
+                            'position_modified', message, position.symbol, position.magic, position.profit,
+                            trade_time_msc=position.time_update_msc
+                        )
+                        if position_id in self.history:
+                            self.history[position_id]['levels'].append(
+                                (position.time_update_msc // 1000, position.sl, position.tp)
+                            )
                         if self.gui:
                             self.gui.log_message(f"Position updated: {position.symbol} {position_id}")
                     
@@ -271,31 +1052,204 @@ class MT5OrderTracker:
             if position_id not in current_positions:
                 position = self.positions[position_id]
                 
-                # Get the last known profit if possible
-                last_profit = "Unknown"
-                if position_id in self.history and self.history[position_id]['profit_history']:
-                    last_profit = self.history[position_id]['profit_history'][-1][1]
+                # Prefer the realized profit from the deal history, else the last known profit
+                last_profit, reason, close_time_msc = self.get_close_details(position_id)
+                if close_time_msc is None:
+                    # Deal history can lag the close; the EA stamped it when it happened
+                    close_time_msc = self.bridge_times.get(position_id)
+                if last_profit is None:
+                    last_profit = "Unknown"
+                    if position_id in self.history and self.history[position_id]['profit_history']:
+                        last_profit = self.history[position_id]['profit_history'][-1][1]
+                
+                event_type, title = self.close_event(reason)
                 
                 message = (
-                    f"🔔 **Position Closed**\n"
+                    f"{title}\n"
                     f"Symbol: {position.symbol}\n"
                     f"Position ID: {position_id}\n"
                     f"Type: {'Buy' if position.type == mt5.POSITION_TYPE_BUY else 'Sell'}\n"
                     f"Volume: {position.volume}\n"
                     f"Final Profit: {last_profit}"
                 )
-                await self.send_discord_message(message)
+                chart = None
+                if position_id in self.history:
+                    chart = (
+                        ('trade', position_id),
+                        f"{position.symbol} {position_id} profit",
+                        list(self.history[position_id]['profit_history'])
+                    )
+                await self.notify(
+                    event_type, message, position.symbol, position.magic,
+                    last_profit if isinstance(last_profit, float) else None,
+                    trade_time_msc=close_time_msc, chart=chart
+                )
+                
+                if position_id in self.history:
+                    self.history[position_id]['close_time'] = datetime.now()
                 
                 if self.gui:
                     self.gui.log_message(f"Position closed: {position.symbol} {position_id} with profit {last_profit}")
-                    self.gui.update_positions_table()
         
         self.positions = current_positions
+        self.live_profits = {
+            position_id: profit for position_id, profit in self.live_profits.items()
+            if position_id in current_positions
+        }
+        self.bridge_times = {
+            ticket: time_msc for ticket, time_msc in self.bridge_times.items()
+            if ticket in current_positions or ticket in current_orders
+        }
+        
+        await self.refresh_account_state()
+    
+    async def refresh_account_state(self):
+        """Fetch account values, check risk rules and publish the snapshot"""
+        self.account_snapshot = self.get_account_info()
+        if self.account_snapshot:
+            self.equity_history.append((datetime.now(), self.account_snapshot['equity']))
+        await self.check_risk_rules()
+        self.publish_snapshot()
         
         # Update GUI if available
         if self.gui:
             self.gui.update_positions_table()
     
+    def offset_symbols(self, orders, positions):
+        """Symbols to read server time from: held ones first, so flat accounts still get an estimate"""
+        held = list(dict.fromkeys(item.symbol for item in (*positions, *orders)))
+        yield from held
+        for symbol in mt5.symbols_get() or ():
+            if symbol.visible and symbol.name not in held:
+                yield symbol.name
+    
+    async def check_risk_rules(self):
+        """Alert on risk thresholds crossed by the latest account and positions"""
+        for alert in self.risk_engine.evaluate(self.account_snapshot, self.positions):
+            subject = f"{alert['symbol']} " if alert['symbol'] else ""
+            if alert['ticket']:
+                subject += f"(ID: {alert['ticket']}) "
+            
+            if alert['state'] == 'triggered':
+                event_type, title = 'risk_alert', "🚨 **Risk Alert**"
+                detail = f"{alert['label']} {alert['value']:.2f} breached {alert['threshold']:.2f}"
+            else:
+                event_type, title = 'risk_cleared', "✅ **Risk Alert Cleared**"
+                detail = f"{alert['label']} back to {alert['value']:.2f} (clear level {alert['threshold']:.2f})"
+            
+            message = f"{title}\nRule: {alert['rule']}\n{subject}{detail}"
+            await self.notify(event_type, message, alert['symbol'], alert['magic'])
+            
+            if self.gui:
+                self.gui.log_message(f"Risk rule {alert['rule']} {alert['state']}: {subject}{detail}")
+    
+    def track_position_history(self, position):
+        """Start recording profit history for a position"""
+        self.history[position.ticket] = {
+            'symbol': position.symbol,
+            'type': 'Buy' if position.type == mt5.POSITION_TYPE_BUY else 'Sell',
+            'open_time': datetime.fromtimestamp(position.time),
+            'open_price': position.price_open,
+            'volume': position.volume,
+            'magic': position.magic,
+            'levels': [(position.time, position.sl, position.tp)],  # (server time, SL, TP) per modification
+            'profit_history': [(datetime.now(), position.profit)]
+        }
+    
+    async def resync_state(self, orders, positions, reason='reconnect'):
+        """Adopt the book after a reconnect or filter change without alerting every difference"""
+        current_orders = {order.ticket: order for order in orders}
+        current_positions = {position.ticket: position for position in positions}
+        
+        opened = [ticket for ticket in current_positions if ticket not in self.positions]
+        closed = [ticket for ticket in self.positions if ticket not in current_positions]
+        for ticket in opened:
+            self.track_position_history(current_positions[ticket])
+        for ticket in closed:
+            # Lets the portfolio drop their floating P&L and the caches evict them
+            if ticket in self.history:
+                self.history[ticket]['close_time'] = datetime.now()
+            if reason == 'reconnect':
+                # No alert, but subscribers still book the realized P&L (positions
+                # leaving the filter are not closes and book nothing)
+                position = self.positions[ticket]
+                profit, close_reason, _ = self.get_close_details(ticket)
+                event_type, title = self.close_event(close_reason)
+                self.add_event(
+                    event_type, f"{title} while disconnected\nSymbol: {position.symbol}\nPosition ID: {ticket}",
+                    position.symbol, position.magic, profit
+                )
+        
+        self.orders = current_orders
+        self.positions = current_positions
+        self.live_profits = {}
+        self.resync_pending = None
+        
+        if reason == 'filter_changed':
+            summary = (
+                f"Resynced after filter change: {len(current_positions)} open positions, "
+                f"{len(opened)} now matched and {len(closed)} no longer matched"
+            )
+        else:
+            summary = (
+                f"Resynced after reconnect: {len(current_positions)} open positions, "
+                f"{len(opened)} opened and {len(closed)} closed while disconnected"
+            )
+        print(summary)
+        if self.gui:
+            self.gui.log_message(summary)
+        
+        # One summary alert instead of a close/open alert for every position;
+        # a filter change is the user's own doing and is only logged
+        if reason == 'reconnect' and (opened or closed):
+            await self.notify('reconnected', f"🔌 **MT5 Reconnected**\n{summary}")
+        
+        self.account_snapshot = self.get_account_info()
+        self.publish_snapshot()
+        if self.gui:
+            self.gui.update_positions_table()
+    
+    def publish_snapshot(self):
+        """Diff the polled state against the previous poll and hand it to subscribers"""
+        snapshot = build_snapshot(self.account_login, self.account_snapshot, self.orders, self.positions)
+        diff = diff_snapshots(self.last_snapshot, snapshot)
+        events, self.pending_events = self.pending_events, []
+        
+        self.last_snapshot = snapshot
+        if diff is None and not events:
+            return
+        
+        self.snapshot_generation += 1
+        for subscriber in self.subscribers:
+            try:
+                subscriber.publish(self.snapshot_generation, snapshot, diff, events)
+            except Exception as e:
+                print(f"Error publishing snapshot: {e}")
+    
+    def start_publishers(self):
+        """Start the browser dashboard and local event stream if enabled"""
+        if not self.dashboard and self.config["dashboard_enabled"]:
+            self.dashboard = WebDashboard(self.config["dashboard_host"], int(self.config["dashboard_port"]))
+            self.dashboard.start()
+            self.subscribers.append(self.dashboard)
+            if self.gui:
+                self.gui.log_message(
+                    f"Dashboard available at http://{self.config['dashboard_host']}:{self.config['dashboard_port']}/"
+                )
+        
+        if not self.event_stream and self.config["event_stream_enabled"]:
+            self.event_stream = EventStreamServer(
+                self.config["event_stream_host"],
+                int(self.config["event_stream_port"]),
+                fmt=self.config["event_stream_format"]
+            )
+            self.event_stream.start()
+            self.subscribers.append(self.event_stream)
+            if self.gui:
+                self.gui.log_message(
+                    f"Event stream listening on {self.config['event_stream_host']}:{self.config['event_stream_port']}"
+                )
+    
     def start_tracking(self):
         """Start tracking orders and positions"""
         if not self.connected and not self.connect():
@@ -303,12 +1257,19 @@ class MT5OrderTracker:
                 self.gui.log_message("Failed to connect to MT5", is_error=True)
             return False
         
-        if not self.discord_bot and not self.start_discord_bot():
+        if not (self.discord_bot or self.webhook) and not self.start_discord_bot():
             if self.gui:
                 self.gui.log_message("Failed to start Discord bot", is_error=True)
             return False
         
         self.tracking_active = True
+        self.tracking_started = time.time()
+        self.supervisor.start()
+        self.tick_feed.start()
+        if self.config["alert_charts"]:
+            self.charts.start()
+        self.start_publishers()
+        self.start_ea_bridge()
         if self.gui:
             self.gui.log_message("Order tracking started")
             self.gui.update_status("Tracking active")
@@ -319,11 +1280,35 @@ class MT5OrderTracker:
     def stop_tracking(self):
         """Stop tracking orders and positions"""
         self.tracking_active = False
+        self.supervisor.stop()
+        self.tick_feed.stop()
+        if self.ea_bridge:
+            # Started again, with the current bridge file, by the next start_tracking
+            self.ea_bridge.stop()
+            self.ea_bridge = None
         if self.gui:
             self.gui.log_message("Order tracking stopped")
             self.gui.update_status("Tracking stopped")
             self.gui.update_tracking_buttons(False)
     
+    def update_live_profits(self, profits, timestamp):
+        """Record unrealized P&L computed from ticks between position polls.
+        
+        Every tick updates the live profit column; profit history takes a
+        tick sample at most once per tick_history_interval per position, so
+        it stays near real time without growing at tick rate.
+        """
+        self.live_profits = profits
+        
+        spacing = timedelta(seconds=self.config["tick_history_interval"])
+        for position_id, profit in profits.items():
+            if position_id in self.history:
+                profit_history = self.history[position_id]['profit_history']
+                if not profit_history or (
+                    profit_history[-1][1] != profit and timestamp - profit_history[-1][0] >= spacing
+                ):
+                    profit_history.append((timestamp, profit))
+    
     def get_account_info(self):
         """Get account information from MT5"""
         if not self.connected:
@@ -341,41 +1326,135 @@ class MT5OrderTracker:
             }
         return None
     
-    def get_positions_data(self):
-        """Get current positions data as DataFrame"""
+    def get_positions_data(self, where=None, sort='time', descending=False):
+        """Get open positions from the positions store as row dicts"""
         if not self.connected:
-            return pd.DataFrame()
-        
-        positions = mt5.positions_get()
-        if not positions:
-            return pd.DataFrame()
-        
-        positions_data = []
-        for position in positions:
-            positions_data.append({
-                'ticket': position.ticket,
-                'symbol': position.symbol,
-                'type': 'Buy' if position.type == mt5.POSITION_TYPE_BUY else 'Sell',
-                'volume': position.volume,
-                'open_price': position.price_open,
-                'current_price': position.price_current,
-                'sl': position.sl,
-                'tp': position.tp,
-                'profit': position.profit,
-                'swap': position.swap,
-                'time': datetime.fromtimestamp(position.time)
-            })
-        
-        return pd.DataFrame(positions_data)
+            return []
+        return self.position_store.query(where, sort, descending)
+    
+    def get_history_cache(self):
+        """Get the deal history cache for the connected account"""
+        if not self.connected:
+            return None
+        
+        if self.history_cache is None:
+            path = os.path.join(self.config["cache_dir"], f"deals_{self.account_login}.db")
+            start = datetime.fromisoformat(self.config["history_start"])
+            self.history_cache = DealHistoryCache(path, start, self.config["history_chunk_days"])
+        
+        return self.history_cache
+    
+    def get_trade_curve(self, ticket):
+        """Rebuild a position's P&L curve from ticks, served from the disk cache when possible"""
+        if self.trade_curves is None:
+            if self.account_login is None:
+                return None
+            path = os.path.join(self.config["cache_dir"], f"curves_{self.account_login}")
+            self.trade_curves = TradeCurveCache(path)
+        
+        return self.trade_curves.get_curve(ticket, connected=self.connected)
+    
+    def get_price_chart(self, ticket, timeframe, count):
+        """Cached bars plus the forming bar and trade levels for a position's candle chart"""
+        entry = self.history.get(ticket)
+        if entry is None:
+            return None
+        
+        symbol = entry['symbol']
+        if self.connected:
+            self.bar_cache.update(symbol, timeframe)
+        bars = self.bar_cache.bars(symbol, timeframe, count)
+        if bars is None:
+            return None
+        
+        if self.connected:
+            forming = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, 1)
+            if forming is not None and len(forming) and forming['time'][0] > bars['time'][-1]:
+                bars = np.concatenate((bars[1:] if len(bars) >= count else bars, forming.astype(bars.dtype)))
+        
+        return {
+            'symbol': symbol,
+            'type': entry['type'],
+            'open_price': entry['open_price'],
+            'levels': list(entry['levels']),
+            'bars': bars
+        }
+    
+    def get_performance_report(self):
+        """Refresh the deal cache incrementally and compute performance statistics"""
+        cache = self.get_history_cache()
+        if cache is None:
+            return None
+        
+        if cache.refresh() is None and self.gui:
+            self.gui.log_message("Deal history refresh failed, report uses cached deals", is_error=True)
+        
+        return compute_performance(cache.load_deals())
     
     def run(self):
         """Start the application with GUI"""
+        if self.config["gui_process"]:
+            self.run_with_gui_process()
+            return
+        
         print("Starting MT5 Order Tracker with GUI")
         
         # Create and run GUI
         self.gui = TrackerGUI(self)
+        self.scheduler.start()
         self.gui.run()
 
+    def run_with_gui_process(self):
+        """Run tracking here and the GUI in a child process that reads shared memory.
+        
+        The child only renders; Start and Stop come back as commands on a queue,
+        so a slow redraw never delays a poll and a slow MT5 call never freezes the window.
+        """
+        print("Starting MT5 Order Tracker with GUI process")
+        
+        context = multiprocessing.get_context('spawn')
+        commands = context.Queue()
+        events = context.Queue()
+        activity_log = ActivityLog(
+            capacity=self.config["log_capacity"],
+            path=self.config["log_file"],
+            max_bytes=self.config["log_max_bytes"],
+            backup_count=self.config["log_backup_count"]
+        )
+        shared_state = SharedStateWriter(self.config["gui_max_positions"])
+        self.subscribers.append(shared_state)
+        self.gui = GuiBridge(events, activity_log)
+        
+        gui_process = context.Process(
+            target=run_gui_process,
+            args=(shared_state.name, shared_state.capacity, shared_state.history, commands, events),
+            daemon=True
+        )
+        gui_process.start()
+        self.scheduler.start()
+        self.gui.update_status("Ready")
+        
+        try:
+            while gui_process.is_alive():
+                try:
+                    command = commands.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if command == 'start':
+                    self.start_tracking()
+                elif command == 'stop':
+                    self.stop_tracking()
+                elif command == 'quit':
+                    break
+        finally:
+            events.put(('quit',))
+            self.stop_tracking()
+            self.scheduler.stop()
+            self.charts.stop()
+            self.subscribers.remove(shared_state)
+            shared_state.close()
+            activity_log.close()
+
 class ConfigDialog(tk.Toplevel):
     def __init__(self, parent, tracker):
         super().__init__(parent)
@@ -383,7 +1462,7 @@ class ConfigDialog(tk.Toplevel):
         self.tracker = tracker
         
         self.title("Configuration")
-        self.geometry("500x400")
+        self.geometry("500x480")
         self.configure(bg="#2a2d2e")
         
         # Make dialog modal
@@ -429,6 +1508,16 @@ class ConfigDialog(tk.Toplevel):
         self.channel_var = tk.StringVar(value=self.tracker.config["channel_id"])
         ttk.Entry(discord_frame, textvariable=self.channel_var, width=40).grid(row=1, column=1, sticky="ew", pady=5)
         
+        # Webhook URL
+        ttk.Label(discord_frame, text="Webhook URL:").grid(row=2, column=0, sticky="w", pady=5)
+        self.webhook_var = tk.StringVar(value=self.tracker.config["webhook_url"])
+        ttk.Entry(discord_frame, textvariable=self.webhook_var, width=40).grid(row=2, column=1, sticky="ew", pady=5)
+        
+        # Delivery mode
+        self.use_webhook = tk.BooleanVar(value=self.tracker.config["delivery_mode"] == "webhook")
+        ttk.Checkbutton(discord_frame, text="Send alerts through the webhook (no bot login)",
+                        variable=self.use_webhook).grid(row=3, column=1, sticky="w", pady=5)
+        
         # MT5 section
         mt5_frame = ttk.LabelFrame(main_frame, text="MT5 Account Details", padding=10)
         mt5_frame.pack(fill="x", pady=(0, 10))
@@ -489,6 +1578,8 @@ class ConfigDialog(tk.Toplevel):
         # Update tracker config
         self.tracker.config["discord_token"] = self.token_var.get()
         self.tracker.config["channel_id"] = self.channel_var.get()
+        self.tracker.config["webhook_url"] = self.webhook_var.get()
+        self.tracker.config["delivery_mode"] = "webhook" if self.use_webhook.get() else "bot"
         self.tracker.config["mt5_account"] = self.account_var.get()
         self.tracker.config["mt5_password"] = self.password_var.get()
         self.tracker.config["mt5_server"] = self.server_var.get()
@@ -503,6 +1594,12 @@ class ConfigDialog(tk.Toplevel):
 class TrackerGUI:
     def __init__(self, tracker):
         self.tracker = tracker
+        self.activity_log = ActivityLog(
+            capacity=tracker.config["log_capacity"],
+            path=tracker.config["log_file"],
+            max_bytes=tracker.config["log_max_bytes"],
+            backup_count=tracker.config["log_backup_count"]
+        )
         
         # Create the main window
         self.root = tk.Tk()
@@ -524,7 +1621,13 @@ class TrackerGUI:
         self.setup_ui()
         
         # Start periodic updates
-        self.update_account_info()
+        self.update_live_profits()
+        self.update_latency_table()
+        self.update_exposure_table()
+        self.update_strategy_table()
+        self.update_correlation_table()
+        self.flush_log()
+        self.refresh_portfolio_chart()
         
     def setup_ui(self):
         """Set up the GUI components"""
@@ -625,13 +1728,29 @@ class TrackerGUI:
         positions_frame = ttk.Frame(self.notebook, padding=10)
         self.notebook.add(positions_frame, text="Open Positions")
         
-        # Create positions table
-        columns = ('Ticket', 'Symbol', 'Type', 'Volume', 'Open Price', 'Current Price', 'SL', 'TP', 'Profit', 'Swap', 'Time')
+        # Filter by symbol prefix or magic number
+        filter_frame = ttk.Frame(positions_frame)
+        filter_frame.pack(side="top", fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter (symbol or magic):").pack(side="left")
+        self.position_filter_var = tk.StringVar()
+        self.position_filter_var.trace_add("write", lambda *args: self.update_positions_table())
+        ttk.Entry(filter_frame, textvariable=self.position_filter_var, width=20).pack(side="left", padx=5)
+        self.positions_count_label = ttk.Label(filter_frame, text="")
+        self.positions_count_label.pack(side="right")
+        
+        # Create positions table; clicking a heading sorts by that column
+        self.position_columns = {
+            'Ticket': 'ticket', 'Symbol': 'symbol', 'Type': 'type', 'Volume': 'volume',
+            'Open Price': 'price_open', 'Current Price': 'price_current', 'SL': 'sl', 'TP': 'tp',
+            'Profit': 'profit', 'Swap': 'swap', 'Magic': 'magic', 'Time': 'time'
+        }
+        columns = tuple(self.position_columns)
         self.positions_table = ttk.Treeview(positions_frame, columns=columns, show='headings')
+        self.position_sort = ('Time', False)
         
         # Configure columns
         for col in columns:
-            self.positions_table.heading(col, text=col)
+            self.positions_table.heading(col, text=col, command=lambda col=col: self.sort_positions(col))
             width = 80 if col not in ('Time', 'Symbol') else 120
             self.positions_table.column(col, width=width, anchor='center')
         
@@ -652,6 +1771,32 @@ class TrackerGUI:
         charts_frame = ttk.Frame(self.notebook, padding=10)
         self.notebook.add(charts_frame, text="Profit Charts")
         
+        # Chart view selector
+        view_frame = ttk.Frame(charts_frame)
+        view_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(view_frame, text="View:").pack(side="left")
+        self.chart_views = {
+            "Selected Position": None,
+            "Portfolio Total": 'total',
+            "Portfolio by Symbol": 'symbol',
+            "Portfolio by Magic": 'magic'
+        }
+        self.chart_view_var = tk.StringVar(value="Selected Position")
+        chart_view_box = ttk.Combobox(view_frame, textvariable=self.chart_view_var,
+                                      values=list(self.chart_views), state="readonly", width=22)
+        chart_view_box.pack(side="left", padx=5)
+        chart_view_box.bind("<<ComboboxSelected>>", lambda event: self.on_chart_view_change())
+        self.selected_position = None
+        self.curves = {}  # ticket -> (times, profits) rebuilt from ticks
+        
+        # Load any position by ticket, including closed ones
+        ttk.Label(view_frame, text="Ticket:").pack(side="left", padx=(15, 0))
+        self.ticket_var = tk.StringVar()
+        ticket_entry = ttk.Entry(view_frame, textvariable=self.ticket_var, width=14)
+        ticket_entry.pack(side="left", padx=5)
+        ticket_entry.bind("<Return>", lambda event: self.show_ticket_chart())
+        ttk.Button(view_frame, text="Load", command=self.show_ticket_chart).pack(side="left")
+        
         # Create a matplotlib figure
         plt.style.use('dark_background')
         self.figure = Figure(figsize=(8, 4), dpi=100, facecolor='#2a2d2e')
@@ -668,13 +1813,147 @@ class TrackerGUI:
                       fontsize=12, color='white')
         self.canvas.draw()
         
+        # Price chart tab: candles of the selected position's symbol with its levels
+        price_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(price_frame, text="Price Chart")
+        
+        price_controls = ttk.Frame(price_frame)
+        price_controls.pack(fill="x", pady=(0, 5))
+        ttk.Label(price_controls, text="Timeframe:").pack(side="left")
+        self.price_timeframe_var = tk.StringVar(value=self.tracker.config["price_chart_timeframe"])
+        timeframe_box = ttk.Combobox(price_controls, textvariable=self.price_timeframe_var,
+                                     values=list(TIMEFRAME_SECONDS), state="readonly", width=6)
+        timeframe_box.pack(side="left", padx=5)
+        timeframe_box.bind("<<ComboboxSelected>>", lambda event: self.refresh_price_chart())
+        ttk.Button(price_controls, text="Refresh", command=self.refresh_price_chart).pack(side="left")
+        self.price_label = ttk.Label(price_controls, text="Select a position to view its price chart")
+        self.price_label.pack(side="left", padx=15)
+        
+        self.price_figure = Figure(figsize=(8, 4), dpi=100, facecolor='#2a2d2e')
+        self.price_plot = self.price_figure.add_subplot(111)
+        self.price_plot.set_facecolor('#2a2d2e')
+        self.price_canvas = FigureCanvasTkAgg(self.price_figure, price_frame)
+        self.price_canvas.get_tk_widget().pack(fill="both", expand=True)
+        
         # Log tab
         log_frame = ttk.Frame(self.notebook, padding=10)
         self.notebook.add(log_frame, text="Activity Log")
         
+        # Log filter box
+        filter_frame = ttk.Frame(log_frame)
+        filter_frame.pack(fill="x", pady=(0, 5))
+        ttk.Label(filter_frame, text="Filter:").pack(side="left")
+        self.log_filter_var = tk.StringVar()
+        self.log_filter_var.trace_add("write", lambda *args: self.apply_log_filter())
+        ttk.Entry(filter_frame, textvariable=self.log_filter_var, width=40).pack(side="left", padx=5)
+        
         # Create log text widget
         self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, bg="#2a2d2e", fg="white", font=("Consolas", 10))
+        self.log_entry_lines = deque()  # Widget lines taken by each shown entry, oldest first
         self.log_text.pack(fill="both", expand=True)
+        self.log_text.tag_config("timestamp", foreground="#6c757d")
+        self.log_text.tag_config("message", foreground="#f8f9fa")
+        self.log_text.tag_config("error", foreground="#ff6b6b")
+        self.log_text.config(state=tk.DISABLED)
+        
+        # Performance tab
+        performance_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(performance_frame, text="Performance")
+        
+        performance_header = ttk.Frame(performance_frame)
+        performance_header.pack(fill="x", pady=(0, 10))
+        
+        self.performance_button = tk.Button(
+            performance_header, 
+            text="🔄 Refresh Report", 
+            command=self.refresh_performance_report,
+            bg="#3a7ebf",  # Blue
+            fg="white",
+            relief="flat",
+            padx=10,
+            pady=5
+        )
+        self.performance_button.pack(side="left")
+        
+        self.performance_label = ttk.Label(performance_header, text="No report yet", font=("Arial", 10))
+        self.performance_label.pack(side="left", padx=10)
+        
+        # Per-symbol and per-hour breakdown tables
+        breakdown_columns = ('Key', 'Trades', 'Win Rate', 'Net Profit', 'Profit Factor', 'Expectancy', 'Avg Hold (min)')
+        self.performance_tables = {}
+        for name, title in (('by_symbol', 'By Symbol'), ('by_hour', 'By Close Hour')):
+            table_frame = ttk.LabelFrame(performance_frame, text=title, padding=5)
+            table_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
+            
+            table = ttk.Treeview(table_frame, columns=breakdown_columns, show='headings')
+            for col in breakdown_columns:
+                table.heading(col, text=col)
+                table.column(col, width=80, anchor='center')
+            
+            scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+            scrollbar.pack(side="right", fill="y")
+            table.configure(yscrollcommand=scrollbar.set)
+            table.pack(side="left", fill="both", expand=True)
+            self.performance_tables[name] = table
+        
+        # Latency tab
+        latency_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(latency_frame, text="Alert Latency")
+        
+        self.latency_label = ttk.Label(latency_frame, text="No alerts delivered yet", font=("Arial", 10))
+        self.latency_label.pack(anchor="w", pady=(0, 10))
+        
+        latency_columns = ('Event Type', 'Stage', 'Count', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Max (ms)')
+        self.latency_table = ttk.Treeview(latency_frame, columns=latency_columns, show='headings')
+        for col in latency_columns:
+            self.latency_table.heading(col, text=col)
+            self.latency_table.column(col, width=100, anchor='center')
+        self.latency_table.pack(fill="both", expand=True)
+        
+        ttk.Label(latency_frame, text="Scheduled Jobs", font=("Arial", 10)).pack(anchor="w", pady=(10, 5))
+        job_columns = ('Job', 'Schedule', 'Runs', 'Failures', 'Missed', 'Overlapped', 'Avg (ms)', 'Max (ms)', 'Next Run')
+        self.jobs_table = ttk.Treeview(latency_frame, columns=job_columns, show='headings', height=7)
+        for col in job_columns:
+            self.jobs_table.heading(col, text=col)
+            self.jobs_table.column(col, width=90, anchor='center')
+        self.jobs_table.pack(fill="x")
+        
+        # Exposure tab
+        exposure_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(exposure_frame, text="Exposure")
+        
+        self.exposure_label = ttk.Label(exposure_frame, text="No open positions", font=("Arial", 10))
+        self.exposure_label.pack(anchor="w", pady=(0, 10))
+        
+        exposure_columns = ('Currency / Asset', 'Kind', 'Direction', 'Net Amount', 'Account Value')
+        self.exposure_table = ttk.Treeview(exposure_frame, columns=exposure_columns, show='headings')
+        for col in exposure_columns:
+            self.exposure_table.heading(col, text=col)
+            self.exposure_table.column(col, width=120, anchor='center')
+        self.exposure_table.pack(fill="both", expand=True)
+        
+        # Strategies tab
+        strategy_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(strategy_frame, text="Strategies")
+        
+        strategy_columns = ('Strategy', 'Magic', 'Open', 'Net Lots', 'Gross Lots', 'Floating P/L',
+                            'Realized Today', 'Closed Today', 'Drawdown', 'Max Drawdown')
+        self.strategy_table = ttk.Treeview(strategy_frame, columns=strategy_columns, show='headings')
+        for col in strategy_columns:
+            self.strategy_table.heading(col, text=col)
+            self.strategy_table.column(col, width=150 if col == 'Strategy' else 95, anchor='center')
+        self.strategy_table.pack(fill="both", expand=True)
+        
+        # Correlation tab; matrix columns follow the symbols held
+        correlation_frame = ttk.Frame(self.notebook, padding=10)
+        self.notebook.add(correlation_frame, text="Correlation")
+        
+        self.correlation_label = ttk.Label(correlation_frame, text="Needs positions in two or more symbols",
+                                           font=("Arial", 10))
+        self.correlation_label.pack(anchor="w", pady=(0, 10))
+        self.correlation_table = ttk.Treeview(correlation_frame, show='headings')
+        self.correlation_table.pack(fill="both", expand=True)
+        self.correlation_symbols = None
         
     def open_config_dialog(self):
         """Open configuration dialog"""
@@ -694,29 +1973,65 @@ class TrackerGUI:
             self.stop_button.config(state=tk.DISABLED)
         
     def log_message(self, message, is_error=False):
-        """Add message to log"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        """Add message to log; the widget picks it up on the next flush"""
+        self.activity_log.add(message, is_error)
+    
+    def _render_log_entries(self, entries):
+        """Append log entries to the widget in a single insert"""
+        chunks = []
+        for timestamp, message, is_error in entries:
+            if is_error:
+                chunks += [f"{timestamp} ERROR: ", "timestamp", f"{message}\n", "error"]
+            else:
+                chunks += [f"{timestamp}: ", "timestamp", f"{message}\n", "message"]
+            self.log_entry_lines.append(message.count("\n") + 1)
+        if chunks:
+            self.log_text.insert(tk.END, *chunks)
+    
+    def flush_log(self):
+        """Write pending log entries to the widget in one batch and trim old lines"""
+        entries = self.activity_log.take_pending()
         
-        self.log_text.config(state=tk.NORMAL)
+        search = self.log_filter_var.get().lower()
+        if search:
+            entries = [entry for entry in entries if search in entry[1].lower()]
         
-        if is_error:
-            self.log_text.insert(tk.END, f"{timestamp} ERROR: ", "timestamp")
-            self.log_text.insert(tk.END, f"{message}\n", "error")
-            self.log_text.tag_config("error", foreground="#ff6b6b")
-        else:
-            self.log_text.insert(tk.END, f"{timestamp}: ", "timestamp")
-            self.log_text.insert(tk.END, f"{message}\n", "message")
-        
-        self.log_text.tag_config("timestamp", foreground="#6c757d")
-        self.log_text.tag_config("message", foreground="#f8f9fa")
+        if entries:
+            # Only follow new lines if the user has not scrolled up
+            at_bottom = self.log_text.yview()[1] >= 0.999
+            
+            self.log_text.config(state=tk.NORMAL)
+            self._render_log_entries(entries)
+            
+            # Trim whole entries, so a multi-line message is never cut in half
+            lines = 0
+            while len(self.log_entry_lines) > self.tracker.config["log_capacity"]:
+                lines += self.log_entry_lines.popleft()
+            if lines:
+                self.log_text.delete("1.0", f"{lines + 1}.0")
+            self.log_text.config(state=tk.DISABLED)
+            
+            if at_bottom:
+                self.log_text.see(tk.END)
         
-        self.log_text.see(tk.END)
+        # Schedule next flush (about once per frame)
+        self.root.after(50, self.flush_log)
+    
+    def apply_log_filter(self):
+        """Redraw the log from the in-memory ring using the filter text"""
+        self.log_text.config(state=tk.NORMAL)
+        self.log_text.delete("1.0", tk.END)
+        self.log_entry_lines.clear()
+        self._render_log_entries(self.activity_log.search(self.log_filter_var.get()))
         self.log_text.config(state=tk.DISABLED)
+        self.log_text.see(tk.END)
         
-    def update_account_info(self):
+    def post_account_info(self, account_info):
+        """Show account values fetched on another thread"""
+        self.root.after(0, lambda: self.show_account_info(account_info))
+    
+    def show_account_info(self, account_info):
         """Update account information display"""
-        account_info = self.tracker.get_account_info()
-        
         if account_info:
             for field, (label, prefix) in self.account_labels.items():
                 value = account_info.get(field, 0)
@@ -738,42 +2053,251 @@ class TrackerGUI:
                 
                 label.config(text=formatted_value)
         
+    def update_live_profits(self):
+        """Refresh the profit column from tick-based P&L between polls"""
+        for position_id, profit in self.tracker.live_profits.items():
+            item = str(position_id)
+            if self.positions_table.exists(item):
+                tag = "profit" if profit > 0 else "loss" if profit < 0 else ""
+                self.positions_table.set(item, 'Profit', f"{profit:.2f}")
+                self.positions_table.item(item, tags=(tag,))
+        
         # Schedule next update
-        self.root.after(5000, self.update_account_info)
+        self.root.after(500, self.update_live_profits)
+        
+    def update_latency_table(self):
+        """Refresh alert latency percentiles"""
+        rows, failures = self.tracker.latency.report()
+        
+        if rows:
+            self.latency_table.delete(*self.latency_table.get_children())
+            for row in rows:
+                self.latency_table.insert('', tk.END, values=(
+                    row['event_type'],
+                    row['stage'],
+                    row['count'],
+                    f"{row['p50']:.0f}",
+                    f"{row['p95']:.0f}",
+                    f"{row['p99']:.0f}",
+                    f"{row['max']:.0f}"
+                ))
+            
+            slo = f"SLO: {self.tracker.latency.slo_ms} ms | " if self.tracker.latency.slo_ms else ""
+            self.latency_label.config(
+                text=f"{slo}Failed sends: {sum(failures.values())} | "
+                     f"Server time offset: {self.tracker.latency.server_offset / 3600:+.1f} h"
+            )
         
-    def update_positions_table(self):
-        """Update positions table with current data"""
-        # Clear existing items
-        for item in self.positions_table.get_children():
-            self.positions_table.delete(item)
-        
-        # Get positions data
-        positions_df = self.tracker.get_positions_data()
-        
-        if not positions_df.empty:
-            # Configure tags for coloring - using valid hex colors with alpha
-            self.positions_table.tag_configure("profit", background="#28a745")  # Solid green
-            self.positions_table.tag_configure("loss", background="#dc3545")    # Solid red
+        self.jobs_table.delete(*self.jobs_table.get_children())
+        for job in self.tracker.scheduler.report():
+            self.jobs_table.insert('', tk.END, values=(
+                job['job'],
+                job['schedule'],
+                job['runs'],
+                job['failures'],
+                job['missed'],
+                job['overlapped'],
+                f"{job['avg_ms']:.1f}" if job['avg_ms'] is not None else "-",
+                f"{job['max_ms']:.1f}",
+                datetime.fromtimestamp(job['next_run']).strftime("%H:%M:%S") if job['next_run'] else "-"
+            ))
+        
+        # Schedule next update
+        self.root.after(5000, self.update_latency_table)
+        
+    def update_exposure_table(self):
+        """Refresh net exposure per currency and asset"""
+        rows, currency = self.tracker.exposure.report()
+        
+        self.exposure_table.delete(*self.exposure_table.get_children())
+        self.exposure_table.tag_configure("long", foreground="#28a745")
+        self.exposure_table.tag_configure("short", foreground="#dc3545")
+        gross = 0.0
+        for row in rows:
+            if row['value'] is not None:
+                gross += abs(row['value'])
+            self.exposure_table.insert('', tk.END, values=(
+                row['name'],
+                "Asset" if row['asset'] else "Currency",
+                "Long" if row['amount'] > 0 else "Short",
+                f"{row['amount']:,.2f}",
+                f"{row['value']:,.2f}" if row['value'] is not None else "n/a"
+            ), tags=("long" if row['amount'] > 0 else "short",))
+        
+        if currency:
+            self.exposure_label.config(text=f"Account currency: {currency} | Gross exposure: {gross:,.2f} {currency}")
+        
+        # Schedule next update
+        self.root.after(5000, self.update_exposure_table)
+    
+    def update_strategy_table(self):
+        """Refresh per-strategy aggregates"""
+        self.strategy_table.delete(*self.strategy_table.get_children())
+        self.strategy_table.tag_configure("profit", foreground="#28a745")
+        self.strategy_table.tag_configure("loss", foreground="#dc3545")
+        for row in self.tracker.strategy_stats.report():
+            total = row['floating'] + row['realized_today']
+            self.strategy_table.insert('', tk.END, values=(
+                row['name'],
+                row['magic'],
+                row['open'],
+                f"{row['net_lots']:+.2f}",
+                f"{row['gross_lots']:.2f}",
+                f"{row['floating']:+.2f}",
+                f"{row['realized_today']:+.2f}",
+                row['closed_today'],
+                f"{row['drawdown']:.2f}",
+                f"{row['max_drawdown']:.2f}"
+            ), tags=("profit" if total > 0 else "loss" if total < 0 else "",))
+        
+        # Schedule next update
+        self.root.after(5000, self.update_strategy_table)
+    
+    def update_correlation_table(self):
+        """Show the latest correlation matrix and concentration score"""
+        result = self.tracker.correlation.report() if self.tracker.correlation else None
+        
+        if result is not None and result['matrix'] is not None:
+            symbols = result['symbols']
+            if symbols != self.correlation_symbols:
+                columns = ('Symbol',) + symbols
+                self.correlation_table.configure(columns=columns)
+                for col in columns:
+                    self.correlation_table.heading(col, text=col)
+                    self.correlation_table.column(col, width=90, anchor='center')
+                self.correlation_symbols = symbols
             
-            for _, row in positions_df.iterrows():
-                # Format values
-                values = (
-                    row['ticket'],
-                    row['symbol'],
-                    row['type'],
-                    row['volume'],
-                    f"{row['open_price']:.5f}",
-                    f"{row['current_price']:.5f}",
-                    f"{row['sl']:.5f}" if row['sl'] > 0 else "None",
-                    f"{row['tp']:.5f}" if row['tp'] > 0 else "None",
-                    f"{row['profit']:.2f}",
-                    f"{row['swap']:.2f}",
-                    row['time'].strftime("%Y-%m-%d %H:%M:%S")
-                )
-                
-                # Add row with tag for coloring
-                tag = "profit" if row['profit'] > 0 else "loss" if row['profit'] < 0 else ""
-                self.positions_table.insert('', tk.END, values=values, tags=(tag,))
+            self.correlation_table.delete(*self.correlation_table.get_children())
+            for symbol, row in zip(symbols, result['matrix']):
+                self.correlation_table.insert('', tk.END, values=(symbol,) + tuple(f"{value:+.2f}" for value in row))
+            
+            concentration = f"{result['concentration']:.2f}" if result['concentration'] is not None else "n/a"
+            effective_bets = f"{result['effective_bets']:.1f}" if result['effective_bets'] is not None else "n/a"
+            self.correlation_label.config(text=(
+                f"Concentration: {concentration} | Effective bets: {effective_bets} | "
+                f"{result['bars']} {self.tracker.correlation.timeframe} returns | "
+                f"Updated {datetime.fromtimestamp(result['updated']).strftime('%H:%M:%S')}"
+            ))
+        elif self.correlation_symbols is not None:
+            self.correlation_table.delete(*self.correlation_table.get_children())
+            self.correlation_label.config(text="Needs positions in two or more symbols")
+            self.correlation_symbols = None
+        
+        # Schedule next update
+        self.root.after(5000, self.update_correlation_table)
+    
+    def position_filter(self):
+        """Turn the filter box into a positions store where clause"""
+        text = self.position_filter_var.get().strip().upper()
+        if not text:
+            return None
+        if text.isdigit():
+            return {'magic': int(text)}
+        symbols = [symbol for symbol in self.tracker.position_store.values('symbol') if symbol.upper().startswith(text)]
+        return {'symbol': symbols}
+    
+    def sort_positions(self, column):
+        """Sort the positions table by a heading; clicking it again reverses the order"""
+        current, descending = self.position_sort
+        self.position_sort = (column, not descending if column == current else False)
+        for col in self.position_columns:
+            arrow = (" ▼" if self.position_sort[1] else " ▲") if col == column else ""
+            self.positions_table.heading(col, text=col + arrow)
+        self.update_positions_table()
+    
+    def update_positions_table(self):
+        """Show the positions store in the current sort order and filter"""
+        column, descending = self.position_sort
+        rows = self.tracker.get_positions_data(self.position_filter(), self.position_columns[column], descending)
+        
+        # Configure tags for coloring - using valid hex colors with alpha
+        self.positions_table.tag_configure("profit", background="#28a745")  # Solid green
+        self.positions_table.tag_configure("loss", background="#dc3545")    # Solid red
+        
+        # Update rows in place rather than rebuilding the whole table
+        order = [str(row['ticket']) for row in rows]
+        shown = set(order)
+        stale = [item for item in self.positions_table.get_children() if item not in shown]
+        if stale:
+            self.positions_table.delete(*stale)
+        
+        for row in rows:
+            item = str(row['ticket'])
+            profit = self.tracker.live_profits.get(row['ticket'], row['profit'])
+            values = (
+                row['ticket'],
+                row['symbol'],
+                row['type'],
+                row['volume'],
+                f"{row['price_open']:.5f}",
+                f"{row['price_current']:.5f}",
+                f"{row['sl']:.5f}" if row['sl'] > 0 else "None",
+                f"{row['tp']:.5f}" if row['tp'] > 0 else "None",
+                f"{profit:.2f}",
+                f"{row['swap']:.2f}",
+                row['magic'],
+                datetime.fromtimestamp(row['time']).strftime("%Y-%m-%d %H:%M:%S")
+            )
+            tag = "profit" if profit > 0 else "loss" if profit < 0 else ""
+            if self.positions_table.exists(item):
+                self.positions_table.item(item, values=values, tags=(tag,))
+            else:
+                self.positions_table.insert('', tk.END, iid=item, values=values, tags=(tag,))
+        
+        if list(self.positions_table.get_children()) != order:
+            for index, item in enumerate(order):
+                self.positions_table.move(item, '', index)
+        
+        total = len(self.tracker.position_store)
+        self.positions_count_label.config(
+            text=f"{len(rows)} of {total} positions" if len(rows) != total else f"{total} positions"
+        )
+    
+    def refresh_performance_report(self):
+        """Build the performance report in the background"""
+        self.performance_button.config(state=tk.DISABLED)
+        self.performance_label.config(text="Refreshing deal history...")
+        
+        def worker():
+            try:
+                report = self.tracker.get_performance_report()
+            except Exception as e:
+                print(f"Error building performance report: {e}")
+                report = None
+            self.root.after(0, lambda: self.show_performance_report(report))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def show_performance_report(self, report):
+        """Display a performance report"""
+        self.performance_button.config(state=tk.NORMAL)
+        
+        if report is None:
+            self.performance_label.config(text="Report unavailable - not connected to MT5")
+            return
+        
+        overall = report['overall']
+        self.performance_label.config(text=(
+            f"Trades: {int(overall['trades'])} | "
+            f"Win Rate: {overall['win_rate']:.1f}% | "
+            f"Net: ${overall['net_profit']:.2f} | "
+            f"Profit Factor: {overall['profit_factor']:.2f} | "
+            f"Expectancy: ${overall['expectancy']:.2f} | "
+            f"Avg Hold: {overall['avg_hold_minutes']:.1f} min"
+        ))
+        
+        for name, table in self.performance_tables.items():
+            table.delete(*table.get_children())
+            for key, row in report[name].iterrows():
+                table.insert('', tk.END, values=(
+                    key,
+                    int(row['trades']),
+                    f"{row['win_rate']:.1f}%",
+                    f"{row['net_profit']:.2f}",
+                    f"{row['profit_factor']:.2f}",
+                    f"{row['expectancy']:.2f}",
+                    f"{row['avg_hold_minutes']:.1f}"
+                ))
     
     def on_position_select(self, event):
         """Handle position selection in the table"""
@@ -781,53 +2305,249 @@ class TrackerGUI:
         if selected_items:
             item = selected_items[0]
             ticket = self.positions_table.item(item, 'values')[0]
-            self.update_profit_chart(int(ticket))
+            self.select_chart_position(int(ticket))
             
             # Switch to charts tab
             self.notebook.select(1)  # Select charts tab
     
+    def show_ticket_chart(self):
+        """Chart the position whose ticket was typed in"""
+        try:
+            ticket = int(self.ticket_var.get().strip())
+        except ValueError:
+            self.log_message(f"Invalid ticket: {self.ticket_var.get()}", is_error=True)
+            return
+        self.select_chart_position(ticket)
+    
+    def select_chart_position(self, ticket):
+        """Show a position's chart and rebuild its curve from ticks in the background"""
+        self.selected_position = ticket
+        self.chart_view_var.set("Selected Position")
+        self.update_profit_chart(ticket)
+        self.refresh_price_chart()
+        
+        def worker():
+            try:
+                curve = self.tracker.get_trade_curve(ticket)
+            except Exception as e:
+                print(f"Error rebuilding trade curve: {e}")
+                curve = None
+            self.root.after(0, lambda: self.show_trade_curve(ticket, curve))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def show_trade_curve(self, ticket, curve):
+        """Draw a rebuilt curve if its position is still the one shown"""
+        if curve is None or not len(curve[0]):
+            if ticket not in self.tracker.history:
+                self.log_message(f"No tick history available for position {ticket}", is_error=True)
+            return
+        self.curves[ticket] = curve
+        self.update_profit_chart(ticket)
+    
+    def refresh_price_chart(self):
+        """Load bars for the selected position in the background, then draw them"""
+        ticket = self.selected_position
+        if ticket is None:
+            return
+        timeframe = self.price_timeframe_var.get()
+        
+        def worker():
+            try:
+                chart = self.tracker.get_price_chart(ticket, timeframe, self.tracker.config["price_chart_bars"])
+            except Exception as e:
+                print(f"Error loading price bars: {e}")
+                chart = None
+            self.root.after(0, lambda: self.draw_price_chart(ticket, timeframe, chart))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def draw_price_chart(self, ticket, timeframe, chart):
+        """Draw candles with entry, SL and TP, stepping at each modification"""
+        if ticket != self.selected_position:
+            return
+        if chart is None:
+            self.price_label.config(text=f"No price data for position {ticket}")
+            return
+        
+        bars = chart['bars']
+        times = bars['time']
+        x = np.arange(len(bars))
+        plot = self.price_plot
+        plot.clear()
+        plot.set_facecolor('#2a2d2e')
+        
+        # Candles on a bar index axis, so weekends and sessions leave no gaps
+        rising = bars['close'] >= bars['open']
+        colors = np.where(rising, '#28a745', '#dc3545')
+        plot.vlines(x, bars['low'], bars['high'], colors=colors, linewidth=0.8)
+        bodies = np.abs(bars['close'] - bars['open'])
+        minimum = (bars['high'].max() - bars['low'].min()) * 0.001
+        plot.bar(x, np.maximum(bodies, minimum), bottom=np.minimum(bars['open'], bars['close']),
+                 color=colors, width=0.6)
+        
+        def bar_index(server_time):
+            return int(np.clip(np.searchsorted(times, server_time, side='right') - 1, 0, len(times) - 1))
+        
+        levels = chart['levels']
+        opened_in_view = levels[0][0] >= times[0]
+        plot.axhline(chart['open_price'], color='#3a7ebf', linewidth=1, linestyle='--', label="Entry")
+        if opened_in_view:
+            # An entry before the first bar would be pinned to the wrong bar, so it gets no marker
+            plot.scatter([bar_index(levels[0][0])], [chart['open_price']], color='#3a7ebf', zorder=5,
+                         marker='^' if chart['type'] == 'Buy' else 'v', s=60)
+        
+        # SL and TP as steps from each modification to the latest bar; 0 means none set.
+        # Levels set before the window start at its edge with the one in force there
+        first = max(0, int(np.searchsorted([level[0] for level in levels], times[0], side='right')) - 1)
+        shown = levels[first:]
+        steps = [bar_index(level[0]) for level in shown] + [len(x) - 1]
+        for column, name, color in ((1, "SL", '#dc3545'), (2, "TP", '#28a745')):
+            values = [level[column] or np.nan for level in shown]
+            plot.step(steps, values + values[-1:], where='post', color=color, linewidth=1.2, label=name)
+            if len(shown) > 1:
+                plot.scatter(steps[1:-1], values[1:], color=color, marker='o', s=20, zorder=5)
+        
+        labels = [datetime.fromtimestamp(int(t), timezone.utc).strftime('%m-%d %H:%M') for t in times]
+        plot.xaxis.set_major_formatter(FuncFormatter(
+            lambda value, position: labels[int(value)] if 0 <= int(value) < len(labels) else ""
+        ))
+        plot.set_xlim(-1, len(x))
+        plot.set_title(f"{chart['symbol']} {timeframe} - position {ticket}", color='white')
+        plot.set_xlabel("Server time", color='white')
+        plot.tick_params(colors='white')
+        plot.legend(loc='upper left', fontsize=8)
+        self.price_figure.autofmt_xdate()
+        self.price_canvas.draw_idle()
+        
+        sl, tp = levels[-1][1], levels[-1][2]
+        self.price_label.config(text=(
+            f"Entry {chart['open_price']} | SL {sl or 'none'} | TP {tp or 'none'} | "
+            f"{len(levels) - 1} modifications"
+            + ("" if opened_in_view else " | opened before the first bar")
+        ))
+    
+    def on_chart_view_change(self):
+        """Redraw the chart for the chosen view"""
+        if self.chart_views[self.chart_view_var.get()] is None:
+            if self.selected_position is not None:
+                self.update_profit_chart(self.selected_position)
+        else:
+            self.draw_portfolio_chart()
+    
     def update_profit_chart(self, position_id):
         """Update profit chart for selected position"""
-        if position_id in self.tracker.history:
-            position_data = self.tracker.history[position_id]
-            profit_history = position_data['profit_history']
-            
-            if len(profit_history) > 1:  # Need at least 2 points for a line
-                times, profits = zip(*profit_history)
-                
-                # Clear the plot
-                self.plot.clear()
-                
-                # Plot the data with color based on profit trend
-                if profits[-1] >= profits[0]:
-                    color = '#28a745'  # Green for profit
-                else:
-                    color = '#dc3545'  # Red for loss
-                
-                self.plot.plot(times, profits, marker='o', linestyle='-', color=color)
-                
-                # Add title and labels
-                self.plot.set_title(f"Profit History - {position_data['symbol']} (ID: {position_id})", color='white')
-                self.plot.set_xlabel("Time", color='white')
-                self.plot.set_ylabel("Profit", color='white')
-                
-                # Format x-axis to show time
-                self.figure.autofmt_xdate()
-                self.plot.xaxis.set_major_formatter(DateFormatter('%H:%M:%S'))
-                
-                # Refresh the canvas
-                self.canvas.draw()
-            else:
+        # Only the position being viewed needs redrawing
+        if position_id != self.selected_position or self.chart_views[self.chart_view_var.get()] is not None:
+            return
+        position_data = self.tracker.history.get(position_id)
+        profit_history = position_data['profit_history'] if position_data else []
+        curve = self.curves.get(position_id)
+        
+        if curve is None and len(profit_history) < 2:  # Need at least 2 points for a line
+            if position_data:
                 # Not enough data points
                 self.plot.clear()
                 self.plot.text(0.5, 0.5, 'Not enough data points yet', 
                               horizontalalignment='center', verticalalignment='center',
                               fontsize=12, color='white')
                 self.canvas.draw()
+            return
+        
+        # Clear the plot
+        self.plot.clear()
+        
+        if curve is not None:
+            # Tick curves are in trade server time; shift live samples to match
+            curve_times, curve_profits = curve
+            times = curve_times.astype('datetime64[ms]')
+            profits = list(curve_profits)
+            offset = self.tracker.latency.server_offset
+            samples = [
+                (datetime.fromtimestamp(t.timestamp() + offset, timezone.utc).replace(tzinfo=None), p)
+                for t, p in profit_history if t.timestamp() * 1000 + offset * 1000 > curve_times[-1]
+            ]
+        else:
+            times, profits = zip(*profit_history)
+            samples = []
+        
+        # Plot the data with color based on profit trend
+        last_profit = samples[-1][1] if samples else profits[-1]
+        if last_profit >= profits[0]:
+            color = '#28a745'  # Green for profit
+        else:
+            color = '#dc3545'  # Red for loss
+        
+        if curve is not None:
+            self.plot.plot(times, profits, linestyle='-', linewidth=1, color=color)
+            if samples:
+                sample_times, sample_profits = zip(*samples)
+                self.plot.plot(sample_times, sample_profits, marker='o', linestyle='-', color=color)
+        else:
+            self.plot.plot(times, profits, marker='o', linestyle='-', color=color)
+        
+        # Add title and labels
+        symbol = f"{position_data['symbol']} " if position_data else ""
+        self.plot.set_title(f"Profit History - {symbol}(ID: {position_id})", color='white')
+        self.plot.set_xlabel("Server Time" if curve is not None else "Time", color='white')
+        self.plot.set_ylabel("Profit", color='white')
+        
+        # Format x-axis to show time
+        self.figure.autofmt_xdate()
+        self.plot.xaxis.set_major_formatter(DateFormatter('%m-%d %H:%M' if curve is not None else '%H:%M:%S'))
+        
+        # Refresh the canvas
+        self.canvas.draw()
+    
+    def refresh_portfolio_chart(self):
+        """Redraw the portfolio chart periodically while it is shown"""
+        if self.chart_views[self.chart_view_var.get()] is not None:
+            self.draw_portfolio_chart()
+        
+        # Schedule next update
+        self.root.after(5000, self.refresh_portfolio_chart)
+    
+    def draw_portfolio_chart(self, max_lines=10):
+        """Plot portfolio P&L summed over all tracked positions"""
+        dimension = self.chart_views[self.chart_view_var.get()]
+        portfolio = self.tracker.portfolio
+        try:
+            portfolio.update(self.tracker.history)
+            times, series = portfolio.series(dimension, end_time=time.time())
+        except Exception as e:
+            print(f"Error aggregating portfolio: {e}")
+            return
+        
+        self.plot.clear()
+        if len(times) < 2 or not series:
+            self.plot.text(0.5, 0.5, 'Not enough data points yet', 
+                          horizontalalignment='center', verticalalignment='center',
+                          fontsize=12, color='white')
+            self.canvas.draw()
+            return
+        
+        # Keep the chart readable by showing the groups with the largest P&L
+        labels = sorted(series, key=lambda label: abs(series[label][-1]), reverse=True)[:max_lines]
+        dates = [datetime.fromtimestamp(t) for t in times]
+        for label in labels:
+            self.plot.plot(dates, series[label], linestyle='-', label=str(label))
+        
+        self.plot.set_title(f"Portfolio P&L - {self.chart_view_var.get()}", color='white')
+        self.plot.set_xlabel("Time", color='white')
+        self.plot.set_ylabel("Profit", color='white')
+        if dimension != 'total':
+            self.plot.legend(loc='upper left', fontsize=8)
+        
+        self.figure.autofmt_xdate()
+        self.plot.xaxis.set_major_formatter(DateFormatter('%m-%d %H:%M'))
+        self.canvas.draw()
     
     def on_close(self):
         """Handle window close event"""
         self.tracker.stop_tracking()
+        self.tracker.scheduler.stop()
+        self.tracker.charts.stop()
+        self.activity_log.close()
         self.root.destroy()
         
     def run(self):
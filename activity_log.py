@@ -0,0 +1,71 @@
+import logging
+import queue
+import threading
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+class ActivityLog:
+    """Bounded in-memory activity log with a rotating file sink.
+
+    Messages can be added from any thread. The newest entries stay in a
+    fixed-size ring for display and searching, while the full history is
+    written to rotating files by a background listener thread.
+    """
+
+    def __init__(self, capacity=5000, path=None, max_bytes=5000000, backup_count=5):
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=capacity)  # (timestamp, message, is_error)
+        self.pending = deque(maxlen=capacity)  # Entries not yet shown in the widget
+        self.listener = None
+        self.logger = None
+
+        if path:
+            try:
+                file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+                file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+                log_queue = queue.SimpleQueue()
+                self.listener = QueueListener(log_queue, file_handler)
+                self.listener.start()
+
+                self.logger = logging.getLogger(f"mt5_tracker.activity.{id(self)}")
+                self.logger.setLevel(logging.INFO)
+                self.logger.propagate = False
+                self.logger.addHandler(QueueHandler(log_queue))
+            except Exception as e:
+                print(f"Error opening activity log file: {e}")
+
+    def add(self, message, is_error=False):
+        """Record a message; safe to call from any thread"""
+        entry = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), message, is_error)
+        with self.lock:
+            self.entries.append(entry)
+            self.pending.append(entry)
+
+        if self.logger:
+            self.logger.info(f"{entry[0]} {'ERROR' if is_error else 'INFO'}: {message}")
+        return entry
+
+    def take_pending(self):
+        """Return and clear the entries added since the last call"""
+        with self.lock:
+            entries = list(self.pending)
+            self.pending.clear()
+        return entries
+
+    def search(self, text):
+        """Return ring entries containing text, case-insensitively"""
+        text = text.lower()
+        with self.lock:
+            entries = list(self.entries)
+        if not text:
+            return entries
+        return [entry for entry in entries if text in entry[1].lower()]
+
+    def close(self):
+        """Flush and stop the file writer"""
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
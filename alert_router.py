@@ -0,0 +1,111 @@
+from itertools import product
+
+# Specific event types that should also match rules written for a broader one
+EVENT_PARENTS = {
+    'sl_hit': ('position_closed',),
+    'tp_hit': ('position_closed',),
+    'stop_out': ('position_closed',),
+}
+
+# Fields a rule can match on, in index key order
+MATCH_FIELDS = ('event', 'symbol', 'magic', 'account')
+
+
+def _as_list(value):
+    if value is None:
+        return [None]
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _normalize(field, value):
+    """Normalize a rule or event value so config strings and MT5 values compare equal"""
+    if value is None:
+        return None
+    if field in ('magic', 'account'):
+        return int(value)
+    return str(value)
+
+
+class AlertRouter:
+    """Routes alert events to Discord channels using an indexed rule table.
+
+    Rules come from the "routing_rules" config list. Each rule may match on
+    event, symbol, magic and account (a value or a list of values, omitted
+    means any) plus an optional min_profit/max_profit range, and either lists
+    target "channels" (the default channel if omitted) or sets "mute". All
+    matching rules apply: their channels are combined, and any matching mute
+    rule silences the event.
+    Events that match no rule go to the default channel.
+
+    Rules are compiled into a dict keyed on (event, symbol, magic, account)
+    with None as the wildcard, so routing an event probes a fixed number of
+    keys no matter how many rules exist.
+    """
+
+    def __init__(self, rules=None, default_channel=None):
+        self.index = {}
+        self.rule_count = 0
+        self.default_channel = None
+        self.compile(rules or [], default_channel)
+
+    def compile(self, rules, default_channel):
+        """Build the lookup index from rule definitions"""
+        index = {}
+        for order, rule in enumerate(rules):
+            entry = (
+                order,
+                rule.get('min_profit'),
+                rule.get('max_profit'),
+                bool(rule.get('mute', False)),
+                tuple(str(channel) for channel in _as_list(rule.get('channels')) if channel),
+            )
+            values = [
+                [_normalize(field, value) for value in _as_list(rule.get(field))]
+                for field in MATCH_FIELDS
+            ]
+            for key in product(*values):
+                index.setdefault(key, []).append(entry)
+
+        # Swap in the new table in one assignment so routing never sees a partial index
+        self.index = index
+        self.rule_count = len(rules)
+        self.default_channel = str(default_channel) if default_channel else None
+
+    def route(self, event, symbol=None, magic=None, account=None, profit=None):
+        """Return the list of channel IDs an event should be sent to"""
+        index = self.index
+        events = (event,) + EVENT_PARENTS.get(event, ()) + (None,)
+        candidates = (
+            events,
+            (_normalize('symbol', symbol), None) if symbol is not None else (None,),
+            (_normalize('magic', magic), None) if magic is not None else (None,),
+            (_normalize('account', account), None) if account is not None else (None,),
+        )
+
+        matched = []
+        for key in product(*candidates):
+            entries = index.get(key)
+            if entries:
+                matched.extend(entries)
+
+        channels = []
+        any_match = False
+        for order, min_profit, max_profit, mute, targets in sorted(matched):
+            if min_profit is not None and (profit is None or profit < min_profit):
+                continue
+            if max_profit is not None and (profit is None or profit > max_profit):
+                continue
+            if mute:
+                return []
+            any_match = True
+            if not targets and self.default_channel:
+                targets = (self.default_channel,)
+            for channel in targets:
+                if channel not in channels:
+                    channels.append(channel)
+
+        if not any_match and self.default_channel:
+            return [self.default_channel]
+        return channels
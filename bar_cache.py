@@ -0,0 +1,128 @@
+import MetaTrader5 as mt5
+import os
+import threading
+import time
+import numpy as np
+
+# Bar length per timeframe name, in seconds
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800,
+}
+
+
+class BarCache:
+    """Closed OHLC bars per symbol and timeframe in memory-mapped files.
+
+    Each series is one .npy file of max_bars rows, mapped rather than read,
+    so opening a chart or a correlation window only pages in the bars it
+    touches. Rows fill from the start; once full, the oldest bars are
+    shifted out, so files never grow past max_bars. The first request for
+    a symbol fetches max_bars closed bars; after that only bars closed
+    since the newest cached one are fetched, and MT5 is not asked at all
+    until the next bar can have closed (judged by the symbol's last tick
+    time, which is server time).
+    """
+
+    def __init__(self, cache_dir, max_bars=5000):
+        self.cache_dir = cache_dir
+        self.max_bars = max_bars
+        self.lock = threading.Lock()
+        self.series = {}  # (symbol, timeframe) -> [memmap, filled rows], or None if not cached
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, symbol, timeframe):
+        return os.path.join(self.cache_dir, f"{symbol}_{timeframe}.npy")
+
+    def _open(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        if key not in self.series:
+            path = self._path(symbol, timeframe)
+            entry = None
+            if os.path.exists(path):
+                try:
+                    bars = np.load(path, mmap_mode='r+')
+                    if len(bars) == self.max_bars:
+                        entry = [bars, int(np.count_nonzero(bars['time']))]
+                        os.utime(path)  # Keep files in use from being evicted
+                    else:
+                        # Written with another max_bars; refetch at the current size
+                        del bars
+                        os.remove(path)
+                except Exception as e:
+                    print(f"Error loading cached bars {path}: {e}")
+            self.series[key] = entry
+        return self.series[key]
+
+    def _create(self, symbol, timeframe, dtype):
+        path = self._path(symbol, timeframe)
+        bars = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(self.max_bars,))
+        entry = self.series[(symbol, timeframe)] = [bars, 0]
+        return entry
+
+    def update(self, symbol, timeframe):
+        """Fetch bars closed since the last update; returns True if any were added"""
+        seconds = TIMEFRAME_SECONDS[timeframe]
+        with self.lock:
+            entry = self._open(symbol, timeframe)
+
+            if entry and entry[1]:
+                bars, filled = entry
+                tick = mt5.symbol_info_tick(symbol)
+                server_now = tick.time if tick is not None else time.time()
+                last = int(bars['time'][filled - 1])
+                # The bar after the last cached one closes at last + 2 bar lengths
+                if server_now < last + 2 * seconds:
+                    return False
+                count = min(self.max_bars, (server_now - last) // seconds + 1)
+            else:
+                count = self.max_bars
+
+            # Position 0 is the bar still forming; start from the last closed one
+            fetched = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 1, int(count))
+            if fetched is None or not len(fetched):
+                return False
+
+            if entry is None:
+                entry = self._create(symbol, timeframe, fetched.dtype)
+            bars, filled = entry
+            if filled:
+                fetched = fetched[fetched['time'] > bars['time'][filled - 1]]
+                if not len(fetched):
+                    return False
+            fetched = fetched[-self.max_bars:]
+
+            overflow = filled + len(fetched) - self.max_bars
+            if overflow > 0:
+                # Shift the oldest bars out to make room
+                bars[:filled - overflow] = bars[overflow:filled]
+                filled -= overflow
+            bars[filled:filled + len(fetched)] = fetched.astype(bars.dtype)
+            entry[1] = filled + len(fetched)
+            bars.flush()
+            return True
+
+    def bars(self, symbol, timeframe, count=None):
+        """Return a copy of up to count of the newest cached bars (no MT5 call)"""
+        with self.lock:
+            entry = self._open(symbol, timeframe)
+            if not entry or not entry[1]:
+                return None
+            bars, filled = entry
+            start = 0 if count is None else max(0, filled - count)
+            return np.array(bars[start:filled])
+
+    def evict(self, max_age_days):
+        """Delete series not opened or extended for max_age_days"""
+        cutoff = time.time() - max_age_days * 86400
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if not name.endswith(".npy") or os.path.getmtime(path) >= cutoff:
+                    continue
+                symbol, _, timeframe = name[:-4].rpartition("_")
+                self.series.pop((symbol, timeframe), None)
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing cached bars {path}: {e}")
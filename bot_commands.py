@@ -0,0 +1,141 @@
+import threading
+from datetime import datetime
+
+# Alert events that realize profit
+CLOSE_EVENTS = ('position_closed', 'sl_hit', 'tp_hit', 'stop_out')
+
+# Discord rejects longer messages
+MAX_MESSAGE = 2000
+
+
+class CommandResponder:
+    """Answers bot commands from the latest published snapshot.
+
+    The responder subscribes to snapshot diffs, so replies never call into
+    MT5, and formatted replies are cached until the next snapshot
+    generation: any number of users asking between two polls costs one
+    formatting pass per command.
+    """
+
+    def __init__(self, exposure=None, store=None, strategies=None):
+        self.exposure = exposure
+        self.store = store
+        self.strategies = strategies
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.snapshot = None
+        self.cache = {}  # (command, argument) -> reply for the current generation
+        self.started = datetime.now()
+        self.realized = {}  # date -> (realized P&L, closed count) from close alerts
+
+    def publish(self, generation, snapshot, diff, events):
+        """Take a new snapshot; called by the tracker after every poll"""
+        with self.lock:
+            self.generation = generation
+            self.snapshot = snapshot
+            self.cache = {}
+            for event in events:
+                if event['type'] in CLOSE_EVENTS and isinstance(event['profit'], float):
+                    day = datetime.fromisoformat(event['time']).date()
+                    profit, count = self.realized.get(day, (0.0, 0))
+                    self.realized[day] = (profit + event['profit'], count + 1)
+
+    def reply(self, command, argument=None):
+        """Return the reply text for a command, formatting it once per generation"""
+        key = (command, argument)
+        with self.lock:
+            reply = self.cache.get(key)
+            if reply is None:
+                if self.snapshot is None:
+                    reply = "No data yet - tracking has not completed a poll."
+                else:
+                    reply = getattr(self, f"_format_{command}")(argument)
+                    if len(reply) > MAX_MESSAGE:
+                        reply = reply[:MAX_MESSAGE - 4] + "\n..."
+                self.cache[key] = reply
+            return reply
+
+    def _format_positions(self, argument):
+        where = {'symbol': argument} if argument else None
+        if self.store is not None:
+            positions = self.store.query(where, sort='time')
+        else:
+            positions = sorted(
+                (p for p in self.snapshot['positions'].values() if not argument or p['symbol'] == argument),
+                key=lambda p: p['time']
+            )
+        if not positions:
+            return f"📭 No open {argument} positions." if argument else "📭 No open positions."
+
+        title = f"{argument} Positions" if argument else "Open Positions"
+        lines = [f"📈 **{title} ({len(positions)})**"]
+        length = len(lines[0])
+        for shown, position in enumerate(positions):
+            line = (
+                f"`{position['ticket']}` {position['symbol']} {position['type']} {position['volume']} "
+                f"@ {position['price_open']} | P/L {position['profit']:+.2f}"
+            )
+            # Leave room for the trailer lines
+            length += len(line) + 1
+            if length > MAX_MESSAGE - 80:
+                lines.append(f"... and {len(positions) - shown} more")
+                break
+            lines.append(line)
+        lines.append(f"Floating P/L: {sum(position['profit'] for position in positions):+.2f}")
+        return "\n".join(lines)
+
+    def _format_pnl(self, argument):
+        floating = sum(position['profit'] + position['swap'] for position in self.snapshot['positions'].values())
+        today = datetime.now().date()
+
+        if argument == 'session':
+            realized = sum(profit for profit, _ in self.realized.values())
+            closed = sum(count for _, count in self.realized.values())
+            title = f"Since {self.started.strftime('%Y-%m-%d %H:%M')}"
+        else:
+            realized, closed = self.realized.get(today, (0.0, 0))
+            title = "Today"
+            if self.started.date() == today:
+                title += f" (tracked since {self.started.strftime('%H:%M')})"
+
+        return (
+            f"💰 **P/L - {title}**\n"
+            f"Realized: {realized:+.2f} ({closed} closed)\n"
+            f"Floating: {floating:+.2f}\n"
+            f"Total: {realized + floating:+.2f}"
+        )
+
+    def _format_exposure(self, argument):
+        if self.exposure is None:
+            return "Exposure is not available."
+        rows, currency = self.exposure.report()
+        if not rows:
+            return "📭 No open exposure."
+
+        lines = ["🌍 **Net Exposure**"]
+        for row in rows[:20]:
+            value = f" ({row['value']:+,.0f} {currency})" if row['value'] is not None else ""
+            lines.append(f"{row['name']}: {row['amount']:+,.2f}{value}")
+        return "\n".join(lines)
+
+    def _format_strategies(self, argument):
+        if self.strategies is None:
+            return "Strategy statistics are not available."
+        lines = self.strategies.summary_lines(limit=20)
+        if not lines:
+            return "📭 No strategy activity yet."
+        return "🧩 **Strategies**\n" + "\n".join(lines)
+
+    def _format_account(self, argument):
+        account = self.snapshot['account']
+        if not account:
+            return "Account information is not available."
+        return (
+            f"🏦 **Account {self.snapshot['account_login'] or ''}**\n"
+            f"Balance: ${account['balance']:.2f}\n"
+            f"Equity: ${account['equity']:.2f}\n"
+            f"Profit: ${account['profit']:.2f}\n"
+            f"Margin: ${account['margin']:.2f}\n"
+            f"Free Margin: ${account['margin_free']:.2f}\n"
+            f"Margin Level: {account['margin_level']:.2f}%"
+        )
@@ -0,0 +1,122 @@
+import asyncio
+import io
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+
+# Points sent to a worker per chart; longer series are thinned first
+MAX_POINTS = 1000
+
+
+def _new_figure(title):
+    # The object API draws with Agg directly, without pyplot or a GUI backend
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(6, 3), dpi=100, facecolor='#2a2d2e')
+    FigureCanvasAgg(figure)
+    plot = figure.add_subplot(111)
+    plot.set_facecolor('#2a2d2e')
+    plot.set_title(title, color='white')
+    plot.tick_params(colors='white', labelsize=8)
+    for spine in plot.spines.values():
+        spine.set_color('#6c757d')
+    return figure, plot
+
+
+def _to_png(figure, plot, time_format):
+    from matplotlib.dates import DateFormatter
+
+    plot.xaxis.set_major_formatter(DateFormatter(time_format))
+    figure.autofmt_xdate()
+    figure.tight_layout()
+    output = io.BytesIO()
+    figure.savefig(output, format='png', facecolor=figure.get_facecolor())
+    return output.getvalue()
+
+
+def render_line_chart(title, times, values, time_format='%H:%M'):
+    """Render a profit or equity line as PNG bytes; runs in a worker process"""
+    figure, plot = _new_figure(title)
+    dates = np.asarray(times, dtype='datetime64[s]')
+    color = '#28a745' if values[-1] >= values[0] else '#dc3545'
+    plot.plot(dates, values, color=color, linewidth=1.5)
+    plot.axhline(values[0], color='#6c757d', linewidth=0.8, linestyle='--')
+    return _to_png(figure, plot, time_format)
+
+
+def _warm_up():
+    import matplotlib.figure  # noqa: F401 - preload matplotlib in the worker
+
+
+def compact_series(samples, max_points=MAX_POINTS):
+    """Turn [(datetime, value), ...] into small float arrays for a worker"""
+    times = np.fromiter((sample[0].timestamp() for sample in samples), dtype=float, count=len(samples))
+    values = np.fromiter((sample[1] for sample in samples), dtype=float, count=len(samples))
+    if len(values) > max_points:
+        step = int(np.ceil(len(values) / max_points))
+        keep = np.unique(np.append(np.arange(0, len(values), step), len(values) - 1))
+        times, values = times[keep], values[keep]
+    # Naive local datetimes for the worker's datetime64 axis
+    offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return times + offset, values
+
+
+class ChartRenderer:
+    """Renders alert charts in a process pool and caches the PNGs.
+
+    Matplotlib runs in separate processes so neither the Tk thread nor the
+    poll loop is blocked by drawing; the pool is started once and kept
+    warm. Identical chart requests share one render.
+    """
+
+    def __init__(self, workers=1, cache_size=64):
+        self.workers = workers
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # key -> PNG bytes, or a future while rendering
+        self.pool = None
+
+    def start(self):
+        if self.pool is None:
+            # Spawn instead of fork: the parent runs Tk and several threads
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            for _ in range(self.workers):
+                self.pool.submit(_warm_up)
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    async def render(self, key, title, samples, time_format='%H:%M'):
+        """Return PNG bytes for a chart of [(datetime, value), ...], or None"""
+        cached = self.cache.get(key)
+        if isinstance(cached, bytes):
+            self.cache.move_to_end(key)
+            return cached
+        if cached is not None:
+            return await asyncio.shield(cached)
+
+        if len(samples) < 2:
+            return None
+        self.start()
+
+        times, values = compact_series(samples)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, render_line_chart, title, times, values, time_format)
+        self.cache[key] = future
+        try:
+            png = await asyncio.shield(future)
+        except Exception:
+            self.cache.pop(key, None)
+            raise
+
+        self.cache[key] = png
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return png
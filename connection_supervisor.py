@@ -0,0 +1,133 @@
+import MetaTrader5 as mt5
+import random
+import threading
+import time
+
+
+class ConnectionSupervisor:
+    """Keeps the MT5 connection and the poll loop alive.
+
+    MT5 calls return None when the terminal connection fails, which is
+    different from an empty order book or position list. The supervisor turns
+    a None into a disconnect, reconnects with exponential backoff on a
+    background thread and flags the tracker to resync quietly afterwards. A
+    watchdog restarts the poll loop if no poll has run for stall_after seconds.
+    """
+
+    def __init__(self, tracker, base_delay=1.0, max_delay=60.0, stall_after=30.0):
+        self.tracker = tracker
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stall_after = stall_after
+
+        self.healthy = True
+        self.last_error = None
+        self.reconnect_thread = None
+        self.watchdog_thread = None
+        self.last_poll = time.monotonic()
+        self.polled = False  # No stall until the poll loop has run at least once
+        self.restart_poll_loop = None  # Set by whoever owns the poll loop
+        self.running = False
+
+    def start(self):
+        """Start the poll loop watchdog"""
+        self.last_poll = time.monotonic()
+        self.polled = False
+        if self.running:
+            return
+        self.running = True
+        self.watchdog_thread = threading.Thread(target=self._watchdog)
+        self.watchdog_thread.daemon = True
+        self.watchdog_thread.start()
+
+    def stop(self):
+        """Stop the poll loop watchdog"""
+        self.running = False
+
+    def poll_started(self):
+        """Record that the poll loop is alive"""
+        self.last_poll = time.monotonic()
+        self.polled = True
+
+    def fetch(self, func, *args, **kwargs):
+        """Call an MT5 function, treating None as a lost connection"""
+        if not self.healthy:
+            return None
+
+        result = func(*args, **kwargs)
+        if result is None:
+            self.connection_lost(f"{func.__name__}() failed, error code = {mt5.last_error()}")
+        return result
+
+    def terminal_ready(self):
+        """Check the terminal is reachable and connected to the trade server"""
+        if not self.healthy:
+            return False
+
+        info = mt5.terminal_info()
+        if info is None:
+            self.connection_lost(f"terminal_info() failed, error code = {mt5.last_error()}")
+            return False
+
+        # The terminal answers but has lost the broker; its book may be stale,
+        # so skip diffing until it is back rather than reconnecting the IPC
+        return bool(info.connected)
+
+    def connection_lost(self, reason):
+        """Mark the connection as down and start reconnecting"""
+        if not self.healthy:
+            return
+
+        self.healthy = False
+        self.last_error = reason
+        self.tracker.connected = False
+        print(f"MT5 connection lost: {reason}")
+        if self.tracker.gui:
+            self.tracker.gui.log_message(f"MT5 connection lost: {reason}", is_error=True)
+            self.tracker.gui.update_status("Reconnecting to MT5...")
+
+        self.reconnect_thread = threading.Thread(target=self._reconnect)
+        self.reconnect_thread.daemon = True
+        self.reconnect_thread.start()
+
+    def _reconnect(self):
+        delay = self.base_delay
+        attempt = 0
+        while not self.healthy:
+            attempt += 1
+            # Full jitter keeps several trackers on one host from retrying in lockstep
+            time.sleep(random.uniform(0, delay))
+
+            mt5.shutdown()
+            if self.tracker.connect():
+                self.tracker.resync_pending = 'reconnect'
+                self.healthy = True
+                print(f"Reconnected to MT5 after {attempt} attempt(s)")
+                if self.tracker.gui:
+                    self.tracker.gui.log_message(f"Reconnected to MT5 after {attempt} attempt(s)")
+                    self.tracker.gui.update_status(
+                        "Tracking active" if self.tracker.tracking_active else "Tracking stopped"
+                    )
+                return
+
+            delay = min(delay * 2, self.max_delay)
+
+    def _watchdog(self):
+        while self.running:
+            time.sleep(min(5.0, self.stall_after))
+            if not self.tracker.tracking_active or self.restart_poll_loop is None:
+                continue
+            if not self.polled:
+                # The poll loop is not up yet (e.g. Discord still connecting)
+                continue
+
+            stalled_for = time.monotonic() - self.last_poll
+            if stalled_for > self.stall_after:
+                print(f"Poll loop stalled for {stalled_for:.0f}s, restarting")
+                if self.tracker.gui:
+                    self.tracker.gui.log_message(f"Poll loop stalled for {stalled_for:.0f}s, restarting", is_error=True)
+                self.last_poll = time.monotonic()
+                try:
+                    self.restart_poll_loop()
+                except Exception as e:
+                    print(f"Error restarting poll loop: {e}")
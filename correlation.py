@@ -0,0 +1,144 @@
+import MetaTrader5 as mt5
+import threading
+import time
+import numpy as np
+
+
+class CorrelationMonitor:
+    """Rolling return correlation and concentration of the symbols held.
+
+    Bars come from the bar cache, so each check only fetches bars that
+    closed since the last one, and the matrix is recomputed only when a
+    bar closed or the set of held symbols changed. Correlation is taken
+    over log returns of close prices on bar times common to all symbols.
+
+    Concentration weighs each symbol by its signed position value in the
+    account currency: it is the portfolio's volatility divided by the
+    volatility it would have if every position moved together, so 1.0
+    means no diversification and values near 0 mean well hedged.
+    """
+
+    def __init__(self, bar_cache, timeframe="H1", window=100, spec_ttl=3600):
+        self.bar_cache = bar_cache
+        self.timeframe = timeframe
+        self.window = window
+        self.spec_ttl = spec_ttl
+        self.lock = threading.Lock()
+        self.point_values = {}  # symbol -> (loaded_at, account value of a 1.0 price move for one lot)
+        self.symbols = ()
+        self.matrix = None
+        self.volatility = None
+        self.bar_count = 0
+        self.result = None
+
+    def _point_value(self, symbol):
+        cached = self.point_values.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.spec_ttl:
+            return cached[1]
+        info = mt5.symbol_info(symbol)
+        if info is None or not info.trade_tick_size:
+            return cached[1] if cached else np.nan
+        value = info.trade_tick_value / info.trade_tick_size
+        self.point_values[symbol] = (time.monotonic(), value)
+        return value
+
+    def _aligned_returns(self, symbols):
+        """Log returns of closes on the bar times every symbol has"""
+        series = []
+        for symbol in symbols:
+            bars = self.bar_cache.bars(symbol, self.timeframe)
+            if bars is None or len(bars) < 3:
+                return None
+            series.append(bars)
+
+        common = series[0]['time']
+        for bars in series[1:]:
+            common = np.intersect1d(common, bars['time'], assume_unique=True)
+        common = common[-(self.window + 1):]
+        if len(common) < 3:
+            return None
+
+        closes = np.column_stack([
+            bars['close'][np.searchsorted(bars['time'], common)] for bars in series
+        ])
+        return np.diff(np.log(closes), axis=0)
+
+    def update(self, positions):
+        """Refresh from the open positions (store rows); returns True if recomputed"""
+        exposure = {}
+        for row in positions:
+            sign = 1.0 if row['type'] == 'Buy' else -1.0
+            value = sign * row['volume'] * row['price_current'] * self._point_value(row['symbol'])
+            exposure[row['symbol']] = exposure.get(row['symbol'], 0.0) + value
+
+        symbols = tuple(sorted(exposure))
+        new_bars = False
+        for symbol in symbols:
+            try:
+                new_bars |= self.bar_cache.update(symbol, self.timeframe)
+            except Exception as e:
+                print(f"Error updating bars for {symbol}: {e}")
+
+        with self.lock:
+            if new_bars or symbols != self.symbols or self.matrix is None:
+                self.symbols = symbols
+                returns = self._aligned_returns(symbols) if len(symbols) >= 2 else None
+                if returns is None:
+                    self.matrix = self.volatility = None
+                    self.bar_count = 0
+                else:
+                    self.matrix = np.corrcoef(returns, rowvar=False)
+                    self.volatility = returns.std(axis=0)
+                    self.bar_count = len(returns)
+                recomputed = True
+            else:
+                recomputed = False
+            # Position sizes change between bars, so the weights are always fresh
+            self.result = self._compute(symbols, np.array([exposure[s] for s in symbols]))
+        return recomputed
+
+    def _compute(self, symbols, weights):
+        result = {
+            'symbols': symbols, 'matrix': None, 'concentration': None,
+            'effective_bets': None, 'pairs': [], 'bars': 0, 'updated': time.time(),
+        }
+        # A symbol whose contract spec could not be read has no known value; leave it out
+        weights = np.nan_to_num(weights, nan=0.0)
+        gross = np.abs(weights)
+        if len(symbols) and gross.sum() > 0:
+            shares = gross / gross.sum()
+            result['effective_bets'] = float(1.0 / np.sum(shares ** 2))
+
+        matrix, volatility = self.matrix, self.volatility
+        if matrix is None:
+            return result
+
+        covariance = matrix * np.outer(volatility, volatility)
+        portfolio = np.sqrt(max(float(weights @ covariance @ weights), 0.0))
+        undiversified = float(gross @ volatility)
+        result['matrix'] = matrix
+        result['bars'] = self.bar_count
+        if undiversified > 0 and np.isfinite(portfolio):
+            result['concentration'] = portfolio / undiversified
+
+        upper = np.triu_indices(len(symbols), k=1)
+        order = np.argsort(-np.abs(matrix[upper]))
+        result['pairs'] = [
+            (symbols[upper[0][i]], symbols[upper[1][i]], float(matrix[upper][i]))
+            for i in order
+        ]
+        return result
+
+    def report(self):
+        with self.lock:
+            return self.result
+
+    def summary_line(self, pairs=2):
+        """One-line concentration and most correlated pairs for summaries"""
+        result = self.report()
+        if result is None or result['concentration'] is None:
+            return "n/a"
+        parts = [f"{result['concentration']:.2f} (effective bets {result['effective_bets']:.1f})"]
+        for first, second, value in result['pairs'][:pairs]:
+            parts.append(f"{first}/{second} {value:+.2f}")
+        return " | ".join(parts)
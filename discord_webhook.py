@@ -0,0 +1,93 @@
+import asyncio
+import json
+import re
+import aiohttp
+
+# Discord rejects message content longer than this
+MAX_CONTENT = 2000
+
+
+# The token is the last path segment of a webhook URL
+_WEBHOOK_TOKEN = re.compile(r'(/webhooks/[^/\s]+/)[^/\s?]+')
+
+
+def redact_url(text):
+    """Mask webhook tokens in a URL or in text that contains one, so it is safe to log"""
+    return _WEBHOOK_TOKEN.sub(r'\1***', str(text))
+
+
+class WebhookError(Exception):
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class WebhookSender:
+    """Posts alerts to Discord webhooks over one pooled HTTP session.
+
+    The session is created on first use inside the poll loop and keeps its
+    connections alive between alerts, so sending needs no gateway login and
+    no new TLS handshake per message. Rate limit responses are honoured by
+    waiting for the retry_after Discord returns.
+    """
+
+    def __init__(self, timeout=10, max_connections=8, max_retries=3):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.session = None
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ttl_dns_cache=300,
+                keepalive_timeout=120
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    def _form(self, payload, file):
+        """Multipart body carrying the message and one attachment"""
+        filename, data = file
+        form = aiohttp.FormData()
+        form.add_field('payload_json', json.dumps(payload), content_type='application/json')
+        form.add_field('files[0]', data, filename=filename, content_type='image/png')
+        return form
+
+    async def send(self, url, content, username=None, file=None):
+        """Post one message, optionally with a (filename, PNG bytes) attachment.
+
+        Waits out rate limits; raises WebhookError on failure.
+        """
+        payload = {'content': content[:MAX_CONTENT]}
+        if username:
+            payload['username'] = username
+
+        session = self._get_session()
+        for attempt in range(self.max_retries + 1):
+            # A form body can only be sent once, so build it per attempt
+            body = {'data': self._form(payload, file)} if file else {'json': payload}
+            try:
+                async with session.post(url, **body) as response:
+                    if response.status == 429:
+                        data = await response.json(content_type=None)
+                        await asyncio.sleep(float(data.get('retry_after', 1)))
+                        continue
+                    if response.status >= 400:
+                        text = await response.text()
+                        raise WebhookError(f"Webhook returned HTTP {response.status}: {redact_url(text[:200])}",
+                                           response.status)
+                    return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # aiohttp puts the full URL, token included, in its messages
+                raise WebhookError(f"Webhook request failed: {redact_url(f'{type(e).__name__}: {e}')}") from None
+        raise WebhookError(f"Webhook still rate limited after {self.max_retries} retries")
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
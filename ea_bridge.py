@@ -0,0 +1,194 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+# Ring buffer layout shared with MT5_Telegram_Discord_Tracker.mq5 (little-endian).
+# Header: magic, version, record size, capacity, write_seq (records ever written).
+HEADER = struct.Struct('<IIIIQ40x')
+# Record: seq, event, type, position ticket, deal/order ticket, time_msc,
+# volume, price, sl, tp, profit, magic, reason, symbol
+RECORD = struct.Struct('<QIiQQqdddddqi32s4x')
+
+BRIDGE_MAGIC = 0x4252544D  # "MTRB"
+BRIDGE_VERSION = 1
+
+EVENT_OPEN = 1
+EVENT_MODIFY = 2
+EVENT_CLOSE = 3
+EVENT_ORDER_ADD = 4
+EVENT_ORDER_REMOVE = 5
+
+EVENT_NAMES = {
+    EVENT_OPEN: 'open',
+    EVENT_MODIFY: 'modify',
+    EVENT_CLOSE: 'close',
+    EVENT_ORDER_ADD: 'order_add',
+    EVENT_ORDER_REMOVE: 'order_remove',
+}
+
+RECORD_FIELDS = (
+    'seq', 'event', 'type', 'ticket', 'deal', 'time_msc', 'volume', 'price',
+    'sl', 'tp', 'profit', 'magic', 'reason', 'symbol'
+)
+
+
+def _record_offset(seq, capacity):
+    return HEADER.size + ((seq - 1) % capacity) * RECORD.size
+
+
+class EABridgeReader:
+    """Reads trade event records the EA writes into a memory-mapped ring buffer.
+
+    Each record carries its sequence number; it is read before and after the
+    body so a slot being overwritten mid-read is detected and skipped. If the
+    reader falls more than a full ring behind, the lost records are reported
+    as an overrun so the caller can reconcile by polling.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, capacity, write_seq = HEADER.unpack_from(self.map, 0)
+        if magic != BRIDGE_MAGIC or version != BRIDGE_VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {BRIDGE_VERSION} EA bridge buffer")
+
+        self.capacity = capacity
+        # Only deliver events written after we attached
+        self.last_seq = write_seq
+
+    def poll(self):
+        """Return (records, overrun) for everything written since the last poll"""
+        write_seq = HEADER.unpack_from(self.map, 0)[4]
+        if write_seq < self.last_seq:
+            # The EA recreated the buffer; start following it again
+            self.last_seq = 0
+        if write_seq == self.last_seq:
+            return [], False
+
+        overrun = write_seq - self.last_seq > self.capacity
+        if overrun:
+            self.last_seq = write_seq - self.capacity
+
+        records = []
+        for seq in range(self.last_seq + 1, write_seq + 1):
+            offset = _record_offset(seq, self.capacity)
+            values = RECORD.unpack_from(self.map, offset)
+            if values[0] != seq or struct.unpack_from('<Q', self.map, offset)[0] != seq:
+                overrun = True
+                continue
+
+            record = dict(zip(RECORD_FIELDS, values))
+            record['symbol'] = record['symbol'].split(b'\0', 1)[0].decode('ascii', 'replace')
+            record['event'] = EVENT_NAMES.get(record['event'], str(record['event']))
+            records.append(record)
+
+        self.last_seq = write_seq
+        return records, overrun
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class EABridgeWriter:
+    """Writes records in the EA's format; used to simulate the EA locally"""
+
+    def __init__(self, path, capacity=4096):
+        self.path = path
+        size = HEADER.size + capacity * RECORD.size
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(BRIDGE_MAGIC, BRIDGE_VERSION, RECORD.size, capacity, 0))
+                f.truncate(size)
+
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.capacity = capacity
+        self.write_seq = HEADER.unpack_from(self.map, 0)[4]
+
+    def write(self, event, ticket, symbol, type=0, deal=0, time_msc=None, volume=0.0, price=0.0,
+              sl=0.0, tp=0.0, profit=0.0, magic=0, reason=0):
+        """Append one event record, publishing it by bumping write_seq last"""
+        seq = self.write_seq + 1
+        offset = _record_offset(seq, self.capacity)
+        if time_msc is None:
+            time_msc = int(time.time() * 1000)
+
+        body = RECORD.pack(0, event, type, ticket, deal, time_msc, volume, price, sl, tp, profit,
+                           magic, reason, symbol.encode('ascii')[:31])
+        # Invalidate the slot, write the body, then stamp the sequence number
+        struct.pack_into('<Q', self.map, offset, 0)
+        self.map[offset + 8:offset + RECORD.size] = body[8:]
+        struct.pack_into('<Q', self.map, offset, seq)
+
+        self.write_seq = seq
+        struct.pack_into('<Q', self.map, 16, seq)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class EABridge:
+    """Background consumer that hands EA events to a callback as they arrive"""
+
+    def __init__(self, path, callback, poll_interval=0.02, retry_interval=5.0):
+        self.path = path
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.reader = None
+        self.running = False
+        self.thread = None
+
+    @property
+    def attached(self):
+        return self.reader is not None
+
+    def start(self):
+        """Start following the ring buffer in a background thread"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            if self.reader is None:
+                try:
+                    self.reader = EABridgeReader(self.path)
+                    print(f"Attached to EA bridge {self.path}")
+                except (OSError, ValueError):
+                    # The EA has not created the buffer yet
+                    time.sleep(self.retry_interval)
+                    continue
+
+            try:
+                records, overrun = self.reader.poll()
+            except Exception as e:
+                print(f"Error reading EA bridge: {e}")
+                self.reader.close()
+                self.reader = None
+                continue
+
+            if records or overrun:
+                try:
+                    self.callback(records, overrun)
+                except Exception as e:
+                    print(f"Error handling EA bridge events: {e}")
+            else:
+                time.sleep(self.poll_interval)
+
+        if self.reader:
+            self.reader.close()
+            self.reader = None
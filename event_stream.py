@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class EventStreamServer:
+    """Publishes tracker snapshots and deltas to local subscribers.
+
+    Protocol: after connecting, a subscriber may send one line of JSON such
+    as {"since": 1234, "epoch": "..."}. If the epoch is this server's and
+    every delta after that sequence number is still in the backlog (and fits
+    the subscriber queue) they are replayed; otherwise (or without "since")
+    the subscriber first receives {"type": "snapshot", "seq": N, "state": ...}
+    and then every {"type": "delta", "seq": ..., "diff": ..., "events": ...}
+    with seq > N, in order. Every frame carries the epoch, which changes when
+    the tracker restarts and sequence numbers start over. Frames are
+    newline-delimited JSON, or msgpack when format is "msgpack".
+
+    Each subscriber has a bounded queue. A subscriber that falls that far
+    behind gets {"type": "overflow", "seq": last_sent} and is disconnected,
+    and can reconnect with "since" to resume without stalling the others.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8766, backlog=10000, queue_size=1000, fmt="json",
+                 hello_timeout=0.5):
+        if fmt == "msgpack" and msgpack is None:
+            print("msgpack is not installed, event stream falls back to JSON")
+            fmt = "json"
+
+        self.host = host
+        self.port = port
+        self.format = fmt
+        self.queue_size = queue_size
+        self.hello_timeout = hello_timeout
+        self.loop = None
+        self.thread = None
+
+        self.epoch = uuid.uuid4().hex
+        self.seq = 0
+        self.state = None
+        self.backlog = deque(maxlen=backlog)  # (seq, message) for resuming subscribers
+        self.subscribers = set()
+
+    def start(self):
+        """Start the socket server in a separate thread"""
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port)
+            )
+            print(f"Event stream listening on {self.host}:{self.port}")
+            self.loop.run_until_complete(server.serve_forever())
+        except Exception as e:
+            print(f"Error starting event stream: {e}")
+
+    def encode(self, message):
+        if self.format == "msgpack":
+            return msgpack.packb(message, use_bin_type=True)
+        return (json.dumps(message, separators=(',', ':')) + "\n").encode()
+
+    def publish(self, generation, snapshot, diff, events):
+        """Queue a delta for all subscribers; safe to call from any thread"""
+        if self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(self._append, snapshot, diff, events)
+
+    def _append(self, snapshot, diff, events):
+        self.seq += 1
+        self.state = snapshot
+        message = {'type': 'delta', 'epoch': self.epoch, 'seq': self.seq, 'diff': diff, 'events': events}
+        self.backlog.append((self.seq, message))
+
+        frame = self.encode(message)
+        for subscriber in list(self.subscribers):
+            subscriber.offer(self.seq, frame)
+
+    async def _read_hello(self, reader):
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.hello_timeout)
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            # No hello, a line over the stream limit, or the client already gone
+            return {}
+        if not line.strip():
+            return {}
+        try:
+            hello = json.loads(line)
+        except ValueError:
+            return {}
+        return hello if isinstance(hello, dict) else {}
+
+    async def _handle_client(self, reader, writer):
+        hello = await self._read_hello(reader)
+        subscriber = _Subscriber(writer, self.queue_size)
+
+        # Everything up to here runs on the loop thread, so the backlog, state
+        # and subscriber set cannot change between choosing replay or snapshot
+        # and registering for new deltas
+        since = hello.get('since')
+        if not isinstance(since, int) or isinstance(since, bool) or hello.get('epoch') != self.epoch:
+            since = None  # Malformed, or sequence numbers from before a restart
+        oldest = self.backlog[0][0] if self.backlog else self.seq + 1
+        replayable = since is not None and oldest - 1 <= since <= self.seq
+        if replayable and self.seq - since <= self.queue_size:
+            for seq, message in self.backlog:
+                if seq > since:
+                    subscriber.offer(seq, self.encode(message))
+        else:
+            subscriber.offer(self.seq, self.encode(
+                {'type': 'snapshot', 'epoch': self.epoch, 'seq': self.seq, 'state': self.state}
+            ))
+
+        self.subscribers.add(subscriber)
+        try:
+            await subscriber.drain_forever(self)
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+
+class _Subscriber:
+    """Bounded outgoing queue for one event stream connection"""
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.last_sent = 0
+        self.overflowed = False
+
+    def offer(self, seq, frame):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait((seq, frame))
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def drain_forever(self, server):
+        try:
+            while True:
+                if self.overflowed and self.queue.empty():
+                    self.writer.write(server.encode({'type': 'overflow', 'epoch': server.epoch, 'seq': self.last_sent}))
+                    await self.writer.drain()
+                    return
+
+                seq, frame = await self.queue.get()
+                self.writer.write(frame)
+                await self.writer.drain()
+                self.last_sent = seq
+        except (ConnectionError, asyncio.CancelledError):
+            return
@@ -0,0 +1,184 @@
+import MetaTrader5 as mt5
+import threading
+import time
+import numpy as np
+
+
+class ExposureEngine:
+    """Net exposure per currency and asset across all open positions.
+
+    Every position is split into a base leg (+volume * contract size of the
+    base currency, or of the instrument itself for CFDs quoted in their own
+    currency) and a quote leg (-that amount * price). Legs are summed into
+    one array indexed by currency. The engine subscribes to snapshot diffs,
+    so each poll only removes and re-adds the legs of positions that changed.
+    """
+
+    def __init__(self, spec_ttl=3600, rate_ttl=60):
+        self.spec_ttl = spec_ttl
+        self.rate_ttl = rate_ttl
+        self.lock = threading.Lock()
+
+        self.specs = {}  # symbol -> (loaded_at, base, quote, contract size, base is the instrument)
+        self.rates = {}  # name -> (loaded_at, value of one unit in account currency)
+        self.account_currency = None
+
+        self.names = []  # Currency or asset per totals index
+        self.index = {}
+        self.is_asset = []
+        self.totals = np.zeros(0)
+        self.legs = {}  # ticket -> (base index, quote index, base amount, quote amount)
+        self.rows = []  # Latest report
+
+    def _spec(self, symbol):
+        spec = self.specs.get(symbol)
+        if spec and time.monotonic() - spec[0] < self.spec_ttl:
+            return spec
+
+        info = mt5.symbol_info(symbol)
+        if info is None:
+            return spec
+
+        base, quote = info.currency_base, info.currency_profit
+        is_asset = not base or base == quote
+        spec = (time.monotonic(), symbol if is_asset else base, quote, info.trade_contract_size or 1.0, is_asset)
+        self.specs[symbol] = spec
+        return spec
+
+    def _slot(self, name, is_asset=False):
+        slot = self.index.get(name)
+        if slot is None:
+            slot = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.is_asset.append(is_asset)
+            self.totals = np.append(self.totals, 0.0)
+        return slot
+
+    def _compute_legs(self, rows):
+        """Vectorized base and quote legs for a batch of position rows"""
+        rows = [row for row in rows if self._spec(row['symbol'])]
+        if not rows:
+            return [], None
+
+        specs = [self._spec(row['symbol']) for row in rows]
+        base_slot = np.array([self._slot(spec[1], spec[4]) for spec in specs], dtype=np.int64)
+        quote_slot = np.array([self._slot(spec[2]) for spec in specs], dtype=np.int64)
+        contract = np.array([spec[3] for spec in specs])
+        volume = np.array([row['volume'] for row in rows], dtype=float)
+        price = np.array([row['price_current'] for row in rows], dtype=float)
+        sign = np.where(np.array([row['type'] for row in rows]) == 'Buy', 1.0, -1.0)
+
+        base_amount = sign * volume * contract
+        quote_amount = -base_amount * price
+        tickets = [row['ticket'] for row in rows]
+        return tickets, (base_slot, quote_slot, base_amount, quote_amount)
+
+    def _apply(self, tickets, legs, direction):
+        base_slot, quote_slot, base_amount, quote_amount = legs
+        np.add.at(self.totals, base_slot, direction * base_amount)
+        np.add.at(self.totals, quote_slot, direction * quote_amount)
+        if direction > 0:
+            for i, ticket in enumerate(tickets):
+                self.legs[ticket] = (base_slot[i], quote_slot[i], base_amount[i], quote_amount[i])
+
+    def _remove(self, tickets):
+        stored = [self.legs.pop(ticket) for ticket in tickets if ticket in self.legs]
+        if stored:
+            columns = [np.array(column) for column in zip(*stored)]
+            self._apply(None, columns, -1.0)
+
+    def publish(self, generation, snapshot, diff, events):
+        """Apply a snapshot diff; called by the tracker after every poll"""
+        if diff is None:
+            return
+
+        with self.lock:
+            positions = diff['positions']
+            # The first diff (and one after a reconnect) upserts every position
+            self._remove(list(positions['remove']) + list(positions['upsert']))
+            tickets, legs = self._compute_legs(list(positions['upsert'].values()))
+            if legs is not None:
+                self._apply(tickets, legs, 1.0)
+            if not self.legs:
+                # Clear rounding residue once flat
+                self.totals[:] = 0.0
+            self.rows = self._report()
+
+    def _account_currency(self):
+        if self.account_currency is None:
+            info = mt5.account_info()
+            if info is not None:
+                self.account_currency = info.currency
+        return self.account_currency
+
+    def _mid(self, symbol):
+        tick = mt5.symbol_info_tick(symbol)
+        if tick is None or not tick.bid or not tick.ask:
+            return None
+        return (tick.bid + tick.ask) / 2
+
+    def _rate(self, name, is_asset):
+        """Value of one unit of a currency or asset in the account currency, or None"""
+        cached = self.rates.get(name)
+        if cached and time.monotonic() - cached[0] < self.rate_ttl:
+            return cached[1]
+
+        account = self._account_currency()
+        rate = None
+        if is_asset:
+            spec = self.specs.get(name)
+            mid = self._mid(name)
+            quote_rate = self._rate(spec[2], False) if spec else None
+            if mid is not None and quote_rate is not None:
+                rate = mid * quote_rate
+        elif name == account:
+            rate = 1.0
+        elif account:
+            # Use a held symbol's naming (e.g. a broker suffix) to find the cross
+            suffixes = {''}
+            for symbol, spec in self.specs.items():
+                if not spec[4] and symbol.startswith(spec[1] + spec[2]):
+                    suffixes.add(symbol[len(spec[1] + spec[2]):])
+            for suffix in suffixes:
+                mid = self._mid(f"{name}{account}{suffix}")
+                if mid:
+                    rate = mid
+                    break
+                mid = self._mid(f"{account}{name}{suffix}")
+                if mid:
+                    rate = 1.0 / mid
+                    break
+
+        self.rates[name] = (time.monotonic(), rate)
+        return rate
+
+    def _report(self):
+        rows = []
+        for slot in np.flatnonzero(np.abs(self.totals) > 1e-9):
+            name = self.names[slot]
+            amount = float(self.totals[slot])
+            rate = self._rate(name, self.is_asset[slot])
+            rows.append({
+                'name': name,
+                'asset': self.is_asset[slot],
+                'amount': amount,
+                'value': amount * rate if rate is not None else None,
+            })
+        rows.sort(key=lambda row: -abs(row['value'] if row['value'] is not None else 0.0))
+        return rows
+
+    def report(self):
+        """Return the latest exposure rows, largest account-currency value first"""
+        with self.lock:
+            return list(self.rows), self.account_currency
+
+    def summary_line(self, limit=5):
+        """One-line net exposure for alerts and summaries"""
+        rows, currency = self.report()
+        parts = []
+        for row in rows[:limit]:
+            if row['value'] is not None:
+                parts.append(f"{row['name']} {row['value']:+,.0f} {currency}")
+            else:
+                parts.append(f"{row['name']} {row['amount']:+,.2f}")
+        return " | ".join(parts) if parts else "Flat"
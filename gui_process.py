@@ -0,0 +1,242 @@
+import queue
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from tkinter import ttk, scrolledtext
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.dates import DateFormatter
+import numpy as np
+from shared_state import SharedStateReader
+
+# Log lines kept in the widget
+MAX_LOG_ENTRIES = 2000
+
+
+class MonitorGUI:
+    """Tracker window running in its own process.
+
+    Positions, account values and the equity history are read from shared
+    memory; log lines and status arrive on the event queue; the Start and
+    Stop buttons send commands back to the tracker process. Nothing here
+    can stall polling or alert delivery in the tracker.
+    """
+
+    def __init__(self, reader, commands, events):
+        self.reader = reader
+        self.commands = commands
+        self.events = events
+
+        self.root = tk.Tk()
+        self.root.title("MT5 Order Tracker")
+        self.root.geometry("1200x700")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Set a dark theme
+        self.root.configure(bg="#2a2d2e")
+        self.style = ttk.Style()
+        self.style.theme_use("clam")
+        self.style.configure(".", background="#2a2d2e", foreground="white", fieldbackground="#2a2d2e")
+        self.style.configure("TFrame", background="#2a2d2e")
+        self.style.configure("TLabel", background="#2a2d2e", foreground="white")
+        self.style.configure("TButton", background="#3a7ebf", foreground="white", borderwidth=0)
+        self.style.map("TButton", background=[("active", "#2a6099")])
+
+        self.setup_ui()
+        self.poll_events()
+        self.refresh_state()
+
+    def setup_ui(self):
+        main_frame = ttk.Frame(self.root, padding=10)
+        main_frame.pack(fill="both", expand=True)
+
+        # Header with status and controls
+        header_frame = ttk.Frame(main_frame)
+        header_frame.pack(fill="x", pady=(0, 10))
+        title_frame = ttk.Frame(header_frame)
+        title_frame.pack(side="left", fill="x", expand=True)
+        ttk.Label(title_frame, text="MT5 Order Tracker", font=("Arial", 16, "bold")).pack(anchor="w")
+        self.status_label = ttk.Label(title_frame, text="Waiting for tracker...", font=("Arial", 10))
+        self.status_label.pack(anchor="w")
+
+        control_frame = ttk.Frame(header_frame)
+        control_frame.pack(side="right")
+        self.start_button = tk.Button(
+            control_frame, text="▶️ Start Tracking", command=lambda: self.commands.put('start'),
+            bg="#28a745", fg="white", relief="flat", padx=10, pady=5
+        )
+        self.start_button.pack(side="left", padx=5)
+        self.stop_button = tk.Button(
+            control_frame, text="⏹️ Stop Tracking", command=lambda: self.commands.put('stop'),
+            bg="#dc3545", fg="white", relief="flat", padx=10, pady=5, state=tk.DISABLED
+        )
+        self.stop_button.pack(side="left", padx=5)
+
+        # Account info
+        account_frame = ttk.LabelFrame(main_frame, text="Account Information", padding=10)
+        account_frame.pack(fill="x", pady=(0, 10))
+        self.account_labels = {}
+        account_fields = [
+            ('Balance', 'balance'), ('Equity', 'equity'), ('Profit', 'profit'),
+            ('Margin', 'margin'), ('Margin Level', 'margin_level'), ('Free Margin', 'margin_free')
+        ]
+        for i, (display_name, field_name) in enumerate(account_fields):
+            row, col = divmod(i, 3)
+            ttk.Label(account_frame, text=display_name).grid(row=row, column=col*2, padx=5, pady=5, sticky="w")
+            value_label = ttk.Label(account_frame, text="--")
+            value_label.grid(row=row, column=col*2+1, padx=5, pady=5, sticky="w")
+            self.account_labels[field_name] = value_label
+
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill="both", expand=True)
+
+        # Positions tab
+        positions_frame = ttk.Frame(notebook, padding=10)
+        notebook.add(positions_frame, text="Open Positions")
+        columns = ('Ticket', 'Symbol', 'Type', 'Volume', 'Open Price', 'Current Price', 'SL', 'TP',
+                   'Profit', 'Swap', 'Magic', 'Time')
+        self.positions_table = ttk.Treeview(positions_frame, columns=columns, show='headings')
+        for col in columns:
+            self.positions_table.heading(col, text=col)
+            self.positions_table.column(col, width=80 if col not in ('Time', 'Symbol') else 120, anchor='center')
+        self.positions_table.tag_configure("profit", background="#28a745")
+        self.positions_table.tag_configure("loss", background="#dc3545")
+        y_scrollbar = ttk.Scrollbar(positions_frame, orient="vertical", command=self.positions_table.yview)
+        y_scrollbar.pack(side="right", fill="y")
+        self.positions_table.configure(yscrollcommand=y_scrollbar.set)
+        self.positions_table.pack(side="left", fill="both", expand=True)
+
+        # Equity tab
+        equity_frame = ttk.Frame(notebook, padding=10)
+        notebook.add(equity_frame, text="Equity")
+        self.figure = Figure(figsize=(10, 6), dpi=100, facecolor='#2a2d2e')
+        self.plot = self.figure.add_subplot(111)
+        self.canvas = FigureCanvasTkAgg(self.figure, equity_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+
+        # Activity log tab
+        log_frame = ttk.Frame(notebook, padding=10)
+        notebook.add(log_frame, text="Activity Log")
+        self.log_text = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, bg="#2a2d2e", fg="white", font=("Consolas", 10))
+        self.log_text.pack(fill="both", expand=True)
+        self.log_entry_lines = deque()  # Widget lines taken by each shown entry, oldest first
+        self.log_text.tag_config("timestamp", foreground="#6c757d")
+        self.log_text.tag_config("message", foreground="#f8f9fa")
+        self.log_text.tag_config("error", foreground="#ff6b6b")
+
+    def poll_events(self):
+        """Apply log lines and status changes sent by the tracker"""
+        chunks = []
+        try:
+            while True:
+                event = self.events.get_nowait()
+                if event[0] == 'log':
+                    _, timestamp, message, is_error = event
+                    if is_error:
+                        chunks += [f"{timestamp} ERROR: ", "timestamp", f"{message}\n", "error"]
+                    else:
+                        chunks += [f"{timestamp}: ", "timestamp", f"{message}\n", "message"]
+                    self.log_entry_lines.append(message.count("\n") + 1)
+                elif event[0] == 'status':
+                    self.status_label.config(text=event[1])
+                elif event[0] == 'tracking':
+                    self.start_button.config(state=tk.DISABLED if event[1] else tk.NORMAL)
+                    self.stop_button.config(state=tk.NORMAL if event[1] else tk.DISABLED)
+                elif event[0] == 'quit':
+                    self.root.destroy()
+                    return
+        except queue.Empty:
+            pass
+
+        if chunks:
+            self.log_text.insert(tk.END, *chunks)
+            # Trim whole entries, so a multi-line message is never cut in half
+            lines = 0
+            while len(self.log_entry_lines) > MAX_LOG_ENTRIES:
+                lines += self.log_entry_lines.popleft()
+            if lines:
+                self.log_text.delete('1.0', f"{lines + 1}.0")
+            self.log_text.see(tk.END)
+
+        self.root.after(200, self.poll_events)
+
+    def refresh_state(self):
+        """Redraw from shared memory when the tracker has published a new generation"""
+        state = self.reader.read()
+        if state is not None:
+            self.show_account(state['account'])
+            self.show_positions(state['positions'], state['total'])
+            if len(state['equity']) >= 2:
+                self.draw_equity(state['equity'])
+        self.root.after(500, self.refresh_state)
+
+    def show_account(self, account):
+        for field, label in self.account_labels.items():
+            value = account[field]
+            if field == 'margin_level':
+                label.config(text=f"{value:.2f}%")
+            else:
+                label.config(text=f"${value:.2f}")
+            if field == 'profit':
+                label.config(foreground="#28a745" if value > 0 else "#dc3545" if value < 0 else "white")
+
+    def show_positions(self, positions, total):
+        shown = {str(ticket) for ticket in positions['ticket'].tolist()}
+        stale = [item for item in self.positions_table.get_children() if item not in shown]
+        if stale:
+            self.positions_table.delete(*stale)
+
+        for row in positions:
+            item = str(row['ticket'])
+            profit = float(row['profit'])
+            values = (
+                int(row['ticket']),
+                row['symbol'].decode(),
+                'Buy' if row['buy'] else 'Sell',
+                float(row['volume']),
+                f"{row['price_open']:.5f}",
+                f"{row['price_current']:.5f}",
+                f"{row['sl']:.5f}" if row['sl'] > 0 else "None",
+                f"{row['tp']:.5f}" if row['tp'] > 0 else "None",
+                f"{profit:.2f}",
+                f"{row['swap']:.2f}",
+                int(row['magic']),
+                datetime.fromtimestamp(int(row['time'])).strftime("%Y-%m-%d %H:%M:%S")
+            )
+            tag = "profit" if profit > 0 else "loss" if profit < 0 else ""
+            if self.positions_table.exists(item):
+                self.positions_table.item(item, values=values, tags=(tag,))
+            else:
+                self.positions_table.insert('', tk.END, iid=item, values=values, tags=(tag,))
+
+        if total > len(positions):
+            self.status_label.config(text=f"Showing {len(positions)} of {total} positions")
+
+    def draw_equity(self, equity):
+        self.plot.clear()
+        self.plot.set_facecolor('#2a2d2e')
+        times = equity[:, 0].astype('datetime64[s]') + np.timedelta64(self._utc_offset(), 's')
+        self.plot.plot(times, equity[:, 1], color='#3a7ebf')
+        self.plot.set_title("Equity", color='white')
+        self.plot.tick_params(colors='white')
+        self.plot.xaxis.set_major_formatter(DateFormatter('%m-%d %H:%M'))
+        self.figure.autofmt_xdate()
+        self.canvas.draw_idle()
+
+    @staticmethod
+    def _utc_offset():
+        return int(datetime.now().astimezone().utcoffset().total_seconds())
+
+    def on_close(self):
+        self.commands.put('quit')
+        self.root.destroy()
+
+    def run(self):
+        self.root.mainloop()
+        self.reader.close()
+
+
+def run_gui_process(shm_name, capacity, history, commands, events):
+    """Entry point of the GUI process"""
+    reader = SharedStateReader(shm_name, capacity, history)
+    MonitorGUI(reader, commands, events).run()
@@ -0,0 +1,219 @@
+import MetaTrader5 as mt5
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pandas as pd
+import numpy as np
+
+# Deal fields mirrored from mt5.history_deals_get() into the cache
+DEAL_COLUMNS = (
+    'ticket', 'order', 'time', 'time_msc', 'type', 'entry', 'magic',
+    'position_id', 'reason', 'volume', 'price', 'commission', 'swap',
+    'profit', 'fee', 'symbol', 'comment'
+)
+
+# Re-fetch this much history before the watermark on every refresh so deals
+# that arrive late (or land on a server-time boundary) are never missed
+REFRESH_OVERLAP = timedelta(days=1)
+
+
+class DealHistoryCache:
+    """Local SQLite cache of the account's deal history"""
+
+    def __init__(self, path, start_date, chunk_days=30):
+        self.path = path
+        self.start_date = start_date
+        self.chunk = timedelta(days=chunk_days)
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS deals ("
+            '"ticket" INTEGER PRIMARY KEY, "order" INTEGER, "time" INTEGER, "time_msc" INTEGER, '
+            '"type" INTEGER, "entry" INTEGER, "magic" INTEGER, "position_id" INTEGER, '
+            '"reason" INTEGER, "volume" REAL, "price" REAL, "commission" REAL, "swap" REAL, '
+            '"profit" REAL, "fee" REAL, "symbol" TEXT, "comment" TEXT)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS deals_time ON deals ("time")')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS deals_position ON deals ("position_id")')
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def synced_until(self):
+        """Return the point up to which history has been fetched"""
+        value = self._get_meta('synced_until')
+        return datetime.fromisoformat(value) if value else None
+
+    def refresh(self):
+        """Backfill missing history in chunks, then fetch only what is new.
+
+        Returns the number of deals written, or None if MT5 failed mid-way
+        (the watermark then stays at the last complete chunk).
+        """
+        with self.lock:
+            synced = self.synced_until()
+            start = max(synced - REFRESH_OVERLAP, self.start_date) if synced else self.start_date
+            # Server time is usually ahead of local time, so look past "now"
+            end = datetime.now() + timedelta(days=1)
+
+            placeholders = ", ".join("?" for _ in DEAL_COLUMNS)
+            columns = ", ".join(f'"{c}"' for c in DEAL_COLUMNS)
+            insert = f"INSERT OR REPLACE INTO deals ({columns}) VALUES ({placeholders})"
+
+            written = 0
+            chunk_start = start
+            while chunk_start < end:
+                chunk_end = min(chunk_start + self.chunk, end)
+                deals = mt5.history_deals_get(chunk_start, chunk_end)
+                if deals is None:
+                    print(f"history_deals_get() failed, error code = {mt5.last_error()}")
+                    self.conn.commit()
+                    return None
+
+                if deals:
+                    rows = [tuple(getattr(deal, c) for c in DEAL_COLUMNS) for deal in deals]
+                    self.conn.executemany(insert, rows)
+                    written += len(rows)
+
+                self._set_meta('synced_until', min(chunk_end, datetime.now()).isoformat())
+                self.conn.commit()
+                chunk_start = chunk_end
+
+            return written
+
+    def load_deals(self, since=None):
+        """Load cached deals as a DataFrame, optionally from a server timestamp onwards"""
+        with self.lock:
+            if since is None:
+                return pd.read_sql_query('SELECT * FROM deals ORDER BY "time"', self.conn)
+            return pd.read_sql_query(
+                'SELECT * FROM deals WHERE "time" >= ? ORDER BY "time"', self.conn, params=(int(since),)
+            )
+
+    def position_deals(self, position_id):
+        """Load the deals that belong to one position"""
+        with self.lock:
+            return pd.read_sql_query(
+                'SELECT * FROM deals WHERE "position_id" = ? ORDER BY "time_msc"',
+                self.conn, params=(int(position_id),)
+            )
+
+    def checkpoint(self):
+        """Copy the write-ahead log into the database and truncate it"""
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def build_closed_trades(deals):
+    """Collapse trade deals into one row per closed position"""
+    trades = deals[deals['type'].isin([mt5.DEAL_TYPE_BUY, mt5.DEAL_TYPE_SELL])]
+    if trades.empty:
+        return pd.DataFrame(columns=['symbol', 'magic', 'net', 'open_time', 'close_time', 'hold_seconds'])
+
+    is_entry = trades['entry'].to_numpy() == mt5.DEAL_ENTRY_IN
+    frame = pd.DataFrame({
+        'position_id': trades['position_id'].to_numpy(),
+        'symbol': trades['symbol'].to_numpy(),
+        'magic': np.where(is_entry, trades['magic'].to_numpy(), 0),
+        'net': (trades['profit'] + trades['commission'] + trades['swap'] + trades['fee']).to_numpy(),
+        'entry_time': np.where(is_entry, trades['time'].to_numpy(), np.iinfo(np.int64).max),
+        'exit_time': np.where(is_entry, 0, trades['time'].to_numpy()),
+        'in_volume': np.where(is_entry, trades['volume'].to_numpy(), 0.0),
+        'out_volume': np.where(is_entry, 0.0, trades['volume'].to_numpy()),
+    })
+
+    positions = frame.groupby('position_id', sort=False).agg(
+        symbol=('symbol', 'first'),
+        magic=('magic', 'max'),
+        net=('net', 'sum'),
+        open_time=('entry_time', 'min'),
+        close_time=('exit_time', 'max'),
+        in_volume=('in_volume', 'sum'),
+        out_volume=('out_volume', 'sum'),
+    )
+
+    # A position is closed once exits cover its entries; positions whose entry
+    # predates the cache start only have exits, so treat those as closed too
+    closed = (positions['close_time'] > 0) & (positions['out_volume'] >= positions['in_volume'] - 1e-9)
+    positions = positions[closed].copy()
+
+    no_entry = positions['open_time'] == np.iinfo(np.int64).max
+    positions.loc[no_entry, 'open_time'] = positions.loc[no_entry, 'close_time']
+    positions['hold_seconds'] = positions['close_time'] - positions['open_time']
+    return positions.drop(columns=['in_volume', 'out_volume'])
+
+
+def _summarize(net, hold_seconds, keys=None):
+    """Vectorized win rate / profit factor / expectancy, overall or per key"""
+    frame = pd.DataFrame({
+        'net': net,
+        'win': net > 0,
+        'loss': net < 0,
+        'gross_profit': net.clip(lower=0),
+        'gross_loss': -net.clip(upper=0),
+        'hold_seconds': hold_seconds,
+    })
+    if keys is None:
+        totals = frame.sum(numeric_only=True).to_frame().T
+        totals['trades'] = len(frame)
+        totals['hold_seconds'] = frame['hold_seconds'].mean() if len(frame) else 0.0
+    else:
+        grouped = frame.groupby(keys)
+        totals = grouped.agg(
+            net=('net', 'sum'), win=('win', 'sum'), loss=('loss', 'sum'),
+            gross_profit=('gross_profit', 'sum'), gross_loss=('gross_loss', 'sum'),
+            hold_seconds=('hold_seconds', 'mean'),
+        )
+        totals['trades'] = grouped.size()
+
+    trades = totals['trades'].astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        summary = pd.DataFrame({
+            'trades': totals['trades'].astype(int),
+            'win_rate': np.where(trades > 0, totals['win'] / trades * 100, 0.0),
+            'net_profit': totals['net'],
+            'profit_factor': np.where(
+                totals['gross_loss'] > 0, totals['gross_profit'] / totals['gross_loss'], np.inf
+            ),
+            'expectancy': np.where(trades > 0, totals['net'] / trades, 0.0),
+            'avg_hold_minutes': totals['hold_seconds'] / 60,
+        }, index=totals.index)
+    return summary
+
+
+def compute_performance(deals):
+    """Compute overall, per-symbol and per-hour performance from cached deals"""
+    trades = build_closed_trades(deals)
+    net = trades['net'].astype(float)
+    hold = trades['hold_seconds'].astype(float)
+
+    overall = _summarize(net, hold).iloc[0].to_dict()
+    by_symbol = _summarize(net, hold, trades['symbol']).sort_values('net_profit', ascending=False)
+
+    close_hours = pd.to_datetime(trades['close_time'], unit='s').dt.hour.rename('hour')
+    by_hour = _summarize(net, hold, close_hours).sort_index()
+
+    return {
+        'overall': overall,
+        'by_symbol': by_symbol,
+        'by_hour': by_hour,
+        'trades': trades,
+    }
@@ -0,0 +1,152 @@
+import MetaTrader5 as mt5
+import json
+import math
+import os
+import threading
+import time
+import numpy as np
+
+# Stages between the stamps taken for every alert
+STAGES = (
+    ('detect', 'trade', 'detected'),   # trade in MT5 -> noticed by a poll
+    ('queue', 'detected', 'queued'),   # noticed -> handed to delivery
+    ('wait', 'queued', 'send'),        # handed to delivery -> send started
+    ('send', 'send', 'ack'),           # send started -> Discord confirmed
+    ('total', 'trade', 'ack'),         # end to end
+)
+
+
+class StreamingHistogram:
+    """Log-bucketed latency histogram with fixed memory.
+
+    Buckets grow by 5% from 1 ms to about 3 hours, so any percentile is
+    accurate to within 5% however many samples are recorded.
+    """
+
+    MIN_MS = 1.0
+    GROWTH = 1.05
+    BUCKETS = 330
+
+    def __init__(self):
+        self.counts = np.zeros(self.BUCKETS + 1, dtype=np.int64)
+        self.total = 0
+        self.max = 0.0
+
+    def record(self, value_ms):
+        value_ms = max(value_ms, 0.0)
+        if value_ms <= self.MIN_MS:
+            bucket = 0
+        else:
+            bucket = min(int(math.log(value_ms / self.MIN_MS, self.GROWTH)) + 1, self.BUCKETS)
+        self.counts[bucket] += 1
+        self.total += 1
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, p):
+        """Return the upper bound of the bucket holding the p-th percentile, in ms"""
+        if self.total == 0:
+            return None
+        rank = max(1, math.ceil(self.total * p / 100))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self.MIN_MS * self.GROWTH ** bucket, self.max)
+
+
+class LatencyTracker:
+    """Per-stage, per-event-type alert latency percentiles"""
+
+    def __init__(self, slo_ms=0):
+        self.slo_ms = slo_ms
+        self.lock = threading.Lock()
+        self.histograms = {}  # (event_type, stage) -> StreamingHistogram
+        self.failures = {}  # event_type -> failed sends
+        self.server_offset = 0.0  # MT5 server time minus local time, seconds
+        self.offset_checked = 0.0
+
+    def update_server_offset(self, symbols, interval=600, attempts=10):
+        """Estimate the trade server's UTC offset from a live tick.
+
+        MT5 timestamps are in server time, which is usually a whole number of
+        half hours away from local time; stale ticks (market closed) are
+        ignored and the next of the candidate symbols (any iterable, consumed
+        lazily and only when an estimate is due) is tried instead.
+        """
+        if time.time() - self.offset_checked < interval:
+            return
+        for _, symbol in zip(range(attempts), symbols):
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                continue
+
+            difference = tick.time_msc / 1000 - time.time()
+            offset = round(difference / 1800) * 1800
+            if abs(difference - offset) < 120:
+                self.server_offset = offset
+                self.offset_checked = time.time()
+                return
+
+    def server_to_local(self, time_msc):
+        """Convert an MT5 millisecond timestamp to a local epoch time"""
+        return time_msc / 1000 - self.server_offset
+
+    def record(self, event_type, stamps):
+        """Record the stage latencies of one delivered alert.
+
+        Returns the end-to-end latency in ms if it breached the SLO, else None.
+        """
+        with self.lock:
+            for stage, start, end in STAGES:
+                if stamps.get(start) is None or stamps.get(end) is None:
+                    continue
+                value_ms = (stamps[end] - stamps[start]) * 1000
+                for key in ((event_type, stage), ('all', stage)):
+                    histogram = self.histograms.get(key)
+                    if histogram is None:
+                        histogram = self.histograms[key] = StreamingHistogram()
+                    histogram.record(value_ms)
+
+        if self.slo_ms and stamps.get('trade') is not None and stamps.get('ack') is not None:
+            total_ms = (stamps['ack'] - stamps['trade']) * 1000
+            if total_ms > self.slo_ms:
+                return total_ms
+        return None
+
+    def record_failure(self, event_type):
+        with self.lock:
+            self.failures[event_type] = self.failures.get(event_type, 0) + 1
+
+    def report(self):
+        """Return percentile rows sorted by event type and stage"""
+        stage_order = {stage: i for i, (stage, _, _) in enumerate(STAGES)}
+        rows = []
+        with self.lock:
+            for (event_type, stage), histogram in self.histograms.items():
+                rows.append({
+                    'event_type': event_type,
+                    'stage': stage,
+                    'count': histogram.total,
+                    'p50': histogram.percentile(50),
+                    'p95': histogram.percentile(95),
+                    'p99': histogram.percentile(99),
+                    'max': histogram.max
+                })
+            failures = dict(self.failures)
+        rows.sort(key=lambda row: (row['event_type'] != 'all', row['event_type'], stage_order[row['stage']]))
+        return rows, failures
+
+    def write_metrics(self, path, jobs=None):
+        """Write the current percentiles (and job stats, if given) to a JSON metrics file"""
+        rows, failures = self.report()
+        metrics = {
+            'time': time.time(),
+            'server_offset': self.server_offset,
+            'latency_ms': rows,
+            'send_failures': failures
+        }
+        if jobs is not None:
+            metrics['jobs'] = jobs
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(metrics, f, indent=4)
+        # Replace in one step so readers never see a half-written file
+        os.replace(temp_path, path)
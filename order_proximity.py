@@ -0,0 +1,142 @@
+import MetaTrader5 as mt5
+import time
+import numpy as np
+
+BUY_TYPES = (mt5.ORDER_TYPE_BUY_LIMIT, mt5.ORDER_TYPE_BUY_STOP, mt5.ORDER_TYPE_BUY_STOP_LIMIT)
+# Orders that trigger when the price falls to them; the rest trigger on a rise
+FALLING_TYPES = (mt5.ORDER_TYPE_BUY_LIMIT, mt5.ORDER_TYPE_SELL_STOP, mt5.ORDER_TYPE_SELL_STOP_LIMIT)
+
+
+class OrderProximityMonitor:
+    """Alerts when pending orders come close to their trigger price.
+
+    Orders are converted to arrays once per poll, each symbol is quoted
+    once per check however many orders it has, and the distance of every
+    order to its trigger is computed in one pass, in pips and in ATR units.
+    An order alerts when it enters the band and re-arms only after moving
+    back out past band * (1 + hysteresis).
+    """
+
+    def __init__(self, band_pips=0, band_atr=0, atr_period=14, atr_timeframe="H1", spec_ttl=300, hysteresis=0.5):
+        self.band_pips = band_pips
+        self.band_atr = band_atr
+        self.atr_period = atr_period
+        self.atr_timeframe = getattr(mt5, f"TIMEFRAME_{atr_timeframe}")
+        self.spec_ttl = spec_ttl
+        self.hysteresis = hysteresis
+
+        self.pip_sizes = {}  # symbol -> (loaded_at, pip size)
+        self.atrs = {}  # symbol -> (loaded_at, ATR in price)
+        self.alerted = set()  # Tickets inside the band
+
+        self._orders_ref = None
+        self._tickets = np.empty(0, dtype=np.int64)
+        self._symbols = []
+        self._symbol_index = np.empty(0, dtype=np.int64)
+        self._is_buy = np.empty(0, dtype=bool)
+        self._falling = np.empty(0, dtype=bool)
+        self._trigger = np.empty(0)
+
+    @property
+    def enabled(self):
+        return bool(self.band_pips or self.band_atr)
+
+    def _rebuild_arrays(self, orders):
+        items = list(orders.values())
+        count = len(items)
+        self._symbols = sorted({order.symbol for order in items})
+        lookup = {symbol: i for i, symbol in enumerate(self._symbols)}
+
+        self._tickets = np.fromiter((order.ticket for order in items), dtype=np.int64, count=count)
+        self._symbol_index = np.fromiter((lookup[order.symbol] for order in items), dtype=np.int64, count=count)
+        self._is_buy = np.fromiter((order.type in BUY_TYPES for order in items), dtype=bool, count=count)
+        self._falling = np.fromiter((order.type in FALLING_TYPES for order in items), dtype=bool, count=count)
+        self._trigger = np.fromiter((order.price_open for order in items), dtype=float, count=count)
+        self._orders_ref = orders
+        # Forget alerts for orders that were filled or cancelled
+        self.alerted &= set(self._tickets.tolist())
+
+    def _pip_size(self, symbol):
+        cached = self.pip_sizes.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.spec_ttl:
+            return cached[1]
+
+        info = mt5.symbol_info(symbol)
+        if info is None:
+            return cached[1] if cached else np.nan
+        # Fractional pricing quotes a tenth of a pip
+        pip = info.point * 10 if info.digits in (3, 5) else info.point
+        self.pip_sizes[symbol] = (time.monotonic(), pip)
+        return pip
+
+    def _atr(self, symbol):
+        cached = self.atrs.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.spec_ttl:
+            return cached[1]
+
+        rates = mt5.copy_rates_from_pos(symbol, self.atr_timeframe, 1, self.atr_period + 1)
+        if rates is None or len(rates) < 2:
+            return cached[1] if cached else np.nan
+
+        previous_close = rates['close'][:-1]
+        high, low = rates['high'][1:], rates['low'][1:]
+        true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+        atr = float(true_range.mean())
+        self.atrs[symbol] = (time.monotonic(), atr)
+        return atr
+
+    def distances(self, orders):
+        """Return (tickets, pips, atr units) to trigger for all orders"""
+        if orders is not self._orders_ref:
+            self._rebuild_arrays(orders)
+
+        count = len(self._symbols)
+        bid = np.full(count, np.nan)
+        ask = np.full(count, np.nan)
+        pip = np.full(count, np.nan)
+        atr = np.full(count, np.nan)
+        for i, symbol in enumerate(self._symbols):
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                continue
+            bid[i], ask[i] = tick.bid, tick.ask
+            pip[i] = self._pip_size(symbol)
+            if self.band_atr:
+                atr[i] = self._atr(symbol)
+
+        idx = self._symbol_index
+        quote = np.where(self._is_buy, ask[idx], bid[idx])
+        # Positive while the order has not been reached
+        distance = np.where(self._falling, quote - self._trigger, self._trigger - quote)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._tickets, distance / pip[idx], distance / atr[idx]
+
+    def check(self, orders):
+        """Return (ticket, pips, atr units) for orders that just entered the band"""
+        if not self.enabled or not orders:
+            return []
+
+        tickets, pips, atr_units = self.distances(orders)
+
+        inside = np.zeros(len(tickets), dtype=bool)
+        outside = np.ones(len(tickets), dtype=bool)
+        if self.band_pips:
+            inside |= pips <= self.band_pips
+            outside &= ~(pips <= self.band_pips * (1 + self.hysteresis))
+        if self.band_atr:
+            inside |= atr_units <= self.band_atr
+            outside &= ~(atr_units <= self.band_atr * (1 + self.hysteresis))
+        # Unquoted orders neither alert nor re-arm
+        quoted = ~np.isnan(pips)
+        inside &= quoted
+        outside &= quoted
+
+        alerted = np.isin(tickets, list(self.alerted)) if self.alerted else np.zeros(len(tickets), dtype=bool)
+        new = inside & ~alerted
+        self.alerted.difference_update(tickets[alerted & outside].tolist())
+        self.alerted.update(tickets[new].tolist())
+
+        return [
+            (int(tickets[i]), float(pips[i]), float(atr_units[i]))
+            for i in np.flatnonzero(new)
+        ]
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+
+
+def alert_key(*parts):
+    """Idempotency key for an alert: the same parts always give the same key"""
+    return hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class NotificationOutbox:
+    """Durable queue of outgoing alerts in SQLite.
+
+    Alerts are written before the first send and marked delivered once
+    Discord acknowledges them, so an outage or a restart only delays them.
+    Each alert carries an idempotency key; adding a key that is already
+    queued or delivered is a no-op, so detecting the same event twice never
+    posts it twice. Order and backoff are kept per channel: a failing alert
+    only holds back later alerts to its own channel, and is retried with
+    exponential backoff. Alerts that can never be delivered (an unknown
+    channel, a rejected request) and alerts that waited too long are
+    dead-lettered rather than retried, and kept until purged.
+    """
+
+    def __init__(self, path, base_delay=5, max_delay=300):
+        self.path = path
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT UNIQUE, channel TEXT, event_type TEXT, "
+            "message TEXT, image BLOB, created REAL, attempts INTEGER DEFAULT 0, "
+            "next_attempt REAL, last_error TEXT, delivered REAL, dead REAL)"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(outbox)")]
+        if 'dead' not in columns:
+            # Databases from before dead-lettering
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN dead REAL")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (delivered, next_attempt)")
+        self.conn.commit()
+
+    def add(self, key, channel, event_type, message, image=None):
+        """Queue an alert; returns its id, or None if the key was already queued.
+
+        The caller usually makes the first attempt, so the drainer leaves it
+        alone for base_delay seconds.
+        """
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, channel, event_type, message, image, created, next_attempt) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, channel, event_type, message, image, now, now + self.base_delay)
+            )
+            self.conn.commit()
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def due(self, limit=20):
+        """Pending alerts of every channel whose oldest alert is due, oldest first.
+
+        A channel whose oldest alert is backing off is skipped entirely, so
+        alerts to it stay in order; other channels are not held up.
+        """
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, channel, event_type, message, image, attempts FROM outbox "
+                "WHERE delivered IS NULL AND dead IS NULL AND channel IN ("
+                "  SELECT channel FROM outbox WHERE next_attempt <= ? AND id IN ("
+                "    SELECT MIN(id) FROM outbox WHERE delivered IS NULL AND dead IS NULL GROUP BY channel))"
+                " ORDER BY id LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+
+    def expire(self, max_age):
+        """Dead-letter alerts still pending after max_age seconds; returns how many"""
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE outbox SET dead = ?, image = NULL, last_error = 'expired' "
+                "WHERE delivered IS NULL AND dead IS NULL AND created < ?",
+                (now, now - max_age)
+            )
+            self.conn.commit()
+            return cursor.rowcount
+
+    def mark_delivered(self, alert_id):
+        with self.lock:
+            self.conn.execute("UPDATE outbox SET delivered = ?, image = NULL WHERE id = ?", (time.time(), alert_id))
+            self.conn.commit()
+
+    def mark_dead(self, alert_id, error=None):
+        """Give up on an alert that can never be delivered"""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE outbox SET dead = ?, image = NULL, last_error = ? WHERE id = ?",
+                (time.time(), str(error)[:500] if error else None, alert_id)
+            )
+            self.conn.commit()
+
+    def mark_failed(self, alert_id, error=None):
+        """Push an alert's next attempt back exponentially, with jitter"""
+        with self.lock:
+            row = self.conn.execute("SELECT attempts FROM outbox WHERE id = ?", (alert_id,)).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            self.conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                (attempts, time.time() + delay, str(error)[:500] if error else None, alert_id)
+            )
+            self.conn.commit()
+
+    def pending_count(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE delivered IS NULL AND dead IS NULL"
+            ).fetchone()[0]
+
+    def pending_channels(self):
+        """Channels that still have alerts waiting"""
+        with self.lock:
+            return {row[0] for row in self.conn.execute(
+                "SELECT DISTINCT channel FROM outbox WHERE delivered IS NULL AND dead IS NULL"
+            )}
+
+    def purge(self, max_age_days):
+        """Forget delivered and dead alerts older than max_age_days; their keys stop deduplicating"""
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM outbox WHERE COALESCE(delivered, dead) < ?",
+                (time.time() - max_age_days * 86400,)
+            )
+            self.conn.commit()
+
+    def checkpoint(self):
+        """Copy the write-ahead log into the database and truncate it"""
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
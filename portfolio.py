@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class PortfolioAggregator:
+    """Aggregates per-position profit histories into portfolio P&L series.
+
+    Each position's samples are turned into profit changes (and a final
+    change back to zero when it closes), and the changes are summed into
+    fixed time buckets per group with one np.add.at call per update. The
+    portfolio value at any bucket is then a cumulative sum, so only newly
+    arrived samples are processed and earlier buckets stay cached.
+    """
+
+    DIMENSIONS = ('total', 'symbol', 'magic')
+
+    def __init__(self, bucket_seconds=5):
+        self.bucket = bucket_seconds
+        self.origin = None  # Bucket number of the first grid point
+        self.length = 0  # Allocated buckets
+        self.used = 0  # Buckets up to the latest sample
+        self.groups = {}  # (dimension, label) -> per-bucket profit changes
+        self.folded = {}  # ticket -> (samples folded, last profit, close folded)
+
+    def _bucket_numbers(self, timestamps):
+        return np.floor(np.asarray(timestamps) / self.bucket).astype(np.int64)
+
+    def _ensure_grid(self, first, last):
+        """Grow every group's bucket array to cover [first, last]"""
+        if self.origin is None:
+            self.origin = first
+        if first < self.origin:
+            pad = self.origin - first
+            for key in self.groups:
+                self.groups[key] = np.concatenate((np.zeros(pad), self.groups[key]))
+            self.length += pad
+            self.origin = first
+        needed = last - self.origin + 1
+        if needed > self.length:
+            # Grow geometrically so appending live samples stays amortized O(1)
+            new_length = max(needed, int(self.length * 1.5) + 64)
+            for key in self.groups:
+                self.groups[key] = np.concatenate((self.groups[key], np.zeros(new_length - self.length)))
+            self.length = new_length
+        self.used = max(self.used, needed)
+
+    def update(self, history):
+        """Fold samples that arrived since the last update into the bucket sums"""
+        times, deltas, symbols, magics = [], [], [], []
+
+        for ticket, entry in list(history.items()):
+            samples = entry['profit_history']
+            done, last, close_folded = self.folded.get(ticket, (0, 0.0, False))
+            count = len(samples)
+
+            if count > done:
+                new = samples[done:count]
+                sample_times = [sample[0].timestamp() for sample in new]
+                profits = np.fromiter((sample[1] for sample in new), dtype=float, count=len(new))
+                changes = np.diff(profits, prepend=last)
+                times.append(sample_times)
+                deltas.append(changes)
+                symbols.append([entry['symbol']] * len(new))
+                magics.append([entry.get('magic', 0)] * len(new))
+                last = profits[-1]
+
+            close_time = entry.get('close_time')
+            if close_time is not None and not close_folded:
+                # A closed position stops contributing floating P&L
+                times.append([close_time.timestamp()])
+                deltas.append(np.array([-last]))
+                symbols.append([entry['symbol']])
+                magics.append([entry.get('magic', 0)])
+                close_folded = True
+
+            self.folded[ticket] = (count, last, close_folded)
+
+        if not times:
+            return False
+
+        buckets = self._bucket_numbers(np.concatenate([np.asarray(t, dtype=float) for t in times]))
+        changes = np.concatenate(deltas)
+        symbols = np.concatenate([np.asarray(s, dtype=object) for s in symbols])
+        magics = np.concatenate([np.asarray(m, dtype=np.int64) for m in magics])
+
+        self._ensure_grid(int(buckets.min()), int(buckets.max()))
+        offsets = buckets - self.origin
+
+        self._accumulate(('total', 'All'), offsets, changes)
+        for dimension, labels in (('symbol', symbols), ('magic', magics)):
+            unique, codes = np.unique(labels, return_inverse=True)
+            for code, label in enumerate(unique):
+                mask = codes == code
+                self._accumulate((dimension, label.item() if hasattr(label, 'item') else label),
+                                 offsets[mask], changes[mask])
+        return True
+
+    def is_settled(self, ticket):
+        """True once a ticket's close has been folded in (or it never was seen)"""
+        folded = self.folded.get(ticket)
+        return folded is None or folded[2]
+
+    def forget(self, tickets):
+        """Drop bookkeeping for tickets removed from the history"""
+        for ticket in tickets:
+            self.folded.pop(ticket, None)
+
+    def _accumulate(self, key, offsets, changes):
+        sums = self.groups.get(key)
+        if sums is None:
+            sums = self.groups[key] = np.zeros(self.length)
+        np.add.at(sums, offsets, changes)
+
+    def series(self, dimension='total', end_time=None, max_points=2000):
+        """Return (bucket times, {label: P&L values}) for one dimension.
+
+        Values are portfolio levels at the end of each bucket; long ranges are
+        thinned to at most max_points points by sampling those levels.
+        """
+        if self.origin is None:
+            return np.array([]), {}
+
+        used = self.used
+        if end_time is not None:
+            used = max(used, int(np.floor(end_time / self.bucket)) - self.origin + 1)
+            self._ensure_grid(self.origin, self.origin + used - 1)
+
+        step = max(1, int(np.ceil(used / max_points)))
+        index = np.arange(step - 1, used, step)
+        if index.size == 0 or index[-1] != used - 1:
+            index = np.append(index, used - 1)
+
+        times = (self.origin + index + 1) * self.bucket
+        values = {
+            label: np.cumsum(sums[:used])[index]
+            for (dim, label), sums in self.groups.items()
+            if dim == dimension
+        }
+        return times, values
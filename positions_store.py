@@ -0,0 +1,186 @@
+import bisect
+import threading
+import numpy as np
+
+# Column name -> dtype; object columns hold strings
+COLUMNS = {
+    'ticket': np.int64,
+    'symbol': object,
+    'type': object,
+    'volume': float,
+    'price_open': float,
+    'price_current': float,
+    'sl': float,
+    'tp': float,
+    'profit': float,
+    'swap': float,
+    'magic': np.int64,
+    'comment': object,
+    'time': np.int64,
+}
+
+# Columns with a secondary index (value -> set of slots)
+INDEXED = ('symbol', 'magic', 'type')
+
+
+class PositionStore:
+    """Open positions held column by column and kept current from snapshot diffs.
+
+    Each position occupies one slot across the column arrays; slots of
+    closed positions are reused. Symbol, magic and type have hash indexes
+    and open time a sorted index, so filters touch only matching slots and
+    sort, filter and group queries run as NumPy operations instead of
+    rebuilding a DataFrame per request.
+    """
+
+    def __init__(self, capacity=64):
+        self.lock = threading.Lock()
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.slots = {}  # ticket -> slot
+        self.free = list(range(capacity - 1, -1, -1))
+        self.indexes = {name: {} for name in INDEXED}
+        self.by_time = []  # Sorted (open time, ticket)
+        self.generation = 0
+
+    def _grow(self):
+        capacity = len(self.columns['ticket'])
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity * 2, dtype=column.dtype)
+            grown[:capacity] = column
+            self.columns[name] = grown
+        self.free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def _unindex(self, ticket, slot):
+        for name in INDEXED:
+            value = self.columns[name][slot]
+            members = self.indexes[name].get(value)
+            if members is not None:
+                members.discard(slot)
+                if not members:
+                    del self.indexes[name][value]
+        key = (int(self.columns['time'][slot]), ticket)
+        i = bisect.bisect_left(self.by_time, key)
+        if i < len(self.by_time) and self.by_time[i] == key:
+            del self.by_time[i]
+
+    def _remove(self, ticket):
+        slot = self.slots.pop(ticket, None)
+        if slot is not None:
+            self._unindex(ticket, slot)
+            self.free.append(slot)
+
+    def _upsert(self, ticket, row):
+        slot = self.slots.get(ticket)
+        if slot is None:
+            if not self.free:
+                self._grow()
+            slot = self.slots[ticket] = self.free.pop()
+        else:
+            self._unindex(ticket, slot)
+
+        for name, column in self.columns.items():
+            column[slot] = row[name]
+        for name in INDEXED:
+            self.indexes[name].setdefault(row[name], set()).add(slot)
+        bisect.insort(self.by_time, (int(row['time']), ticket))
+
+    def publish(self, generation, snapshot, diff, events):
+        """Apply a snapshot diff; called by the tracker after every poll"""
+        with self.lock:
+            self.generation = generation
+            if diff is None:
+                return
+            positions = diff['positions']
+            for ticket in positions['remove']:
+                self._remove(ticket)
+            for ticket, row in positions['upsert'].items():
+                self._upsert(ticket, row)
+
+    def _select(self, where):
+        """Slots matching where = {column: value or list of values}"""
+        if not where:
+            return np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+
+        selected = None
+        for name, wanted in where.items():
+            values = wanted if isinstance(wanted, (list, tuple, set)) else (wanted,)
+            if name in self.indexes:
+                matches = set()
+                for value in values:
+                    matches |= self.indexes[name].get(value, set())
+            else:
+                candidates = selected if selected is not None else set(self.slots.values())
+                column = self.columns[name]
+                matches = {slot for slot in candidates if column[slot] in values}
+            selected = matches if selected is None else selected & matches
+            if not selected:
+                break
+        return np.fromiter(selected, dtype=np.int64, count=len(selected))
+
+    def _rows(self, slots):
+        columns = {name: column[slots].tolist() for name, column in self.columns.items()}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def query(self, where=None, sort='time', descending=False, limit=None):
+        """Return matching positions as row dicts, ordered by one column"""
+        with self.lock:
+            if sort == 'time' and not where:
+                slots = np.array([self.slots[ticket] for _, ticket in self.by_time], dtype=np.int64)
+            else:
+                slots = self._select(where)
+                if sort:
+                    keys = self.columns[sort][slots]
+                    if keys.dtype == object:
+                        keys = keys.astype(str)
+                    # Ticket order breaks ties so equal keys do not shuffle between refreshes
+                    order = np.lexsort((self.columns['ticket'][slots], keys))
+                    slots = slots[order]
+            if descending:
+                slots = slots[::-1]
+            if limit is not None:
+                slots = slots[:limit]
+            return self._rows(slots)
+
+    def tickets(self, where=None, sort='time', descending=False):
+        """Like query, but return only the ticket order"""
+        return [row['ticket'] for row in self.query(where, sort, descending)]
+
+    def group(self, by, where=None):
+        """Count, volume, profit and swap per value of one column, largest |profit| first"""
+        with self.lock:
+            slots = self._select(where)
+            if not len(slots):
+                return []
+            keys = self.columns[by][slots]
+            values, inverse = np.unique(keys.astype(str) if keys.dtype == object else keys, return_inverse=True)
+            count = np.bincount(inverse)
+            volume = np.bincount(inverse, weights=self.columns['volume'][slots])
+            profit = np.bincount(inverse, weights=self.columns['profit'][slots])
+            swap = np.bincount(inverse, weights=self.columns['swap'][slots])
+
+        groups = [
+            {by: values[i].item(), 'count': int(count[i]), 'volume': float(volume[i]),
+             'profit': float(profit[i]), 'swap': float(swap[i])}
+            for i in range(len(values))
+        ]
+        groups.sort(key=lambda group: -abs(group['profit']))
+        return groups
+
+    def values(self, column):
+        """Distinct values of an indexed column"""
+        with self.lock:
+            return sorted(self.indexes[column])
+
+    def totals(self):
+        """Open count and summed volume, profit and swap"""
+        with self.lock:
+            slots = np.fromiter(self.slots.values(), dtype=np.int64, count=len(self.slots))
+            return {
+                'count': len(slots),
+                'volume': float(self.columns['volume'][slots].sum()),
+                'profit': float(self.columns['profit'][slots].sum()),
+                'swap': float(self.columns['swap'][slots].sum()),
+            }
+
+    def __len__(self):
+        return len(self.slots)
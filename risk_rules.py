@@ -0,0 +1,179 @@
+import MetaTrader5 as mt5
+import numpy as np
+
+# Rule type -> (scope, direction). Values are compared against the threshold
+# in the given direction; account rules yield one value, position rules one per
+# ticket and symbol rules one per symbol.
+RULE_TYPES = {
+    'margin_level_below': ('account', 'below'),
+    'drawdown_above': ('account', 'above'),
+    'position_loss_above': ('position', 'above'),
+    'symbol_volume_above': ('symbol', 'above'),
+}
+
+RULE_LABELS = {
+    'margin_level_below': "Margin level",
+    'drawdown_above': "Equity drawdown %",
+    'position_loss_above': "Position loss",
+    'symbol_volume_above': "Symbol volume (lots)",
+}
+
+
+class RiskRule:
+    """One compiled threshold rule and the keys currently in breach"""
+
+    def __init__(self, definition, index):
+        self.type = definition['type']
+        if self.type not in RULE_TYPES:
+            raise ValueError(f"Unknown risk rule type: {self.type}")
+        self.scope, self.direction = RULE_TYPES[self.type]
+        self.name = definition.get('name') or f"{self.type}_{index}"
+        self.threshold = float(definition['threshold'])
+        self.net = bool(definition.get('net', False))
+
+        # The rule clears only once the value is back past the clear level
+        clear = definition.get('clear')
+        if clear is None:
+            hysteresis = abs(self.threshold) * float(definition.get('hysteresis', 0.1))
+            clear = self.threshold + hysteresis if self.direction == 'below' else self.threshold - hysteresis
+        self.clear = float(clear)
+
+        self.active = np.array([])
+
+    def signature(self):
+        return (self.type, self.threshold, self.clear, self.net)
+
+    def step(self, keys, values):
+        """Advance the breach state; return (triggered mask, cleared keys)"""
+        if self.direction == 'above':
+            breach = values > self.threshold
+            holding = values > self.clear
+        else:
+            breach = values < self.threshold
+            holding = values < self.clear
+
+        was_active = np.isin(keys, self.active) if self.active.size else np.zeros(len(keys), dtype=bool)
+        now_active = breach | (was_active & holding)
+        triggered = now_active & ~was_active
+        # Keys that vanished (closed positions) are dropped without a clear alert
+        cleared = keys[was_active & ~now_active]
+
+        self.active = keys[now_active]
+        return triggered, cleared
+
+
+class RiskEngine:
+    """Evaluates risk threshold rules against each polled snapshot.
+
+    Rules come from the "risk_rules" config list, for example
+    {"type": "position_loss_above", "threshold": 500}. Each rule has a clear
+    level ("clear", or "hysteresis" as a fraction of the threshold, 10% by
+    default) so a value hovering around the threshold alerts once.
+
+    Position data is turned into arrays once per evaluation and every rule
+    is a mask over them, so the cost barely grows with the number of
+    positions or rules.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = []
+        self.peak_equity = None
+        self.compile(rules or [])
+
+    def compile(self, rules):
+        """Build rules from definitions, keeping the state of unchanged ones"""
+        previous = {rule.name: rule for rule in self.rules}
+        compiled = []
+        for index, definition in enumerate(rules):
+            rule = RiskRule(definition, index)
+            old = previous.get(rule.name)
+            if old is not None and old.signature() == rule.signature():
+                rule.active = old.active
+            compiled.append(rule)
+        self.rules = compiled
+
+    def _position_arrays(self, positions):
+        items = list(positions.values())
+        count = len(items)
+        return {
+            'tickets': np.fromiter((p.ticket for p in items), dtype=np.int64, count=count),
+            'symbols': np.array([p.symbol for p in items], dtype=str),
+            'magics': np.fromiter((p.magic for p in items), dtype=np.int64, count=count),
+            'profit': np.fromiter((p.profit + p.swap for p in items), dtype=float, count=count),
+            'volume': np.fromiter((p.volume for p in items), dtype=float, count=count),
+            # +1 for buys, -1 for sells
+            'sign': np.fromiter(
+                (1.0 if p.type == mt5.POSITION_TYPE_BUY else -1.0 for p in items), dtype=float, count=count
+            ),
+        }
+
+    def evaluate(self, account, positions):
+        """Return alert dicts for rules that triggered or cleared on this snapshot"""
+        if not self.rules:
+            return []
+
+        if account and account.get('equity') is not None:
+            self.peak_equity = max(self.peak_equity or account['equity'], account['equity'])
+
+        arrays = None
+        symbol_groups = None
+        alerts = []
+
+        for rule in self.rules:
+            if rule.scope == 'account':
+                if not account:
+                    continue
+                if rule.type == 'margin_level_below':
+                    # MT5 reports 0 when no margin is in use
+                    if not account.get('margin'):
+                        continue
+                    value = account['margin_level']
+                else:
+                    if not self.peak_equity:
+                        continue
+                    value = (self.peak_equity - account['equity']) / self.peak_equity * 100
+                keys = np.array(['account'])
+                values = np.array([value], dtype=float)
+            else:
+                if arrays is None:
+                    arrays = self._position_arrays(positions)
+                if rule.scope == 'position':
+                    keys = arrays['tickets']
+                    values = -arrays['profit']
+                else:
+                    if symbol_groups is None:
+                        symbol_groups = np.unique(arrays['symbols'], return_inverse=True)
+                    keys, inverse = symbol_groups
+                    weights = arrays['volume'] * arrays['sign'] if rule.net else arrays['volume']
+                    values = np.abs(np.bincount(inverse, weights=weights, minlength=len(keys)))
+
+            triggered, cleared = rule.step(keys, values)
+
+            for i in np.flatnonzero(triggered):
+                alerts.append(self._alert(rule, 'triggered', keys[i], values[i], arrays))
+            for key in cleared:
+                value = values[keys == key][0]
+                alerts.append(self._alert(rule, 'cleared', key, value, arrays))
+
+        return alerts
+
+    def _alert(self, rule, state, key, value, arrays):
+        alert = {
+            'rule': rule.name,
+            'type': rule.type,
+            'label': RULE_LABELS[rule.type],
+            'state': state,
+            'value': float(value),
+            'threshold': rule.threshold if state == 'triggered' else rule.clear,
+            'symbol': None,
+            'magic': None,
+            'ticket': None,
+        }
+        if rule.scope == 'symbol':
+            alert['symbol'] = str(key)
+        elif rule.scope == 'position':
+            index = int(np.flatnonzero(arrays['tickets'] == key)[0])
+            alert['ticket'] = int(key)
+            alert['symbol'] = str(arrays['symbols'][index])
+            alert['magic'] = int(arrays['magics'][index])
+        return alert
@@ -0,0 +1,330 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6),  # 0 = Sunday, as in cron
+)
+
+
+def _parse_cron_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/', 1)
+            step = int(step)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Cron field out of range: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """Five-field cron expression ("minute hour day month weekday") in local time"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression}")
+        self.expression = expression
+        parsed = [_parse_cron_field(text, low, high) for text, (_, low, high) in zip(fields, CRON_FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Python counts weekdays from Monday
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = moment.weekday() in self.weekdays
+        # As in cron, a restricted day and weekday match if either does
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, timestamp):
+        """Return the first matching time strictly after timestamp"""
+        moment = datetime.fromtimestamp(timestamp).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while moment < limit:
+            if moment.month not in self.months:
+                moment = (moment.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+
+class IntervalSchedule:
+    """Run every N seconds"""
+
+    def __init__(self, seconds):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+        self.expression = f"every {seconds}s"
+
+    def next_after(self, timestamp):
+        return timestamp + self.seconds
+
+
+def parse_schedule(value):
+    """Build a schedule from a number of seconds or a cron expression"""
+    if isinstance(value, (int, float)):
+        return IntervalSchedule(value)
+    return CronSchedule(value)
+
+
+class JobStats:
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.missed = 0  # Due times passed without a run (coalesced or skipped)
+        self.overlapped = 0  # Due while the previous run was still going
+        self.last_runtime = None
+        self.total_runtime = 0.0
+        self.max_runtime = 0.0
+        self.last_run = None
+        self.last_error = None
+
+
+class Job:
+    def __init__(self, name, func, schedule, loop=None, misfire='coalesce', grace=None):
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.loop = loop  # Callable returning the event loop coroutine jobs run on
+        self.misfire = misfire
+        self.grace = grace
+        self.stats = JobStats()
+        self.next_run = None
+        self.running = None  # Future of the run in progress
+        self.cancelled = False
+
+
+class Scheduler:
+    """Timer wheel that owns the tracker's recurring jobs.
+
+    Jobs are placed in a slot of a fixed wheel of ticks; a job due further
+    out than one revolution carries a round count, so each tick only looks
+    at the jobs in one slot no matter how many are scheduled. Due jobs run on
+    a thread pool, or on an event loop for coroutine functions, and a job
+    never overlaps itself.
+
+    A job that finds itself late by more than its grace period (two ticks by
+    default) counts the missed runs; "coalesce" jobs run once to catch up,
+    "skip" jobs wait for their next due time.
+    """
+
+    def __init__(self, tick=0.25, slots=512, workers=4):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]  # [rounds, job] entries
+        self.cursor = 0
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler")
+        self.running = False
+        self.thread = None
+        self.started_at = None
+
+    def add_job(self, name, func, schedule, loop=None, misfire='coalesce', grace=None, run_now=False):
+        """Add or replace a recurring job; schedule is seconds or a cron expression"""
+        job = Job(name, func, parse_schedule(schedule), loop, misfire, grace)
+        with self.lock:
+            old = self.jobs.get(name)
+            if old:
+                old.cancelled = True
+                job.stats = old.stats
+            self.jobs[name] = job
+            now = time.time()
+            self._place(job, now if run_now else job.schedule.next_after(now), now)
+
+    def remove_job(self, name):
+        with self.lock:
+            job = self.jobs.pop(name, None)
+            if job:
+                job.cancelled = True
+
+    def restart(self, name):
+        """Abandon a job's run in progress (e.g. a hung poll) and run it again now"""
+        with self.lock:
+            job = self.jobs.get(name)
+            if job is None:
+                return
+            if job.running:
+                job.running.cancel()
+                job.running = None
+        self._dispatch(job)
+
+    def _place(self, job, when, now):
+        """Put a job in the slot for its due time"""
+        job.next_run = when
+        ticks = max(1, math.ceil((when - now) / self.tick))
+        rounds, offset = divmod(ticks - 1, len(self.slots))
+        self.slots[(self.cursor + 1 + offset) % len(self.slots)].append([rounds, job])
+
+    def start(self):
+        """Start turning the wheel in a background thread"""
+        if self.running:
+            return
+        self.running = True
+        self.started_at = time.time()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.executor.shutdown(wait=False)
+
+    def _run(self):
+        next_tick = time.monotonic() + self.tick
+        clock_offset = time.time() - time.monotonic()
+        while self.running:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+            # The wheel counts ticks, so after a wall clock change, a suspend or
+            # a stall longer than a revolution, re-place jobs by their due times
+            offset = time.time() - time.monotonic()
+            if abs(offset - clock_offset) > 1.0 or -delay > self.tick * len(self.slots):
+                clock_offset = offset
+                next_tick = time.monotonic()
+                self._rebuild()
+
+            next_tick += self.tick
+            self._advance()
+
+    def _rebuild(self):
+        with self.lock:
+            self.slots = [[] for _ in self.slots]
+            now = time.time()
+            for job in self.jobs.values():
+                self._place(job, job.next_run, now)
+
+    def _advance(self):
+        due = []
+        with self.lock:
+            self.cursor = (self.cursor + 1) % len(self.slots)
+            slot = self.slots[self.cursor]
+            waiting = []
+            for entry in slot:
+                rounds, job = entry
+                if job.cancelled:
+                    continue
+                if rounds > 0:
+                    entry[0] -= 1
+                    waiting.append(entry)
+                else:
+                    due.append(job)
+            self.slots[self.cursor] = waiting
+
+        now = time.time()
+        for job in due:
+            if now < job.next_run - self.tick:
+                # The wall clock moved back; wait for the real due time
+                with self.lock:
+                    self._place(job, job.next_run, now)
+                continue
+            self._fire(job, now)
+
+    def _fire(self, job, now):
+        """Run a due job and schedule its next run, accounting for missed runs"""
+        due = job.next_run
+        next_run = job.schedule.next_after(due)
+        missed = 0
+        while next_run <= now:
+            missed += 1
+            next_run = job.schedule.next_after(next_run)
+
+        grace = job.grace if job.grace is not None else self.tick * 2
+        late = now - due > grace
+        if late or missed:
+            job.stats.missed += missed + (1 if late and job.misfire == 'skip' else 0)
+
+        with self.lock:
+            if job.cancelled:
+                return
+            self._place(job, next_run, now)
+
+        if late and job.misfire == 'skip':
+            return
+        self._dispatch(job)
+
+    def _dispatch(self, job):
+        with self.lock:
+            if job.running is not None and not job.running.done():
+                job.stats.overlapped += 1
+                return
+            job.running = self.executor.submit(self._execute, job)
+
+    def _execute(self, job):
+        is_coroutine = asyncio.iscoroutinefunction(job.func)
+        loop = job.loop() if is_coroutine and job.loop else None
+        if is_coroutine and loop is None:
+            # Nothing to run on yet (e.g. Discord not connected)
+            return
+
+        started = time.perf_counter()
+        job.stats.last_run = time.time()
+        try:
+            if is_coroutine:
+                future = asyncio.run_coroutine_threadsafe(job.func(), loop)
+                with self.lock:
+                    job.running = future
+                future.result()
+            else:
+                job.func()
+        except Exception as e:
+            job.stats.failures += 1
+            job.stats.last_error = str(e)
+            print(f"Error in scheduled job {job.name}: {e}")
+        finally:
+            runtime = time.perf_counter() - started
+            stats = job.stats
+            stats.runs += 1
+            stats.last_runtime = runtime
+            stats.total_runtime += runtime
+            stats.max_runtime = max(stats.max_runtime, runtime)
+
+    def report(self):
+        """Return per-job runtime statistics"""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [
+            {
+                'job': job.name,
+                'schedule': job.schedule.expression,
+                'runs': job.stats.runs,
+                'failures': job.stats.failures,
+                'missed': job.stats.missed,
+                'overlapped': job.stats.overlapped,
+                'last_ms': None if job.stats.last_runtime is None else job.stats.last_runtime * 1000,
+                'avg_ms': job.stats.total_runtime / job.stats.runs * 1000 if job.stats.runs else None,
+                'max_ms': job.stats.max_runtime * 1000,
+                'next_run': job.next_run,
+                'last_error': job.stats.last_error,
+            }
+            for job in jobs
+        ]
@@ -0,0 +1,174 @@
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+ACCOUNT_FIELDS = ('balance', 'equity', 'profit', 'margin', 'margin_level', 'margin_free')
+
+POSITION_DTYPE = np.dtype([
+    ('ticket', np.int64),
+    ('symbol', 'S32'),
+    ('buy', np.bool_),
+    ('volume', np.float64),
+    ('price_open', np.float64),
+    ('price_current', np.float64),
+    ('sl', np.float64),
+    ('tp', np.float64),
+    ('profit', np.float64),
+    ('swap', np.float64),
+    ('magic', np.int64),
+    ('time', np.int64),
+])
+
+# Header slots
+SEQUENCE, GENERATION, COUNT, TOTAL, HISTORY_HEAD, HISTORY_COUNT, WRITTEN_AT = range(7)
+HEADER_SIZE = 8
+
+
+def _layout(capacity, history):
+    """Byte offsets of the header, account, positions and equity history"""
+    account = HEADER_SIZE * 8
+    positions = account + len(ACCOUNT_FIELDS) * 8
+    equity = positions + capacity * POSITION_DTYPE.itemsize
+    size = equity + history * 2 * 8
+    return account, positions, equity, size
+
+
+class _SharedArrays:
+    def __init__(self, memory, capacity, history):
+        account, positions, equity, _ = _layout(capacity, history)
+        self.memory = memory
+        self.capacity = capacity
+        self.history = history
+        self.header = np.ndarray(HEADER_SIZE, dtype=np.int64, buffer=memory.buf)
+        self.account = np.ndarray(len(ACCOUNT_FIELDS), dtype=np.float64, buffer=memory.buf, offset=account)
+        self.positions = np.ndarray(capacity, dtype=POSITION_DTYPE, buffer=memory.buf, offset=positions)
+        self.equity = np.ndarray((history, 2), dtype=np.float64, buffer=memory.buf, offset=equity)
+
+    def _release(self):
+        # Views must go before the mapping can be closed
+        self.header = self.account = self.positions = self.equity = None
+        self.memory.close()
+
+
+class SharedStateWriter(_SharedArrays):
+    """Publishes account, positions and an equity history into shared memory.
+
+    The writer subscribes to snapshots like the dashboard does. Every write
+    is bracketed by a seqlock: the sequence is odd while the block is being
+    written and even once it is consistent, so a reader in another process
+    can copy without a lock and retry if it raced with a write.
+    """
+
+    def __init__(self, capacity=4096, history=20000):
+        _, _, _, size = _layout(capacity, history)
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        super().__init__(memory, capacity, history)
+        self.header[:] = 0
+        self.name = memory.name
+
+    def publish(self, generation, snapshot, diff, events):
+        """Copy the latest snapshot into shared memory; called after every poll"""
+        positions = sorted(snapshot['positions'].values(), key=lambda p: p['time'])
+        rows = np.array([
+            (p['ticket'], p['symbol'].encode()[:32], p['type'] == 'Buy', p['volume'], p['price_open'],
+             p['price_current'], p['sl'], p['tp'], p['profit'], p['swap'], p['magic'], p['time'])
+            for p in positions[:self.capacity]
+        ], dtype=POSITION_DTYPE)
+        account = snapshot['account']
+
+        header = self.header
+        header[SEQUENCE] += 1
+        try:
+            self.positions[:len(rows)] = rows
+            header[COUNT] = len(rows)
+            header[TOTAL] = len(positions)
+            if account:
+                self.account[:] = [account[field] for field in ACCOUNT_FIELDS]
+                head = header[HISTORY_HEAD]
+                self.equity[head] = (time.time(), account['equity'])
+                header[HISTORY_HEAD] = (head + 1) % self.history
+                header[HISTORY_COUNT] = min(header[HISTORY_COUNT] + 1, self.history)
+            header[GENERATION] = generation
+            header[WRITTEN_AT] = time.time_ns()
+        finally:
+            header[SEQUENCE] += 1
+
+    def close(self):
+        self._release()
+        try:
+            shared_memory.SharedMemory(name=self.name).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedStateReader(_SharedArrays):
+    """Reads consistent copies of the writer's block from another process"""
+
+    def __init__(self, name, capacity=4096, history=20000):
+        super().__init__(shared_memory.SharedMemory(name=name), capacity, history)
+        self.generation = 0  # Nothing published yet
+
+    def read(self, retries=100):
+        """Return a consistent state dict, or None if nothing new since the last read"""
+        for _ in range(retries):
+            start = int(self.header[SEQUENCE])
+            if start % 2:
+                time.sleep(0.001)
+                continue
+            if int(self.header[GENERATION]) == self.generation:
+                return None
+
+            count = int(self.header[COUNT])
+            head, filled = int(self.header[HISTORY_HEAD]), int(self.header[HISTORY_COUNT])
+            positions = self.positions[:count].copy()
+            account = self.account.copy()
+            equity = np.roll(self.equity, -head, axis=0)[-filled:] if filled == self.history else self.equity[:filled].copy()
+            state = {
+                'generation': int(self.header[GENERATION]),
+                'total': int(self.header[TOTAL]),
+                'written_at': int(self.header[WRITTEN_AT]) / 1e9,
+            }
+
+            if int(self.header[SEQUENCE]) == start:
+                state['positions'] = positions
+                state['account'] = dict(zip(ACCOUNT_FIELDS, account.tolist()))
+                state['equity'] = equity
+                self.generation = state['generation']
+                return state
+        return None
+
+    def close(self):
+        self._release()
+
+
+class GuiBridge:
+    """Stands in for the GUI inside the core process when the GUI runs separately.
+
+    Log lines, status text and button state go to the GUI process over its
+    event queue (log lines are also written to the activity log file here);
+    tables and charts are read from shared memory instead, so the refresh
+    calls are no-ops.
+    """
+
+    def __init__(self, events, activity_log):
+        self.events = events
+        self.activity_log = activity_log
+
+    def log_message(self, message, is_error=False):
+        timestamp, message, is_error = self.activity_log.add(message, is_error)
+        self.events.put(('log', timestamp, message, is_error))
+
+    def update_status(self, message):
+        self.events.put(('status', message))
+
+    def update_tracking_buttons(self, is_tracking):
+        self.events.put(('tracking', is_tracking))
+
+    def post_account_info(self, account_info):
+        pass
+
+    def update_positions_table(self):
+        pass
+
+    def update_profit_chart(self, position_id):
+        pass
@@ -0,0 +1,83 @@
+import MetaTrader5 as mt5
+
+# Pending order type names, indexed by mt5 ORDER_TYPE_* value
+ORDER_TYPE_NAMES = (
+    'Buy', 'Sell', 'Buy Limit', 'Sell Limit', 'Buy Stop', 'Sell Stop',
+    'Buy Stop Limit', 'Sell Stop Limit', 'Close By'
+)
+
+
+def position_to_dict(position):
+    """Convert an MT5 position into a JSON-friendly dict"""
+    return {
+        'ticket': position.ticket,
+        'symbol': position.symbol,
+        'type': 'Buy' if position.type == mt5.POSITION_TYPE_BUY else 'Sell',
+        'volume': position.volume,
+        'price_open': position.price_open,
+        'price_current': position.price_current,
+        'sl': position.sl,
+        'tp': position.tp,
+        'profit': position.profit,
+        'swap': position.swap,
+        'magic': position.magic,
+        'comment': position.comment,
+        'time': position.time
+    }
+
+
+def order_to_dict(order):
+    """Convert an MT5 pending order into a JSON-friendly dict"""
+    type_name = ORDER_TYPE_NAMES[order.type] if order.type < len(ORDER_TYPE_NAMES) else str(order.type)
+    return {
+        'ticket': order.ticket,
+        'symbol': order.symbol,
+        'type': type_name,
+        'volume': order.volume_current,
+        'price_open': order.price_open,
+        'sl': order.sl,
+        'tp': order.tp,
+        'magic': order.magic,
+        'comment': order.comment,
+        'time_setup': order.time_setup
+    }
+
+
+def build_snapshot(account_login, account, orders, positions):
+    """Build a full snapshot from the tracker's current state"""
+    return {
+        'account_login': account_login,
+        'account': dict(account) if account else {},
+        'orders': {ticket: order_to_dict(order) for ticket, order in orders.items()},
+        'positions': {ticket: position_to_dict(position) for ticket, position in positions.items()}
+    }
+
+
+def _diff_table(previous, current):
+    upsert = {
+        key: row for key, row in current.items()
+        if previous.get(key) != row
+    }
+    remove = [key for key in previous if key not in current]
+    return upsert, remove
+
+
+def diff_snapshots(previous, current):
+    """Return only what changed between two snapshots, or None if nothing did"""
+    previous = previous or {'account': {}, 'orders': {}, 'positions': {}}
+
+    positions_upsert, positions_remove = _diff_table(previous['positions'], current['positions'])
+    orders_upsert, orders_remove = _diff_table(previous['orders'], current['orders'])
+    account = {
+        key: value for key, value in current['account'].items()
+        if previous['account'].get(key) != value
+    }
+
+    if not (positions_upsert or positions_remove or orders_upsert or orders_remove or account):
+        return None
+
+    return {
+        'positions': {'upsert': positions_upsert, 'remove': positions_remove},
+        'orders': {'upsert': orders_upsert, 'remove': orders_remove},
+        'account': account
+    }
@@ -0,0 +1,126 @@
+import threading
+from datetime import datetime
+from bot_commands import CLOSE_EVENTS
+
+
+class StrategyStats:
+    """Live per-strategy aggregates, keyed by magic number.
+
+    The tracker publishes snapshot diffs here; each changed position only
+    moves its own contribution between strategies, so open count, lots,
+    floating and realized P&L and drawdown stay current without a full
+    recompute. A strategy's curve is its realized plus floating P&L since
+    the tracker started, and drawdown is measured from that curve's peak.
+    """
+
+    def __init__(self, names=None):
+        self.lock = threading.Lock()
+        self.names = {}
+        self.set_names(names or {})
+        self.contributions = {}  # ticket -> (magic, signed lots, gross lots, floating)
+        self.strategies = {}  # magic -> aggregate dict
+        self.today = datetime.now().date()
+
+    def set_names(self, names):
+        """Display names for magic numbers, e.g. {"1001": "Trend EA"}"""
+        with self.lock:
+            self.names = {int(magic): name for magic, name in names.items()}
+
+    def _strategy(self, magic):
+        strategy = self.strategies.get(magic)
+        if strategy is None:
+            strategy = self.strategies[magic] = {
+                'magic': magic, 'comment': '', 'open': 0, 'net_lots': 0.0, 'gross_lots': 0.0,
+                'floating': 0.0, 'realized_today': 0.0, 'closed_today': 0, 'realized': 0.0,
+                'peak': 0.0, 'drawdown': 0.0, 'max_drawdown': 0.0,
+            }
+        return strategy
+
+    def _move(self, ticket, row):
+        """Replace a position's contribution (row None removes it); returns the magics affected"""
+        affected = set()
+        old = self.contributions.pop(ticket, None)
+        if old:
+            strategy = self.strategies[old[0]]
+            strategy['open'] -= 1
+            strategy['net_lots'] -= old[1]
+            strategy['gross_lots'] -= old[2]
+            strategy['floating'] -= old[3]
+            affected.add(old[0])
+        if row is None:
+            return affected
+
+        sign = 1.0 if row['type'] == 'Buy' else -1.0
+        new = (row['magic'], sign * row['volume'], row['volume'], row['profit'] + row['swap'])
+        self.contributions[ticket] = new
+        strategy = self._strategy(row['magic'])
+        strategy['open'] += 1
+        strategy['net_lots'] += new[1]
+        strategy['gross_lots'] += new[2]
+        strategy['floating'] += new[3]
+        if row['comment']:
+            strategy['comment'] = row['comment']
+        affected.add(row['magic'])
+        return affected
+
+    def publish(self, generation, snapshot, diff, events):
+        """Apply a snapshot diff and realized P&L from close alerts"""
+        with self.lock:
+            today = datetime.now().date()
+            if today != self.today:
+                self.today = today
+                for strategy in self.strategies.values():
+                    strategy['realized_today'] = 0.0
+                    strategy['closed_today'] = 0
+
+            touched = set()
+            for event in events:
+                if event['type'] in CLOSE_EVENTS and isinstance(event['profit'], float) and event['magic'] is not None:
+                    strategy = self._strategy(event['magic'])
+                    strategy['realized'] += event['profit']
+                    strategy['realized_today'] += event['profit']
+                    strategy['closed_today'] += 1
+                    touched.add(event['magic'])
+
+            if diff is not None:
+                positions = diff['positions']
+                for ticket in positions['remove']:
+                    touched |= self._move(ticket, None)
+                for ticket, row in positions['upsert'].items():
+                    touched |= self._move(ticket, row)
+
+            for magic in touched:
+                strategy = self.strategies[magic]
+                if not strategy['open']:
+                    # Clear rounding residue once flat
+                    strategy['net_lots'] = strategy['gross_lots'] = strategy['floating'] = 0.0
+                total = strategy['realized'] + strategy['floating']
+                strategy['peak'] = max(strategy['peak'], total)
+                strategy['drawdown'] = strategy['peak'] - total
+                strategy['max_drawdown'] = max(strategy['max_drawdown'], strategy['drawdown'])
+
+    def name(self, magic, comment=''):
+        if magic in self.names:
+            return self.names[magic]
+        if magic == 0:
+            return "Manual"
+        return comment or str(magic)
+
+    def report(self):
+        """Per-strategy rows, most open P&L at stake first"""
+        with self.lock:
+            rows = [dict(strategy, name=self.name(magic, strategy['comment']))
+                    for magic, strategy in self.strategies.items()]
+        rows.sort(key=lambda row: (-row['open'], -abs(row['floating'])))
+        return rows
+
+    def summary_lines(self, limit=10):
+        """One line per strategy for alerts and summaries"""
+        lines = []
+        for row in self.report()[:limit]:
+            lines.append(
+                f"{row['name']}: {row['open']} open, floating {row['floating']:+.2f}, "
+                f"realized today {row['realized_today']:+.2f} ({row['closed_today']} closed), "
+                f"drawdown {row['drawdown']:.2f}"
+            )
+        return lines
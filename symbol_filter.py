@@ -0,0 +1,94 @@
+import re
+from fnmatch import translate
+
+
+def _compile_masks(masks):
+    """Compile wildcard masks (MT5 style, "*" and "?") into one regex, or None"""
+    if not masks:
+        return None
+    return re.compile("|".join(translate(mask) for mask in masks), re.IGNORECASE)
+
+
+class SymbolFilter:
+    """Include/exclude filter for tracked orders and positions.
+
+    Symbol masks are pushed to MT5 as a group= query so filtered-out
+    instruments never cross the IPC boundary. Magic numbers and comment
+    patterns cannot be expressed as a group, so they are checked locally
+    by a predicate that only tests the conditions that are configured.
+    """
+
+    def __init__(self, include_symbols=None, exclude_symbols=None, include_magics=None,
+                 exclude_magics=None, include_comments=None, exclude_comments=None):
+        self.include_symbols = list(include_symbols or [])
+        self.exclude_symbols = list(exclude_symbols or [])
+        self.include_magics = frozenset(int(magic) for magic in include_magics or [])
+        self.exclude_magics = frozenset(int(magic) for magic in exclude_magics or [])
+        self.include_comments = _compile_masks(include_comments)
+        self.exclude_comments = _compile_masks(exclude_comments)
+
+        self.group = self._build_group()
+        self.symbol_include = _compile_masks(self.include_symbols)
+        self.symbol_exclude = _compile_masks(self.exclude_symbols)
+        self.has_local_checks = bool(
+            self.include_magics or self.exclude_magics or self.include_comments or self.exclude_comments
+        )
+
+    @classmethod
+    def from_config(cls, filters):
+        return cls(
+            filters.get("include_symbols"),
+            filters.get("exclude_symbols"),
+            filters.get("include_magics"),
+            filters.get("exclude_magics"),
+            filters.get("include_comments"),
+            filters.get("exclude_comments")
+        )
+
+    def _build_group(self):
+        """Build an MT5 group string such as "XAU*,EUR*,!EURGBP", or None"""
+        if not self.include_symbols and not self.exclude_symbols:
+            return None
+        parts = self.include_symbols or ["*"]
+        parts = parts + [f"!{mask}" for mask in self.exclude_symbols]
+        return ",".join(parts)
+
+    def query_kwargs(self):
+        """Keyword arguments for mt5.orders_get()/mt5.positions_get()"""
+        return {"group": self.group} if self.group else {}
+
+    def signature(self):
+        """Value that changes whenever the filter would select different items"""
+        return (
+            self.group,
+            self.include_magics,
+            self.exclude_magics,
+            self.include_comments.pattern if self.include_comments else None,
+            self.exclude_comments.pattern if self.exclude_comments else None
+        )
+
+    def symbol_allowed(self, symbol):
+        """Local equivalent of the group query, for sources that bypass MT5"""
+        if self.symbol_include and not self.symbol_include.match(symbol):
+            return False
+        if self.symbol_exclude and self.symbol_exclude.match(symbol):
+            return False
+        return True
+
+    def allows(self, item):
+        """Check magic number and comment conditions for an order or position"""
+        if self.include_magics and item.magic not in self.include_magics:
+            return False
+        if self.exclude_magics and item.magic in self.exclude_magics:
+            return False
+        if self.include_comments and not self.include_comments.match(item.comment):
+            return False
+        if self.exclude_comments and self.exclude_comments.match(item.comment):
+            return False
+        return True
+
+    def apply(self, items):
+        """Filter MT5 results that were already narrowed by the group query"""
+        if not self.has_local_checks:
+            return items
+        return tuple(item for item in items if self.allows(item))
@@ -0,0 +1,130 @@
+import MetaTrader5 as mt5
+import time
+import threading
+from datetime import datetime
+import numpy as np
+
+
+class TickProfitFeed:
+    """Recomputes unrealized P&L of open positions from live ticks.
+
+    Only symbols with open positions are quoted, and the P&L of every
+    position is recomputed in one vectorized pass from cached contract specs.
+    """
+
+    def __init__(self, tracker, interval=0.5, spec_ttl=300):
+        self.tracker = tracker
+        self.interval = interval
+        self.spec_ttl = spec_ttl
+        self.running = False
+        self.thread = None
+
+        self.specs = {}  # symbol -> (loaded_at, tick_size, tick_value_profit, tick_value_loss)
+        self.last_tick_msc = {}  # symbol -> time_msc of the last tick used
+
+        # Position arrays, rebuilt only when the tracker swaps in a new positions dict
+        self._positions_ref = None
+        self._tickets = np.empty(0, dtype=np.int64)
+        self._symbols = []
+        self._symbol_index = np.empty(0, dtype=np.int64)
+        self._is_buy = np.empty(0, dtype=bool)
+        self._volume = np.empty(0)
+        self._open_price = np.empty(0)
+
+    def start(self):
+        """Start polling ticks in a background thread"""
+        if self.running or self.interval <= 0:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop polling ticks"""
+        self.running = False
+
+    def _run(self):
+        while self.running:
+            started = time.monotonic()
+            try:
+                self.update()
+            except Exception as e:
+                print(f"Error updating live profits: {e}")
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def _get_spec(self, symbol):
+        """Get cached contract specs for a symbol, refreshing them after spec_ttl"""
+        spec = self.specs.get(symbol)
+        if spec and time.monotonic() - spec[0] < self.spec_ttl:
+            return spec
+
+        info = mt5.symbol_info(symbol)
+        if info is None or not info.trade_tick_size:
+            return spec
+
+        spec = (
+            time.monotonic(),
+            info.trade_tick_size,
+            info.trade_tick_value_profit or info.trade_tick_value,
+            info.trade_tick_value_loss or info.trade_tick_value
+        )
+        self.specs[symbol] = spec
+        return spec
+
+    def _rebuild_arrays(self, positions):
+        """Convert the tracker's positions into column arrays"""
+        items = list(positions.values())
+        self._symbols = sorted({p.symbol for p in items})
+        lookup = {symbol: i for i, symbol in enumerate(self._symbols)}
+
+        self._tickets = np.fromiter((p.ticket for p in items), dtype=np.int64, count=len(items))
+        self._symbol_index = np.fromiter((lookup[p.symbol] for p in items), dtype=np.int64, count=len(items))
+        self._is_buy = np.fromiter((p.type == mt5.POSITION_TYPE_BUY for p in items), dtype=bool, count=len(items))
+        self._volume = np.fromiter((p.volume for p in items), dtype=float, count=len(items))
+        self._open_price = np.fromiter((p.price_open for p in items), dtype=float, count=len(items))
+        self._positions_ref = positions
+
+    def compute_profits(self, bid, ask, tick_size, tick_value_profit, tick_value_loss):
+        """Vectorized unrealized P&L for all positions from per-symbol quote arrays"""
+        idx = self._symbol_index
+        price = np.where(self._is_buy, bid[idx], ask[idx])
+        move = np.where(self._is_buy, price - self._open_price, self._open_price - price)
+        tick_value = np.where(move >= 0, tick_value_profit[idx], tick_value_loss[idx])
+        return move / tick_size[idx] * tick_value * self._volume
+
+    def update(self):
+        """Quote held symbols and push fresh unrealized P&L to the tracker"""
+        positions = self.tracker.positions
+        if not self.tracker.connected or not positions:
+            return
+
+        if positions is not self._positions_ref:
+            self._rebuild_arrays(positions)
+
+        count = len(self._symbols)
+        bid = np.full(count, np.nan)
+        ask = np.full(count, np.nan)
+        tick_size = np.full(count, np.nan)
+        tick_value_profit = np.zeros(count)
+        tick_value_loss = np.zeros(count)
+
+        changed = False
+        for i, symbol in enumerate(self._symbols):
+            tick = mt5.symbol_info_tick(symbol)
+            spec = self._get_spec(symbol)
+            if tick is None or spec is None:
+                continue
+
+            bid[i], ask[i] = tick.bid, tick.ask
+            _, tick_size[i], tick_value_profit[i], tick_value_loss[i] = spec
+            if self.last_tick_msc.get(symbol) != tick.time_msc:
+                self.last_tick_msc[symbol] = tick.time_msc
+                changed = True
+
+        if not changed:
+            return
+
+        profits = self.compute_profits(bid, ask, tick_size, tick_value_profit, tick_value_loss)
+        valid = ~np.isnan(profits)
+        self.tracker.update_live_profits(dict(zip(self._tickets[valid].tolist(), profits[valid].tolist())), datetime.now())
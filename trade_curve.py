@@ -0,0 +1,223 @@
+import MetaTrader5 as mt5
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import numpy as np
+
+# Deal entries that add to a position; everything else reduces it
+ENTRY_DEALS = (mt5.DEAL_ENTRY_IN, mt5.DEAL_ENTRY_INOUT)
+
+
+def downsample(times, values, max_points):
+    """Thin a curve to about max_points, keeping each bucket's low and high"""
+    count = len(values)
+    if count <= max_points:
+        return times, values
+
+    size = int(np.ceil(count / max(max_points // 2, 1)))
+    rows = int(np.ceil(count / size))
+    padded = np.full(rows * size, np.nan)
+    padded[:count] = values
+    grid = padded.reshape(rows, size)
+
+    base = np.arange(rows) * size
+    keep = np.unique(np.concatenate((
+        base + np.nanargmin(grid, axis=1),
+        base + np.nanargmax(grid, axis=1),
+        [0, count - 1]
+    )))
+    return times[keep], values[keep]
+
+
+class PositionLegs:
+    """Entries and exits of one position, from its deals"""
+
+    def __init__(self, deals):
+        deals = sorted(deals, key=lambda deal: deal.time_msc)
+        entries = [deal for deal in deals if deal.entry in ENTRY_DEALS]
+        exits = [deal for deal in deals if deal.entry not in ENTRY_DEALS]
+        if not entries:
+            raise ValueError("position has no entry deal")
+
+        self.symbol = entries[0].symbol
+        self.is_buy = entries[0].type == mt5.DEAL_TYPE_BUY
+        self.open_msc = entries[0].time_msc
+
+        self.entry_msc = np.array([deal.time_msc for deal in entries], dtype=np.int64)
+        self.entry_volume = np.cumsum([deal.volume for deal in entries])
+        self.entry_cost = np.cumsum([deal.volume * deal.price for deal in entries])
+
+        self.exit_msc = np.array([deal.time_msc for deal in exits], dtype=np.int64)
+        self.exit_volume = np.cumsum([deal.volume for deal in exits]) if exits else np.zeros(0)
+        self.exit_profit = np.cumsum([deal.profit for deal in exits]) if exits else np.zeros(0)
+
+        closed = self.exit_volume.size and self.exit_volume[-1] >= self.entry_volume[-1] - 1e-9
+        self.close_msc = int(self.exit_msc[-1]) if closed else None
+
+    def _at(self, times, stamps, cumulative):
+        """Value of a cumulative series as of each time (0 before the first stamp)"""
+        if not stamps.size:
+            return np.zeros(len(times))
+        index = np.searchsorted(stamps, times, side='right') - 1
+        return np.where(index >= 0, cumulative[np.maximum(index, 0)], 0.0)
+
+    def profit(self, times, bid, ask, tick_size, tick_value_profit, tick_value_loss):
+        """Vectorized realized plus floating P&L at each tick"""
+        entered = self._at(times, self.entry_msc, self.entry_volume)
+        cost = self._at(times, self.entry_msc, self.entry_cost)
+        volume = entered - self._at(times, self.exit_msc, self.exit_volume)
+        realized = self._at(times, self.exit_msc, self.exit_profit)
+
+        open_price = np.divide(cost, entered, out=np.zeros(len(times)), where=entered > 0)
+        move = bid - open_price if self.is_buy else open_price - ask
+        tick_value = np.where(move >= 0, tick_value_profit, tick_value_loss)
+        return realized + move / tick_size * tick_value * np.maximum(volume, 0.0)
+
+
+class TradeCurveCache:
+    """Builds a position's P&L curve from ticks and caches it on disk per ticket.
+
+    Closed positions are rebuilt once and then served from the cache; for
+    open positions only the ticks after the cached curve are fetched. Long
+    curves are thinned to max_points keeping each interval's high and low.
+    Profits use the symbol's current tick value, so cross-currency curves
+    are converted at today's rate.
+    """
+
+    def __init__(self, cache_dir, max_points=5000, chunk_hours=24, memory_size=32):
+        self.cache_dir = cache_dir
+        self.max_points = max_points
+        self.chunk = chunk_hours * 3600 * 1000
+        self.memory_size = memory_size
+        self.memory = OrderedDict()  # ticket -> (times_msc, profits) of closed positions
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, ticket):
+        return os.path.join(self.cache_dir, f"{ticket}.npz")
+
+    def _load(self, ticket):
+        path = self._path(ticket)
+        try:
+            with np.load(path) as data:
+                curve = data['times'], data['profits'], bool(data['complete'])
+            # Mark the file as recently used for eviction
+            os.utime(path)
+            return curve
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _save(self, ticket, times, profits, complete):
+        path = self._path(ticket)
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, times=times, profits=profits, complete=complete)
+        os.replace(temp_path, path)
+
+    def _remember(self, ticket, curve):
+        self.memory[ticket] = curve
+        self.memory.move_to_end(ticket)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def evict(self, max_age_days):
+        """Delete cached curves not used for max_age_days"""
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        with self.lock:
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    if name.endswith(".npz") and os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def _fetch_ticks(self, symbol, start_msc, end_msc):
+        """Fetch bid/ask ticks in chunks so long trades do not need one huge copy"""
+        times, bids, asks = [], [], []
+        chunk_start = start_msc
+        while chunk_start <= end_msc:
+            chunk_end = min(chunk_start + self.chunk, end_msc)
+            ticks = mt5.copy_ticks_range(
+                symbol,
+                datetime.fromtimestamp(chunk_start / 1000, tz=timezone.utc),
+                datetime.fromtimestamp(chunk_end / 1000, tz=timezone.utc) + timedelta(milliseconds=1),
+                mt5.COPY_TICKS_INFO
+            )
+            if ticks is None:
+                print(f"copy_ticks_range() failed for {symbol}, error code = {mt5.last_error()}")
+                return None
+
+            if len(ticks):
+                valid = (ticks['bid'] > 0) & (ticks['ask'] > 0) & (ticks['time_msc'] >= chunk_start)
+                times.append(ticks['time_msc'][valid].astype(np.int64))
+                bids.append(ticks['bid'][valid])
+                asks.append(ticks['ask'][valid])
+            chunk_start = chunk_end + 1
+
+        if not times:
+            return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+        return np.concatenate(times), np.concatenate(bids), np.concatenate(asks)
+
+    def get_curve(self, ticket, connected=True):
+        """Return (times_msc, profits) for a position, or None if it cannot be built"""
+        with self.lock:
+            if ticket in self.memory:
+                self.memory.move_to_end(ticket)
+                return self.memory[ticket]
+
+            cached = self._load(ticket)
+            if cached and cached[2]:
+                self._remember(ticket, cached[:2])
+                return cached[:2]
+            if not connected:
+                return cached[:2] if cached else None
+
+            deals = mt5.history_deals_get(position=ticket)
+            info = None
+            try:
+                legs = PositionLegs(deals or ())
+                info = mt5.symbol_info(legs.symbol)
+            except ValueError:
+                legs = None
+            if legs is None or info is None or not info.trade_tick_size:
+                return cached[:2] if cached else None
+
+            if legs.close_msc is not None:
+                end_msc = legs.close_msc
+            else:
+                tick = mt5.symbol_info_tick(legs.symbol)
+                if tick is None:
+                    return cached[:2] if cached else None
+                end_msc = tick.time_msc
+
+            start_msc = int(cached[0][-1]) + 1 if cached and len(cached[0]) else legs.open_msc
+            ticks = self._fetch_ticks(legs.symbol, start_msc, end_msc)
+            if ticks is None:
+                return cached[:2] if cached else None
+
+            tick_times, bid, ask = ticks
+            profits = legs.profit(
+                tick_times, bid, ask, info.trade_tick_size,
+                info.trade_tick_value_profit or info.trade_tick_value,
+                info.trade_tick_value_loss or info.trade_tick_value
+            )
+            tick_times, profits = downsample(tick_times, profits, self.max_points)
+
+            if cached:
+                tick_times = np.concatenate((cached[0], tick_times))
+                profits = np.concatenate((cached[1], profits))
+                # Open positions keep appending; re-thin once the curve doubles
+                if len(profits) > 2 * self.max_points:
+                    tick_times, profits = downsample(tick_times, profits, self.max_points)
+
+            complete = legs.close_msc is not None
+            if len(tick_times):
+                self._save(ticket, tick_times, profits, complete)
+            if complete:
+                self._remember(ticket, (tick_times, profits))
+            return tick_times, profits
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import threading
+from aiohttp import web, WSMsgType
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>MT5 Order Tracker</title>
+<style>
+body { background: #2a2d2e; color: white; font-family: Arial, sans-serif; margin: 20px; }
+h1 { font-size: 20px; margin: 0; }
+#status { color: #6c757d; font-size: 12px; margin-bottom: 15px; }
+#account { display: flex; gap: 25px; margin-bottom: 15px; }
+#account div span { display: block; font-size: 18px; }
+table { border-collapse: collapse; width: 100%; font-size: 13px; }
+th, td { padding: 4px 8px; text-align: center; border-bottom: 1px solid #3a3d3e; }
+th { background: #3a7ebf; }
+.profit { color: #28a745; } .loss { color: #dc3545; }
+#events { font-family: Consolas, monospace; font-size: 12px; white-space: pre-wrap; max-height: 300px; overflow-y: auto; }
+</style>
+</head>
+<body>
+<h1>MT5 Order Tracker</h1>
+<div id="status">Connecting...</div>
+<div id="account"></div>
+<h3>Open Positions</h3>
+<table><thead><tr>
+<th>Ticket</th><th>Symbol</th><th>Type</th><th>Volume</th><th>Open Price</th><th>Current Price</th>
+<th>SL</th><th>TP</th><th>Profit</th><th>Swap</th><th>Magic</th>
+</tr></thead><tbody id="positions"></tbody></table>
+<h3>Events</h3>
+<div id="events"></div>
+<script>
+const ACCOUNT_FIELDS = [["balance", "Balance"], ["equity", "Equity"], ["profit", "Profit"],
+                        ["margin", "Margin"], ["margin_level", "Margin Level"], ["margin_free", "Free Margin"]];
+const rows = {};
+const account = {};
+
+function renderAccount() {
+  document.getElementById("account").innerHTML = ACCOUNT_FIELDS.map(([key, label]) =>
+    `<div>${label}<span>${account[key] === undefined ? "--" : Number(account[key]).toFixed(2)}</span></div>`).join("");
+}
+
+function fmt(value, digits) { return value > 0 ? Number(value).toFixed(digits) : "None"; }
+
+function upsertPosition(p) {
+  let row = rows[p.ticket];
+  if (!row) {
+    row = document.createElement("tr");
+    rows[p.ticket] = row;
+    document.getElementById("positions").appendChild(row);
+  }
+  row.className = p.profit > 0 ? "profit" : p.profit < 0 ? "loss" : "";
+  row.innerHTML = [p.ticket, p.symbol, p.type, p.volume, Number(p.price_open).toFixed(5),
+    Number(p.price_current).toFixed(5), fmt(p.sl, 5), fmt(p.tp, 5), Number(p.profit).toFixed(2),
+    Number(p.swap).toFixed(2), p.magic].map(v => `<td>${v}</td>`).join("");
+}
+
+function removePosition(ticket) {
+  if (rows[ticket]) { rows[ticket].remove(); delete rows[ticket]; }
+}
+
+function addEvents(events) {
+  const box = document.getElementById("events");
+  for (const e of events) {
+    const line = document.createElement("div");
+    line.textContent = `${e.time}  ${e.message}`;
+    box.prepend(line);
+  }
+  while (box.childNodes.length > 200) box.removeChild(box.lastChild);
+}
+
+function apply(msg) {
+  if (msg.type === "snapshot") {
+    for (const ticket of Object.keys(rows)) removePosition(ticket);
+    document.getElementById("events").innerHTML = "";
+    Object.assign(account, msg.state.account);
+    Object.values(msg.state.positions).forEach(upsertPosition);
+    addEvents(msg.events || []);
+    document.getElementById("status").textContent = `Account ${msg.state.account_login} - live`;
+  } else {
+    const d = msg.diff;
+    if (d) {
+      Object.assign(account, d.account);
+      d.positions.remove.forEach(removePosition);
+      Object.values(d.positions.upsert).forEach(upsertPosition);
+    }
+    addEvents(msg.events || []);
+  }
+  renderAccount();
+}
+
+function connect() {
+  const ws = new WebSocket(`${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/ws`);
+  ws.onmessage = e => apply(JSON.parse(e.data));
+  ws.onclose = () => {
+    document.getElementById("status").textContent = "Disconnected - retrying...";
+    setTimeout(connect, 2000);
+  };
+}
+renderAccount();
+connect();
+</script>
+</body>
+</html>
+"""
+
+
+class WebDashboard:
+    """Browser dashboard that streams snapshot diffs over WebSocket.
+
+    The tracker publishes once per poll; each diff is serialized once and
+    pushed to every connected viewer, so viewers never cause extra MT5 calls.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, recent_events=200, queue_size=100):
+        self.host = host
+        self.port = port
+        self.recent_events = recent_events
+        self.queue_size = queue_size
+        self.loop = None
+        self.thread = None
+        self.clients = {}  # WebSocket -> queue of payloads, sent in order by one writer task
+        self.state = None
+        self.events = []
+
+    def start(self):
+        """Start the HTTP/WebSocket server in a separate thread"""
+        if self.thread:
+            return
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        app = web.Application()
+        app.router.add_get('/', self._handle_index)
+        app.router.add_get('/ws', self._handle_ws)
+
+        runner = web.AppRunner(app)
+        try:
+            self.loop.run_until_complete(runner.setup())
+            self.loop.run_until_complete(web.TCPSite(runner, self.host, self.port).start())
+            print(f"Dashboard running at http://{self.host}:{self.port}/")
+            self.loop.run_forever()
+        except Exception as e:
+            print(f"Error starting dashboard: {e}")
+
+    async def _handle_index(self, request):
+        return web.Response(text=DASHBOARD_HTML, content_type='text/html')
+
+    async def _handle_ws(self, request):
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+
+        # Queue the snapshot and register without yielding, so no diff can
+        # be broadcast between the two and the viewer never misses one
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.state is not None:
+            queue.put_nowait(self._snapshot())
+        self.clients[ws] = queue
+        writer = self.loop.create_task(self._write(ws, queue))
+
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self.clients.pop(ws, None)
+            writer.cancel()
+        return ws
+
+    def publish(self, generation, snapshot, diff, events):
+        """Queue a diff for broadcast; safe to call from any thread"""
+        if self.loop is None or (diff is None and not events):
+            return
+        self.loop.call_soon_threadsafe(self._broadcast, generation, snapshot, diff, events)
+
+    def _broadcast(self, generation, snapshot, diff, events):
+        self.state = snapshot
+        if events:
+            self.events = (self.events + events)[-self.recent_events:]
+
+        if not self.clients:
+            return
+
+        payload = json.dumps({'type': 'diff', 'generation': generation, 'diff': diff, 'events': events})
+        snapshot = None
+        for ws, queue in list(self.clients.items()):
+            if ws.closed:
+                self.clients.pop(ws, None)
+                continue
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # A stalled viewer skips the diffs it missed and starts over from the current state
+                while not queue.empty():
+                    queue.get_nowait()
+                snapshot = snapshot or self._snapshot()
+                queue.put_nowait(snapshot)
+
+    def _snapshot(self):
+        return json.dumps({'type': 'snapshot', 'state': self.state, 'events': self.events})
+
+    async def _write(self, ws, queue):
+        """Send a viewer's payloads one at a time, in the order they were queued"""
+        try:
+            while True:
+                await ws.send_str(await queue.get())
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.clients.pop(ws, None)